@@ -0,0 +1,50 @@
+# Copyright 2023 Katteli Inc.
+# TestFlows.com Open-Source Software Testing Framework (http://testflows.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import contextlib
+
+import testflows._core.cli.arg.type as argtype
+import testflows._core.database as database
+
+from testflows._core.cli.arg.common import epilog
+from testflows._core.cli.arg.common import HelpFormatter
+from testflows._core.cli.arg.handlers.handler import Handler as HandlerBase
+from testflows._core.transform.log.report.totals import color_result
+from testflows._core.utils.timefuncs import localfromtimestamp, strftimedelta
+
+class Handler(HandlerBase):
+    @classmethod
+    def add_command(cls, commands):
+        parser = commands.add_parser("durations", help="test durations", epilog=epilog(),
+            description="Show result and duration of the test in each run.",
+            formatter_class=HelpFormatter)
+
+        parser.add_argument("database", metavar="database", type=str, help="database file")
+        parser.add_argument("name", metavar="name", type=str, help="test name")
+        parser.add_argument("output", metavar="output", type=argtype.file("w", bufsize=1, encoding="utf-8"),
+                nargs="?", help='output file, default: stdout', default="-")
+        parser.add_argument("--last", metavar="N", type=argtype.count,
+                help="use only the last N runs")
+
+        parser.set_defaults(func=cls())
+
+    def handle(self, args):
+        with contextlib.closing(database.connect(args.database)) as connection:
+            rows = database.durations(connection, args.name, last=args.last)
+
+        for started, result_type, duration in rows:
+            result_type = result_type or "-"
+            args.output.write(f"{localfromtimestamp(started):%b %d, %Y %-H:%M:%S}"
+                f"  {color_result(result_type, f'{result_type:<7}')}"
+                f"  {strftimedelta(duration) if duration is not None else '-'}\n")
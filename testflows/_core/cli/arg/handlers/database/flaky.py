@@ -0,0 +1,54 @@
+# Copyright 2023 Katteli Inc.
+# TestFlows.com Open-Source Software Testing Framework (http://testflows.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import contextlib
+
+import testflows._core.cli.arg.type as argtype
+import testflows._core.database as database
+
+from testflows._core.cli.arg.common import epilog
+from testflows._core.cli.arg.common import HelpFormatter
+from testflows._core.cli.arg.handlers.handler import Handler as HandlerBase
+from testflows._core.cli.colors import color
+from testflows._core.transform.log.report.unstable import UnstableCounts
+
+class Handler(HandlerBase):
+    @classmethod
+    def add_command(cls, commands):
+        parser = commands.add_parser("flaky", help="flaky tests", epilog=epilog(),
+            description="Show tests that have different results between runs.",
+            formatter_class=HelpFormatter)
+
+        parser.add_argument("database", metavar="database", type=str, help="database file")
+        parser.add_argument("output", metavar="output", type=argtype.file("w", bufsize=1, encoding="utf-8"),
+                nargs="?", help='output file, default: stdout', default="-")
+        parser.add_argument("--last", metavar="N", type=argtype.count,
+                help="use only the last N runs")
+
+        parser.set_defaults(func=cls())
+
+    def handle(self, args):
+        with contextlib.closing(database.connect(args.database)) as connection:
+            tests = database.flaky(connection, last=args.last)
+
+        flaky = ""
+        for name, results in tests.items():
+            counts = UnstableCounts(name, *([0] * 11))
+            for result_type, count in results.items():
+                counts.units += count
+                setattr(counts, result_type.lower(), count)
+            flaky += str(counts)
+
+        if flaky:
+            args.output.write(color("Flaky\n\n", "white", attrs=["bold"]) + flaky)
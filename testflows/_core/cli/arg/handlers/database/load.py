@@ -0,0 +1,41 @@
+# Copyright 2023 Katteli Inc.
+# TestFlows.com Open-Source Software Testing Framework (http://testflows.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import contextlib
+
+import testflows._core.cli.arg.type as argtype
+import testflows._core.database as database
+
+from testflows._core.cli.arg.common import epilog
+from testflows._core.cli.arg.common import HelpFormatter
+from testflows._core.cli.arg.handlers.handler import Handler as HandlerBase
+from testflows._core.transform.log.pipeline import DatabaseLogPipeline
+
+class Handler(HandlerBase):
+    @classmethod
+    def add_command(cls, commands):
+        parser = commands.add_parser("import", help="import log", epilog=epilog(),
+            description="Import test results from the log into the database. "
+                "Results of the same run are replaced.",
+            formatter_class=HelpFormatter)
+
+        parser.add_argument("database", metavar="database", type=str, help="database file")
+        parser.add_argument("input", metavar="input", type=argtype.logfile("r", bufsize=1, encoding="utf-8"),
+                nargs="?", help="input log, default: stdin", default="-")
+
+        parser.set_defaults(func=cls())
+
+    def handle(self, args):
+        with contextlib.closing(database.connect(args.database)) as connection:
+            DatabaseLogPipeline(args.input, connection).run()
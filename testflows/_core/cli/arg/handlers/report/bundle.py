@@ -0,0 +1,111 @@
+# Copyright 2023 Katteli Inc.
+# TestFlows.com Open-Source Software Testing Framework (http://testflows.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import io
+import argparse
+
+from functools import partial
+
+import testflows._core.cli.arg.type as argtype
+
+from testflows._core.cli.arg.common import epilog
+from testflows._core.cli.arg.common import HelpFormatter
+from testflows._core.cli.arg.exit import ExitWithError
+from testflows._core.cli.arg.handlers.handler import Handler as HandlerBase
+from testflows._core.cli.arg.handlers.report import results as results_report
+from testflows._core.cli.arg.handlers.report import coverage as coverage_report
+from testflows._core.cli.arg.handlers.report import metrics as metrics_report
+from testflows._core.transform.log.pipeline import BundleLogPipeline
+
+class Handler(HandlerBase):
+    @classmethod
+    def add_command(cls, commands):
+        parser = commands.add_parser("bundle", help="generate multiple reports", epilog=epilog(),
+            description="Generate multiple reports reading the log only once.",
+            formatter_class=HelpFormatter)
+
+        parser.add_argument("input", metavar="input", type=argtype.logfile("r", bufsize=1, encoding="utf-8"),
+                nargs="?", help="input log, default: stdin", default="-")
+        parser.add_argument("--results", metavar="output", type=argtype.file("w", bufsize=1, encoding="utf-8"),
+                help="results report output file")
+        parser.add_argument("--results-format", metavar="type", type=str,
+            help="results report format choices: 'md', 'json', default: md (Markdown)", choices=["md", "json"], default="md")
+        parser.add_argument("--coverage", metavar="output", type=argtype.file("w", bufsize=1, encoding="utf-8"),
+                help="requirements coverage report output file")
+        parser.add_argument("--coverage-requirements", metavar="requirements", type=partial(argtype.path, special=["-"]),
+                help="requirements source file, default: '-' (from input log)", default="-")
+        parser.add_argument("--coverage-only", metavar="name", type=str, default=[], nargs="+",
+                help=("name of one or more specifications for which to generate coverage report"
+                    ", default: include all specifications. Only a unique part of the name can be specified."
+            ))
+        parser.add_argument("--metrics", metavar="output", type=argtype.file("w", bufsize=1, encoding="utf-8"),
+                help="metrics report output file")
+        parser.add_argument("--metrics-format", metavar="type", type=str,
+            help="metrics report format choices: 'openmetrics', 'csv' default: openmetrics", choices=["openmetrics", "csv"], default="openmetrics")
+        parser.add_argument("--metrics-aggregate", action="store_true",
+            help="aggregate metric values of each test in the metrics report")
+        parser.add_argument("--totals", metavar="output", type=argtype.file("w", bufsize=1, encoding="utf-8"),
+                help="totals output file")
+        parser.add_argument("--jobs", "-j", metavar="N", type=argtype.jobs, default=1,
+                help="number of processes to use to parse the log, default: 1")
+        parser.add_argument("-a", "--artifacts", metavar="link", type=str, help='link to the artifacts')
+        parser.add_argument("--copyright", metavar="name", help="add copyright notice", type=str)
+        parser.add_argument("--confidential", help="mark as confidential", action="store_true")
+        parser.add_argument("--logo", metavar="path", type=argtype.file("rb"),
+                help='use logo image (.png)')
+        parser.add_argument("--title", metavar="name", help="custom title", type=str)
+
+        parser.set_defaults(func=cls())
+
+    def report_args(self, args, output, logo, **kwargs):
+        """Return arguments for the individual report handler.
+        """
+        return argparse.Namespace(output=output, artifacts=args.artifacts,
+            copyright=args.copyright, confidential=args.confidential,
+            logo=(io.BytesIO(logo) if logo is not None else None),
+            title=args.title, **kwargs)
+
+    def handle(self, args):
+        if not (args.results or args.coverage or args.metrics or args.totals):
+            raise ExitWithError("at least one of --results, --coverage, --metrics or --totals must be specified")
+
+        results = {} if (args.results or args.coverage) else None
+        metrics = None
+        if args.metrics:
+            metrics = {} if args.metrics_aggregate else []
+
+        BundleLogPipeline(args.input, results=results, metrics=metrics,
+            totals=args.totals, metrics_aggregate=args.metrics_aggregate, jobs=args.jobs).run()
+
+        logo = args.logo.read() if args.logo else None
+
+        if args.results:
+            formatter = results_report.MarkdownFormatter()
+            if args.results_format == "json":
+                formatter = results_report.JSONFormatter()
+            results_report.Handler().generate(formatter, results,
+                self.report_args(args, args.results, logo, format=args.results_format))
+
+        if args.coverage:
+            coverage_report.Handler().generate(coverage_report.Formatter(), results,
+                self.report_args(args, args.coverage, logo,
+                    requirements=args.coverage_requirements, only=args.coverage_only))
+
+        if args.metrics:
+            formatter = metrics_report.OpenMetricsFormatter()
+            if args.metrics_format == "csv":
+                formatter = metrics_report.CSVMetricsFormatter()
+            metrics_report.Handler().generate(formatter, metrics,
+                self.report_args(args, args.metrics, logo, format=args.metrics_format,
+                    aggregate=args.metrics_aggregate))
@@ -18,11 +18,13 @@ import sys
 import json
 import time
 import base64
-import threading
+import concurrent.futures
 
 from datetime import datetime
 
 import testflows.settings as settings
+import testflows._core.sidecar as sidecar
+import testflows._core.summary as summary_store
 import testflows._core.cli.arg.type as argtype
 
 from testflows._core import __version__
@@ -56,6 +58,23 @@ Generated by {testflows} Open-Source Test Framework
 [<span class="logo-test">Test</span><span class="logo-flows">Flows</span>]: https://testflows.com
 """
 
+def read(log):
+    """Read log and return summary of its results
+    and the log digest if log is a regular file.
+
+    :param log: log file or log file name
+    """
+    results = {}
+    if isinstance(log, str):
+        with argtype.logfile("r", bufsize=1, encoding="utf-8")(log) as file:
+            ResultsLogPipeline(file, results, steps=False).run()
+        name = log
+    else:
+        ResultsLogPipeline(log, results, steps=False).run()
+        name = sidecar.logfile(log)
+    digest = sidecar.key(name)[1] if name else None
+    return summary_store.summary(results, log if isinstance(log, str) else log.name), digest
+
 class Formatter:
     def format_logo(self, data):
         if not data["company"].get("logo"):
@@ -207,7 +226,7 @@ class Handler(HandlerBase):
     @classmethod
     def add_arguments(cls, parser):
         parser.add_argument("--log", metavar="pattern", type=argtype.logfile("r", bufsize=1, encoding="utf-8"),
-            nargs="+", help="log file pattern", required=True)
+            nargs="+", help="log file pattern", default=[])
         parser.add_argument("--log-link", metavar="attribute",
             help="attribute that is used as a link for the log, default: job.url",
             type=str, default="job.url")
@@ -225,6 +244,12 @@ class Handler(HandlerBase):
         parser.add_argument("--confidential", help="mark as confidential", action="store_true")
         parser.add_argument("--logo", metavar="path", type=argtype.file("rb"),
                 help='use logo image (.png)')
+        parser.add_argument("--jobs", "-j", metavar="N", type=argtype.jobs, default=os.cpu_count() or 1,
+                help="number of processes to use to read the logs, default: number of CPUs")
+        parser.add_argument("--store", metavar="path", type=str,
+                help="summary store directory, logs are added to the store and all runs in the store are compared")
+        parser.add_argument("--last", metavar="N", type=argtype.count,
+                help="compare only the last N runs in the summary store")
 
     def chart(self, counts):
         chart = {
@@ -241,13 +266,7 @@ class Handler(HandlerBase):
         return chart
 
     def get_attribute(self, result, name, default=None):
-        tests = list(result["tests"].values())
-
-        if not tests:
-            return default
-
-        test = tests[0]["test"]
-        for attr in test["attributes"]:
+        for attr in result["attributes"]:
             if attr["attribute_name"] == name:
                 return attr["attribute_value"]
 
@@ -282,10 +301,10 @@ class Handler(HandlerBase):
 
             for testname in tests:
                 test = result["tests"].get(testname)
-                if test and test.get("result"):
-                    if not test["result"].get("result_type"):
-                        raise ValueError(f"no result for '{test['test']['test_name']}'")
-                    _name = test["result"]["result_type"].lower()
+                if test:
+                    if not test.get("result_type"):
+                        raise ValueError(f"no result for '{testname}'")
+                    _name = test["result_type"].lower()
                     setattr(_counts, _name, getattr(_counts, _name) + 1)
                 _counts.units += 1
 
@@ -320,18 +339,10 @@ class Handler(HandlerBase):
         return _results
 
     def tests(self, results):
-        tests = []
+        tests = set()
         for r in results.values():
-            for uname, test in r["tests"].items():
-                if getattr(TestType, test["test"]["test_type"]) < TestType.Test:
-                    continue
-                if test["test"].get("test_parent_type"):
-                    if getattr(TestType, test["test"]["test_parent_type"]) < TestType.Suite:
-                        continue
-                if Flags(test["test"]["test_cflags"]) & RETRY:
-                    continue
-                tests.append(uname)
-        return human(list(set(tests)))
+            tests.update(r["tests"])
+        return human(list(tests))
 
     def table(self, tests, results, ref_link=None):
         table = {
@@ -349,10 +360,7 @@ class Handler(HandlerBase):
         for test in tests:
             row = [test]
             for result in results.values():
-                if result["tests"].get(test) and result["tests"].get(test).get("result"):
-                    row.append(result["tests"].get(test)["result"])
-                else:
-                    row.append(None)
+                row.append(result["tests"].get(test))
             table["rows"].append(row)
         return table
 
@@ -393,23 +401,44 @@ class Handler(HandlerBase):
         )
         output.write("\n")
 
+    def read(self, logs, jobs):
+        """Read logs and return run summaries
+        and log digests.
+
+        :param logs: log files
+        :param jobs: number of processes
+        """
+        jobs = min(jobs, len(logs))
+
+        if jobs > 1:
+            # logs that are not regular files are read in this process
+            with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as pool:
+                futures = {log.name: pool.submit(read, log.name) for log in logs if sidecar.logfile(log)}
+                return [futures[log.name].result() if log.name in futures else read(log) for log in logs]
+
+        return [read(log) for log in logs]
+
     def handle(self, args):
-        results = {}
-        threads = []
+        if not args.log and not args.store:
+            raise ValueError("either --log or --store must be specified")
 
-        def thread_worker(log, results):
-            ResultsLogPipeline(log, results).run()
+        summaries = self.read(args.log, args.jobs)
 
-        for log in args.log:
-            log_results = {}
-            threads.append(
-                threading.Thread(target=thread_worker, args=(log, log_results))
-            )
-            results[log.name] = log_results
-            threads[-1].start()
+        if args.store:
+            for summary, digest in summaries:
+                summary_store.add(args.store, summary, digest)
+            summaries = summary_store.load(args.store, last=args.last)
+        else:
+            summaries = [summary for summary, digest in summaries]
 
-        for thread in threads:
-            thread.join()
+        results = {}
+        for summary in summaries:
+            # the same log name can be used by different runs
+            name, duplicate = summary["log"], 0
+            while name in results:
+                duplicate += 1
+                name = f"{summary['log']} ~{duplicate}"
+            results[name] = summary
 
         formatter = self.Formatter()
         self.generate(formatter, results, args)
@@ -237,6 +237,8 @@ class Handler(HandlerBase):
                 nargs="?", help="input log, default: stdin", default="-")
         parser.add_argument("output", metavar="output", type=argtype.file("w", bufsize=1, encoding="utf-8"),
                 nargs="?", help='output file, default: stdout', default="-")
+        parser.add_argument("--jobs", "-j", metavar="N", type=argtype.jobs, default=1,
+                help="number of processes to use to parse the log, default: 1")
         parser.add_argument("--show", metavar="status", type=str, nargs="+", help="verification status. Choices: 'satisfied', 'unsatisfied', 'untested'",
             choices=["satisfied", "unsatisfied", "untested"],
             default=["satisfied", "unsatisfied", "untested"])
@@ -420,5 +422,5 @@ class Handler(HandlerBase):
     def handle(self, args):
         results = {}
         formatter = Formatter()
-        ResultsLogPipeline(args.input, results).run()
+        ResultsLogPipeline(args.input, results, jobs=args.jobs).run()
         self.generate(formatter, results, args)
@@ -20,6 +20,7 @@ from testflows._core.cli.arg.handlers.report.results import Handler as results_h
 from testflows._core.cli.arg.handlers.report.compare.handler import Handler as compare_handler
 from testflows._core.cli.arg.handlers.report.coverage import Handler as coverage_handler
 from testflows._core.cli.arg.handlers.report.metrics import Handler as metrics_handler
+from testflows._core.cli.arg.handlers.report.bundle import Handler as bundle_handler
 from testflows._core.cli.arg.handlers.report.specification import Handler as specification_handler
 from testflows._core.cli.arg.handlers.report.tracebility import Handler as tracebility_handler
 
@@ -39,4 +40,5 @@ class Handler(HandlerBase):
         coverage_handler.add_command(report_commands)
         compare_handler.add_command(report_commands)
         metrics_handler.add_command(report_commands)
+        bundle_handler.add_command(report_commands)
         #srs_coverage_handler.add_command(report_commands)
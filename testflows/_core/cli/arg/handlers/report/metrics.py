@@ -20,8 +20,12 @@ from testflows._core.cli.arg.common import epilog
 from testflows._core.cli.arg.common import HelpFormatter
 from testflows._core.cli.arg.handlers.handler import Handler as HandlerBase
 from testflows._core.transform.log.pipeline import MetricsLogPipeline
+from testflows._core.transform.log.report.metrics import aggregate, percentiles
 from testflows._core.message import dumps
 
+#: size of the chunks written to the output
+chunk_size = 65536
+
 class OpenMetricsFormatter:
     def format_metric_name(self, name):
         return name.replace(" ", "_")
@@ -35,11 +39,38 @@ class OpenMetricsFormatter:
 
         return f"{metric_name}{{test={dumps(test_name)},units={dumps(metric_units)}}} {metric_value} {int(metric_time)}\n"
 
+    def format_aggregate(self, key, values):
+        test_name, metric_name, metric_units = key
+        metric_name = self.format_metric_name(metric_name)
+        labels = f"test={dumps(test_name)},units={dumps(metric_units)}"
+        stats = aggregate(values)
+
+        lines = [f"{metric_name}_{stat}{{{labels}}} {stats[stat]}\n" for stat in ("count", "min", "max", "mean", "stddev")]
+        lines += [f"{metric_name}{{{labels},quantile=\"{p / 100}\"}} {stats[f'p{p}']}\n" for p in percentiles]
+        return "".join(lines)
+
+    def write(self, file, data):
+        """Write metrics to the file-like object in chunks.
+        """
+        if data.get("aggregate"):
+            lines = (self.format_aggregate(key, values) for key, values in data["metrics"].items())
+        else:
+            lines = map(self.format_metric, data["metrics"])
+
+        chunk, size = [], 0
+        for line in lines:
+            chunk.append(line)
+            size += len(line)
+            if size >= chunk_size:
+                file.write("".join(chunk))
+                chunk, size = [], 0
+        if chunk:
+            file.write("".join(chunk))
+
     def format(self, data):
-        body = ""
-        for metric in data["metrics"]:
-             body += self.format_metric(metric)
-        return body
+        body = io.StringIO()
+        self.write(body, data)
+        return body.getvalue()
 
 class CSVMetricsFormatter:
     def format_metric_name(self, name):
@@ -53,16 +84,42 @@ class CSVMetricsFormatter:
         test_name = metric["test_name"]
         writer.writerow((test_name, metric_name, metric_units, metric_value, int(metric_time)))
 
+    def format_aggregate(self, writer, key, values):
+        test_name, metric_name, metric_units = key
+        stats = aggregate(values)
+        writer.writerow((test_name, self.format_metric_name(metric_name), metric_units) + tuple(stats.values()))
+
+    def flush(self, file, chunk, force=False):
+        """Write chunk to the file-like object once it is big enough.
+        """
+        if force or chunk.tell() >= chunk_size:
+            file.write(chunk.getvalue())
+            chunk.seek(0)
+            chunk.truncate()
+
+    def write(self, file, data):
+        """Write metrics to the file-like object in chunks.
+        """
+        chunk = io.StringIO()
+        writer = csv.writer(chunk, quoting=csv.QUOTE_NONNUMERIC)
+        if data.get("aggregate"):
+            writer.writerow(("test_name", "metric_name", "metric_units", "count", "min", "max", "mean", "stddev")
+                + tuple(f"p{p}" for p in percentiles))
+            for key, values in data["metrics"].items():
+                self.format_aggregate(writer, key, values)
+                self.flush(file, chunk)
+        else:
+            writer.writerow(("test_name", "metric_name", "metric_units", "metric_value", "metric_time"))
+            for metric in data["metrics"]:
+                self.format_metric(writer, metric)
+                self.flush(file, chunk)
+        self.flush(file, chunk, force=True)
+
     def format(self, data):
         body = io.StringIO()
-        header = "test_name", "metric_name", "metric_units", "metric_value", "metric_time"
-        writer = csv.writer(body, quoting=csv.QUOTE_NONNUMERIC)
-        writer.writerow(header)
-        for metric in data["metrics"]:
-             self.format_metric(writer, metric)
+        self.write(body, data)
         return body.getvalue()
 
-
 class Handler(HandlerBase):
     @classmethod
     def add_command(cls, commands):
@@ -74,25 +131,28 @@ class Handler(HandlerBase):
                 nargs="?", help="input log, default: stdin", default="-")
         parser.add_argument("output", metavar="output", type=argtype.file("w", bufsize=1, encoding="utf-8"),
                 nargs="?", help='output file, default: stdout', default="-")
+        parser.add_argument("--jobs", "-j", metavar="N", type=argtype.jobs, default=1,
+                help="number of processes to use to parse the log, default: 1")
         parser.add_argument("--format", metavar="type", type=str,
             help="output format choices: 'openmetrics', 'csv' default: openmetrics", choices=["openmetrics", "csv"], default="openmetrics")
+        parser.add_argument("--aggregate", action="store_true",
+            help=f"aggregate metric values of each test into count, min, max, mean, stddev, "
+                f"{', '.join(f'p{p}' for p in percentiles)}")
 
         parser.set_defaults(func=cls())
 
     def data(self, metrics, args):
         d = dict()
         d["metrics"] = metrics
+        d["aggregate"] = getattr(args, "aggregate", False)
         return d
 
     def generate(self, formatter, metrics, args):
-        output = args.output
-        output.write(
-            formatter.format(self.data(metrics, args))
-        )
+        formatter.write(args.output, self.data(metrics, args))
 
     def handle(self, args):
-        metrics = []
-        MetricsLogPipeline(args.input, metrics).run()
+        metrics = {} if args.aggregate else []
+        MetricsLogPipeline(args.input, metrics, aggregate=args.aggregate, jobs=args.jobs).run()
         if args.format == "openmetrics":
             formatter = OpenMetricsFormatter()
         elif args.format == "csv":
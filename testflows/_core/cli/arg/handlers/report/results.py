@@ -18,6 +18,7 @@ import math
 import base64
 
 from json import JSONEncoder
+from collections.abc import Mapping
 
 import testflows.settings as settings
 import testflows._core.cli.arg.type as argtype
@@ -59,6 +60,8 @@ class JSONFormatter:
     """
     class Encoder(JSONEncoder):
         def default(self, o):
+            if isinstance(o, Mapping):
+                return dict(o)
             return vars(o)
 
     def format(self, data):
@@ -346,6 +349,8 @@ class Handler(HandlerBase):
                 nargs="?", help="input log, default: stdin", default="-")
         parser.add_argument("output", metavar="output", type=argtype.file("w", bufsize=1, encoding="utf-8"),
                 nargs="?", help='output file, default: stdout', default="-")
+        parser.add_argument("--jobs", "-j", metavar="N", type=argtype.jobs, default=1,
+                help="number of processes to use to parse the log, default: 1")
         parser.add_argument("-a", "--artifacts", metavar="link", type=str, help='link to the artifacts')
         parser.add_argument("--format", metavar="type", type=str,
             help="output format choices: 'md', 'json', default: md (Markdown)", choices=["md", "json"], default="md")
@@ -455,7 +460,8 @@ class Handler(HandlerBase):
 
     def handle(self, args):
         results = {}
-        ResultsLogPipeline(args.input, results).run()
+        # details of steps are not part of the report
+        ResultsLogPipeline(args.input, results, details=False, jobs=args.jobs).run()
         formatter = MarkdownFormatter()
         if args.format == "json":
             formatter = JSONFormatter()
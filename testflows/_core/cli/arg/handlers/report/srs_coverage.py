@@ -144,6 +144,8 @@ class Handler(HandlerBase):
                 nargs="?", help="input log, default: stdin", default="-")
         parser.add_argument("output", metavar="output", type=argtype.file("w", bufsize=1, encoding="utf-8"),
                 nargs="?", help='output file, default: stdout', default="-")
+        parser.add_argument("--jobs", "-j", metavar="N", type=argtype.jobs, default=1,
+                help="number of processes to use to parse the log, default: 1")
         parser.add_argument("--only", metavar="status", type=str, nargs="+", help="verification status",
             choices=["satisfied", "unsatisfied", "untested"],
             default=["satisfied", "unsatisfied", "untested"])
@@ -201,7 +203,7 @@ class Handler(HandlerBase):
         tree = parser.parse(requirements_data)
         headings = visit_parse_tree(tree, Visitor())
         results = {}
-        ResultsLogPipeline(args.input, results).run()
+        ResultsLogPipeline(args.input, results, jobs=args.jobs).run()
         # map result requirements to tests
         tested = {}
 
@@ -166,6 +166,8 @@ class Handler(HandlerBase):
                 nargs="?", help="input log, default: stdin", default="-")
         parser.add_argument("output", metavar="output", type=argtype.file("w", bufsize=1, encoding="utf-8"),
                 nargs="?", help='output file, default: stdout', default="-")
+        parser.add_argument("--jobs", "-j", metavar="N", type=argtype.jobs, default=1,
+                help="number of processes to use to parse the log, default: 1")
         parser.add_argument("--copyright", metavar="name", help="add copyright notice", type=str)
         parser.add_argument("--confidential", help="mark as confidential", action="store_true")
         parser.add_argument("--logo", metavar="path", type=argtype.file("rb"),
@@ -222,6 +224,6 @@ class Handler(HandlerBase):
 
     def handle(self, args):
         results = OrderedDict()
-        ResultsLogPipeline(args.input, results).run()
+        ResultsLogPipeline(args.input, results, jobs=args.jobs).run()
         formatter = self.Formatter()
         self.generate(formatter, results, args)
@@ -20,7 +20,8 @@ from testflows._core.cli.arg.common import HelpFormatter
 from testflows._core.cli.arg.handlers.handler import Handler as HandlerBase
 from testflows._core.message import Message
 from testflows._core.transform.log.pipeline import Pipeline as PipelineBase
-from testflows._core.transform.log.read_and_filter import transform as read_and_filter_transform
+from testflows._core.transform.log.index import read_and_filter as read_and_filter_transform
+from testflows._core.transform.log.filter import Filter
 from testflows._core.transform.log.flat import transform as flat_transform
 from testflows._core.transform.log.parse import transform as parse_transform
 from testflows._core.transform.log.stop import transform as stop_transform
@@ -49,11 +50,10 @@ class Handler(HandlerBase):
                 Message.ATTRIBUTE.name
             ]
 
-            command = "grep -E '^\\{\"message_keyword\":\""
-            command = f"{command}({'|'.join(message_types)})\""
-            command += ".+,\"test_name\":\"%s.*?\",'" % name.replace("'", r"'\''")
+            pattern = ",\"test_name\":\"%s.*?\"," % name
             steps = [
-                read_and_filter_transform(input, command=command, stop=stop_event, tail=tail),
+                read_and_filter_transform(input, Filter(message_types, pattern), name=name,
+                    stop=stop_event, tail=tail),
                 parse_transform(),
                 flat_transform(),
                 write_transform(output),
@@ -12,6 +12,9 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import os
+
+import testflows.settings as settings
 import testflows._core.cli.arg.type as argtype
 
 from testflows._core.cli.arg.common import epilog
@@ -30,8 +33,12 @@ class Handler(HandlerBase):
                 nargs="?", help="input log, default: stdin", default="-")
         parser.add_argument("output", metavar="output", type=argtype.file("w", bufsize=1, encoding="utf-8"),
                 nargs="?", help='output file, default: stdout', default="-")
+        parser.add_argument("--specification-cache", dest="specification_cache", metavar="directory", type=str,
+                help="directory used to cache requirement names parsed from specifications, default: not used")
 
         parser.set_defaults(func=cls())
 
     def handle(self, args):
+        if args.specification_cache:
+            settings.specification_cache = os.path.abspath(os.path.expanduser(args.specification_cache))
         CoverageReportLogPipeline(args.input, args.output).run()
\ No newline at end of file
@@ -19,7 +19,8 @@ from testflows._core.cli.arg.common import epilog
 from testflows._core.cli.arg.common import HelpFormatter
 from testflows._core.cli.arg.handlers.handler import Handler as HandlerBase
 from testflows._core.transform.log.pipeline import Pipeline as PipelineBase
-from testflows._core.transform.log.read_and_filter import transform as read_and_filter_transform
+from testflows._core.transform.log.index import read_and_filter as read_and_filter_transform
+from testflows._core.transform.log.filter import Filter
 from testflows._core.transform.log.flat import transform as flat_transform
 from testflows._core.transform.log.parse import transform as parse_transform
 from testflows._core.transform.log.stop import transform as stop_transform
@@ -44,9 +45,10 @@ class Handler(HandlerBase):
         def __init__(self, name, input, output, tail=False):
             stop_event = threading.Event()
 
-            command = "grep -E '\"message_object\":1,.+\"test_name\":\"%s\"'" % name.replace("'", r"'\''")
+            pattern = "\"message_object\":1,.+\"test_name\":\"%s\"" % name
             steps = [
-                read_and_filter_transform(input, command=command, tail=tail, stop=stop_event),
+                read_and_filter_transform(input, Filter(pattern=pattern), name=name, exact=True,
+                    message_object=1, tail=tail, stop=stop_event),
                 parse_transform(),
                 flat_transform(),
                 write_transform(output),
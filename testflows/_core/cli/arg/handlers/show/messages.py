@@ -23,7 +23,8 @@ from testflows._core.cli.arg.common import HelpFormatter
 from testflows._core.cli.arg.handlers.handler import Handler as HandlerBase
 from testflows._core.message import Message
 from testflows._core.transform.log.pipeline import Pipeline as PipelineBase
-from testflows._core.transform.log.read_and_filter import transform as read_and_filter_transform
+from testflows._core.transform.log.index import read_and_filter as read_and_filter_transform
+from testflows._core.transform.log.filter import Filter
 from testflows._core.transform.log.nice import transform as nice_transform
 from testflows._core.transform.log.parse import transform as parse_transform
 from testflows._core.transform.log.write import transform as write_transform
@@ -49,10 +50,10 @@ class Handler(HandlerBase):
     class Pipeline(PipelineBase):
         def __init__(self, name, input, output, format=None, tail=False):
             stop_event = threading.Event()
-            command = f"grep -E \',\"test_name\":\"%s'" % name
+            pattern = ",\"test_name\":\"%s" % name
 
             steps = [
-                read_and_filter_transform(input, command=command, stop=stop_event, tail=tail)
+                read_and_filter_transform(input, Filter(pattern=pattern), name=name, stop=stop_event, tail=tail)
             ]
 
             if format != "raw":
@@ -69,4 +70,4 @@ class Handler(HandlerBase):
             super(Handler.Pipeline, self).__init__(steps, stop=stop_event)
 
     def handle(self, args):
-        self.Pipeline(args.name.replace("'", r"'\''"), args.log, args.output, args.format).run()
+        self.Pipeline(args.name, args.log, args.output, args.format).run()
@@ -12,12 +12,14 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import testflows._core.summary as summary_store
 import testflows._core.cli.arg.type as argtype
 
 from testflows._core.cli.arg.common import epilog
 from testflows._core.cli.arg.common import HelpFormatter
 from testflows._core.cli.arg.handlers.handler import Handler as HandlerBase
 from testflows._core.transform.log.pipeline import UnstableReportLogPipeline
+from testflows._core.transform.log.report.unstable import generate_runs
 
 class Handler(HandlerBase):
     @classmethod
@@ -30,8 +32,15 @@ class Handler(HandlerBase):
                 nargs="?", help="input log, default: stdin", default="-")
         parser.add_argument("output", metavar="output", type=argtype.file("w", bufsize=1, encoding="utf-8"),
                 nargs="?", help='output file, default: stdout', default="-")
+        parser.add_argument("--store", metavar="path", type=str,
+                help="show tests that have different results between runs in the summary store instead")
+        parser.add_argument("--last", metavar="N", type=argtype.count,
+                help="use only the last N runs in the summary store")
 
         parser.set_defaults(func=cls())
 
     def handle(self, args):
+        if args.store:
+            args.output.write(generate_runs(summary_store.load(args.store, last=args.last), divider="") or "")
+            return
         UnstableReportLogPipeline(args.input, args.output).run()
@@ -28,6 +28,8 @@ from testflows._core.cli.arg.handlers.transform.fails import Handler as fails_ha
 from testflows._core.cli.arg.handlers.transform.raw import Handler as raw_handler
 from testflows._core.cli.arg.handlers.transform.compress import Handler as compress_handler
 from testflows._core.cli.arg.handlers.transform.decompress import Handler as decompress_handler
+from testflows._core.cli.arg.handlers.transform.verify import Handler as verify_handler
+from testflows._core.cli.arg.handlers.transform.merge import Handler as merge_handler
 
 try:
     from testflows.enterprise._core.cli.transform.handler import Handler as enterprise_handler
@@ -57,5 +59,7 @@ class Handler(HandlerBase):
         compact_handler.add_command(transform_commands)
         compress_handler.add_command(transform_commands)
         decompress_handler.add_command(transform_commands)
+        verify_handler.add_command(transform_commands)
+        merge_handler.add_command(transform_commands)
         if enterprise_handler is not None:
             enterprise_handler.add_command(transform_commands)
@@ -0,0 +1,45 @@
+# Copyright 2023 Katteli Inc.
+# TestFlows.com Open-Source Software Testing Framework (http://testflows.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import testflows._core.cli.arg.type as argtype
+
+from testflows._core.cli.arg.common import epilog
+from testflows._core.cli.arg.common import HelpFormatter
+from testflows._core.cli.arg.handlers.handler import Handler as HandlerBase
+from testflows._core.transform.log.pipeline import MergeLogPipeline
+from testflows._core.shards import shards
+
+class Handler(HandlerBase):
+    @classmethod
+    def add_command(cls, commands):
+        parser = commands.add_parser("merge", help="merge log shards", epilog=epilog(),
+            description="Merge log and its shards into a single log in message time order.\n"
+                "Log shards named '<log>.<pid>.shard' are merged automatically.",
+            formatter_class=HelpFormatter)
+
+        parser.add_argument("input", metavar="input", type=str,
+                help="input log")
+        parser.add_argument("output", metavar="output", type=argtype.logfile("wb"),
+                nargs="?", help='output log, default: stdout', default="-")
+        parser.add_argument("--shards", metavar="shard", type=argtype.logfile("rb"), nargs="+",
+                help="log shards to merge instead of the automatically found shards")
+
+        parser.set_defaults(func=cls())
+
+    def handle(self, args):
+        inputs = [argtype.logfile("rb")(args.input)]
+        inputs += args.shards if args.shards is not None else [
+            argtype.logfile("rb")(shard) for shard in shards(args.input)]
+        with args.output:
+            MergeLogPipeline(inputs, args.output).run()
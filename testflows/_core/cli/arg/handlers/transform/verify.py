@@ -0,0 +1,44 @@
+# Copyright 2023 Katteli Inc.
+# TestFlows.com Open-Source Software Testing Framework (http://testflows.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import testflows._core.cli.arg.type as argtype
+
+from testflows._core.cli.arg.common import epilog
+from testflows._core.cli.arg.common import HelpFormatter
+from testflows._core.cli.arg.exit import ExitWithError
+from testflows._core.cli.arg.handlers.handler import Handler as HandlerBase
+from testflows._core.transform.log.pipeline import VerifyLogPipeline
+
+class Handler(HandlerBase):
+    @classmethod
+    def add_command(cls, commands):
+        parser = commands.add_parser("verify", help="verify log integrity", epilog=epilog(),
+            description="Verify log integrity by checking message numbering\n"
+                "and hash chaining of each test's messages.",
+            formatter_class=HelpFormatter)
+
+        parser.add_argument("input", metavar="input", type=argtype.logfile("r", bufsize=1, encoding="utf-8"),
+                nargs="?", help="input log, default: stdin", default="-")
+        parser.add_argument("output", metavar="output", type=argtype.file("w", bufsize=1, encoding="utf-8"),
+                nargs="?", help='output file, default: stdout', default="-")
+
+        parser.set_defaults(func=cls())
+
+    def handle(self, args):
+        stats = {}
+        VerifyLogPipeline(args.input, args.output, stats).run()
+        args.output.write(f"{stats['messages']} messages, {stats['tests']} tests, "
+            f"integrity '{stats['mode']}', {stats['errors']} errors\n")
+        if stats["errors"]:
+            raise ExitWithError("log integrity verification failed")
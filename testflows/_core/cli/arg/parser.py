@@ -32,7 +32,7 @@ from .type import onoff as onoff_type
 try:
     from testflows.database.cli.handler import Handler as database_handler
 except:
-    database_handler = None
+    from .handlers.database.handler import Handler as database_handler
 
 try:
     from testflows.enterprise._core.cli.handler import Handler as enterprise_handler
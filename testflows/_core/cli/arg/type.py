@@ -21,7 +21,8 @@ import argparse
 from argparse import ArgumentTypeError
 from collections import namedtuple
 from testflows._core.exceptions import exception
-from testflows._core.compress import CompressedFile
+from testflows._core.compress import CompressedFile, compression as parse_compression
+from testflows._core.shards import shards
 from testflows._core.objects import Repeat, Retry
 from testflows._core.tracing import logging
 
@@ -96,6 +97,9 @@ class LogFileType(object):
                 raise ValueError(msg)
 
         # all other arguments are used as file names
+        if 'r' in self._mode and shards(string):
+            raise ArgumentTypeError(f"log '{string}' has unmerged shards, "
+                "use 'tfs transform merge' to merge them into a single log first")
         try:
             fp = CompressedFile(string, self._mode)
             if self._encoding:
@@ -150,6 +154,14 @@ def count(value):
         raise ArgumentTypeError(f"{value} is not a positive number")
     return value
 
+def jobs(value):
+    try:
+        value = int(value)
+        assert value >= 1
+    except:
+        raise ArgumentTypeError(f"{value} is not a positive number")
+    return value
+
 def repeat(value):
     try:
         fields = list(csv.reader([value], "unix"))[-1]
@@ -210,6 +222,49 @@ def onoff(value):
 
 onoff.metavar = str(set(["yes", "1", "on", "no", "0", "off"])).replace(" ","").replace("'","")
 
+def compression(value):
+    try:
+        parse_compression(value)
+    except ValueError as e:
+        raise ArgumentTypeError(str(e))
+    return value
+
+def size(value):
+    """Parse size in bytes with an optional
+    K, M or G suffix.
+    """
+    units = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+    value = value.strip().upper()
+    multiplier = units.get(value[-1:], 1)
+    if value[-1:] in units:
+        value = value[:-1]
+    value = int(value) * multiplier
+    if value < 0:
+        raise ValueError("size can't be negative")
+    return value
+
+def seconds(value):
+    try:
+        value = float(value)
+        assert value > 0
+    except:
+        raise ArgumentTypeError(f"{value} is not a positive number of seconds")
+    return value
+
+def water_marks(value):
+    """Parse high and low water marks
+    specified as 'high[,low]'. Low water mark
+    defaults to 1/4 of the high water mark.
+    """
+    try:
+        high, sep, low = value.partition(",")
+        high = size(high)
+        low = size(low) if sep else high // 4
+        assert low <= high
+    except Exception:
+        raise ArgumentTypeError(f"'{value}' is invalid")
+    return high, low
+
 def trace_level(value):
     if value.lower() in ["debug", "info", "warning", "error", "critical"]:
         return getattr(logging, value.upper())
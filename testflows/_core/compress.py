@@ -16,20 +16,275 @@ import io
 import os
 import sys
 import time
+import zlib
 import lzma
+import struct
+import bisect
 import builtins
 import _compression
 
+from . import sidecar
+from .watch import Watcher
+from .message import lazy_loads, binary_marker, binary_record_size
+
 from lzma import compress, decompress
 
 Compressor = lzma.LZMACompressor
-Decompressor = lzma.LZMADecompressor
+
+#: gzip stream marker
+GZIP_MARKER = b"\x1f\x8b"
+#: xz stream marker
+XZ_MARKER = b"\xfd7zXZ\x00"
+
+#: supported compression methods
+compression_methods = ["none", "zlib", "lzma"]
+
+def compression(mode):
+    """Parse compression mode specified
+    as 'method[:level]'.
+
+    :param mode: compression mode
+    :return: tuple (method, level)
+    """
+    method, sep, level = mode.partition(":")
+    if method not in compression_methods:
+        raise ValueError(f"invalid compression method '{method}', must be one of {compression_methods}")
+    if not sep:
+        return method, None
+    if method == "none":
+        raise ValueError("compression method 'none' does not have a level")
+    try:
+        level = int(level)
+        if not 0 <= level <= 9:
+            raise ValueError
+    except ValueError:
+        raise ValueError(f"invalid compression level '{level}', must be 0-9") from None
+    return method, level
+
+
+def message_time(data):
+    """Return time of the first message in the data
+    or None if data does not start with a message.
+
+    :param data: data that starts with a message
+    """
+    try:
+        if data[:1] == binary_marker:
+            return lazy_loads(data[:binary_record_size(data)])["message_time"]
+        return lazy_loads(data[:data.find(b"\n") + 1].decode("utf-8"))["message_time"]
+    except (ValueError, KeyError, IndexError, TypeError, struct.error):
+        return None
+
+def last_message(data):
+    """Return position of the last message in the data.
+
+    :param data: data that contains only complete messages
+    """
+    pos = last = 0
+    end = len(data)
+    while pos < end:
+        marker = data.find(binary_marker, pos)
+        if marker != pos:
+            stop = end if marker < 0 else marker
+            last = max(pos, data.rfind(b"\n", pos, stop - 1) + 1)
+            pos = stop
+            continue
+        last = pos
+        pos += binary_record_size(data[pos:pos + 5]) or end
+    return last
+
+def block_index(fp, size=1048576):
+    """Build block index of the compressed log.
+
+    Each block is an independent .xz or gzip stream.
+    Block index is a list of tuples that contain uncompressed
+    and compressed offsets of the block and the times of the first
+    and the last messages in the block. The last stream
+    is not indexed if it is not finished yet.
+
+    Returns None if the log does not consist
+    only of .xz and gzip streams.
+
+    :param fp: compressed file
+    :param size: read size, default: 1MB
+    """
+    blocks = []
+    pos = rawpos = 0
+    rawblock = b""
+    fp.seek(0)
+
+    while True:
+        if not rawblock:
+            rawblock = fp.read(size)
+            if not rawblock:
+                break
+        if rawblock.startswith(XZ_MARKER[:len(rawblock)]):
+            decompressor = lzma.LZMADecompressor(format=lzma.FORMAT_XZ)
+        elif rawblock.startswith(GZIP_MARKER[:len(rawblock)]):
+            decompressor = zlib.decompressobj(31)
+        else:
+            return None
+        data = []
+        start = rawpos
+        while not decompressor.eof:
+            if not rawblock:
+                rawblock = fp.read(size)
+                if not rawblock:
+                    return blocks
+            try:
+                data.append(decompressor.decompress(rawblock))
+            except (lzma.LZMAError, zlib.error):
+                return None
+            rawpos += len(rawblock) - len(decompressor.unused_data)
+            rawblock = decompressor.unused_data
+        data = b"".join(data)
+        if data:
+            blocks.append((pos, start, message_time(data), message_time(data[last_message(data):])))
+        pos += len(data)
+
+    return blocks
+
+class StreamCompressor:
+    """Log stream compressor that produces
+    chunks which can be decompressed as soon as they are written.
+
+    The 'zlib' method uses continuous gzip streams
+    where each chunk is a sync-flushed block. The 'lzma' method
+    uses continuous .xz streams but because the lzma module
+    does not support sync flushing, compressed data only becomes
+    available once the stream is finished.
+
+    A stream is finished once it contains at least the block size
+    of data or it was started at least the block time ago
+    so that each stream can be decompressed on its own when seeking.
+    Without the block size and the block time, each 'lzma' chunk
+    is a complete stream and 'zlib' uses one stream.
+
+    :param mode: compression mode 'none', 'zlib[:level]' or 'lzma[:level]'
+    :param block_size: minimum size of data in each stream, default: None
+    :param block_time: maximum time in seconds since
+        the stream was started, default: None
+    """
+    def __init__(self, mode="lzma", block_size=None, block_time=None):
+        self.method, self.level = compression(mode)
+        self.block_size = block_size
+        self.block_time = block_time
+        self._compressor = None
+        self._size = 0
+        self._started = 0
+
+    @property
+    def pending(self):
+        """True if compressed stream contains
+        data that can't be decompressed until
+        the stream is finished.
+        """
+        return self.method == "lzma" and self._compressor is not None
+
+    def compress(self, data):
+        """Compress chunk of data.
+
+        :param data: data
+        """
+        if self.method == "none":
+            return data
+        if self.method == "lzma" and self.block_size is None and self.block_time is None:
+            return compress(data, preset=self.level)
+        if self._compressor is None:
+            if self.method == "lzma":
+                self._compressor = Compressor(format=lzma.FORMAT_XZ, preset=self.level)
+            else:
+                self._compressor = zlib.compressobj(6 if self.level is None else self.level, zlib.DEFLATED, 31)
+            self._started = time.monotonic()
+        self._size += len(data)
+        data = self._compressor.compress(data)
+        if ((self.block_size is not None and self._size >= self.block_size)
+                or (self.block_time is not None and time.monotonic() - self._started >= self.block_time)):
+            return data + self.close()
+        if self.method == "zlib":
+            data += self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        return data
+
+    def close(self):
+        """Finish compressed stream and
+        return any remaining data.
+        """
+        if self._compressor is None:
+            return b""
+        compressor, self._compressor = self._compressor, None
+        self._size = 0
+        if self.method == "lzma":
+            return compressor.flush()
+        return compressor.flush(zlib.Z_FINISH)
+
+
+class GzipDecompressor:
+    """Gzip stream decompressor that has the same
+    interface as lzma.LZMADecompressor.
+    """
+    def __init__(self):
+        self._decompressor = zlib.decompressobj(47)
+
+    @property
+    def eof(self):
+        return self._decompressor.eof
+
+    @property
+    def needs_input(self):
+        return not self._decompressor.unconsumed_tail
+
+    @property
+    def unused_data(self):
+        return self._decompressor.unused_data
+
+    def decompress(self, data, max_length=-1):
+        return self._decompressor.decompress(self._decompressor.unconsumed_tail + data,
+            max(max_length, 0))
+
+
+class Decompressor:
+    """Decompressor that selects gzip or lzma
+    decompressor based on the stream marker.
+
+    :param kwargs: lzma.LZMADecompressor keyword arguments
+    """
+    def __init__(self, **kwargs):
+        self._kwargs = kwargs
+        self._decompressor = None
+        self._data = b""
+
+    @property
+    def eof(self):
+        return self._decompressor is not None and self._decompressor.eof
+
+    @property
+    def needs_input(self):
+        return self._decompressor is None or self._decompressor.needs_input
+
+    @property
+    def unused_data(self):
+        return b"" if self._decompressor is None else self._decompressor.unused_data
+
+    def decompress(self, data, max_length=-1):
+        if self._decompressor is None:
+            data = self._data + data
+            if len(data) < len(GZIP_MARKER):
+                self._data = data
+                return b""
+            self._data = b""
+            if data.startswith(GZIP_MARKER):
+                self._decompressor = GzipDecompressor()
+            else:
+                self._decompressor = lzma.LZMADecompressor(**self._kwargs)
+        return self._decompressor.decompress(data, max_length)
 
 class TailingDecompressReader(_compression.DecompressReader):
 
     def __init__(self, *args, **kwargs):
         self._tail = kwargs.pop("tail", True)
         self._tail_sleep = float(kwargs.pop("tail_sleep", 0.15))
+        # in non-blocking tail mode return no data instead of waiting
+        self._block = kwargs.pop("block", True)
         # default compressed file marker '.7zXZ'
         self._COMPRESSED_FILE_MARKER = b"\xfd\x37\x7a\x58\x5a"
         # default uncompressed file marker is start of the message
@@ -37,6 +292,33 @@ class TailingDecompressReader(_compression.DecompressReader):
 
         super(TailingDecompressReader, self).__init__(*args, **kwargs)
 
+        # watcher must be started before reading so that no write is missed
+        self._watcher = Watcher(getattr(self._fp, "name", None),
+            poll_interval=self._tail_sleep) if self._tail else None
+
+    def wait(self):
+        """Wait for new data in tail mode.
+        """
+        if self._watcher is not None:
+            self._watcher.wait()
+
+    def restart(self, pos, rawpos):
+        """Restart decompression at the start of the compressed block.
+
+        :param pos: uncompressed offset of the block
+        :param rawpos: compressed offset of the block
+        """
+        self._fp.seek(rawpos)
+        self._decompressor = self._decomp_factory(**self._decomp_args)
+        self._eof = False
+        self._pos = pos
+        self.rawblock = b""
+
+    def close(self):
+        if self._watcher is not None:
+            self._watcher.close()
+        return super(TailingDecompressReader, self).close()
+
     def read(self, size=-1, _tail_sleep=0.15):
         if size < 0:
             return self.readall()
@@ -53,7 +335,9 @@ class TailingDecompressReader(_compression.DecompressReader):
                 if not self.rawblock:
                     if not self._tail:
                         break
-                    time.sleep(self._tail_sleep)
+                    if not self._block:
+                        return b""
+                    self.wait()
                     continue
                 # Continue to next stream.
                 self._decompressor = self._decomp_factory(
@@ -69,7 +353,9 @@ class TailingDecompressReader(_compression.DecompressReader):
                     if not self.rawblock:
                         if not self._tail:
                             break
-                        time.sleep(self._tail_sleep)
+                        if not self._block:
+                            return b""
+                        self.wait()
                         continue
                 else:
                     self.rawblock = b""
@@ -112,12 +398,15 @@ class TailingDecompressReader(_compression.DecompressReader):
 
 class CompressedFile(lzma.LZMAFile):
     def __init__(self, filename=None, mode="r", *,
-            format=None, check=-1, preset=None, filters=None, tail=False):
+            format=None, check=-1, preset=None, filters=None, tail=False, block=True):
         self._fp = None
         self._closefp = False
         self._mode = lzma._MODE_CLOSED
         self._raw_mode = False
+        self._raw_block = b""
         self._tail = tail
+        self._block = block
+        self._blocks = None
 
         if mode in ("r", "rb"):
             if check != -1:
@@ -156,25 +445,47 @@ class CompressedFile(lzma.LZMAFile):
             raise TypeError("filename must be a str, bytes, file or PathLike object")
 
         if self._mode == lzma._MODE_READ:
-            self.raw = TailingDecompressReader(self._fp, lzma.LZMADecompressor,
-                trailing_error=lzma.LZMAError, format=format, filters=filters, tail=self._tail)
+            self.raw = TailingDecompressReader(self._fp, Decompressor,
+                trailing_error=(lzma.LZMAError, zlib.error), format=format, filters=filters, tail=self._tail, block=self._block)
             self._buffer = io.BufferedReader(self.raw)
 
     @property
     def name(self):
         return getattr(self._fp, "name", None)
 
+    def wait(self):
+        """Wait for new data in tail mode.
+        """
+        if self._mode == lzma._MODE_READ:
+            self.raw.wait()
+
+    def _raw_read(self, read, size=-1):
+        """Read from the underlying file in raw mode
+        returning any data left from the raw block first.
+        """
+        if self._raw_block:
+            data, self._raw_block = self._raw_block, b""
+            return data
+        return read(size)
+
+    def _fallback_to_raw_mode(self, e):
+        """Fall back to raw mode if we can't decompress data.
+        """
+        if "Input format not supported by decoder" in str(e):
+            self._raw_mode = True
+            self._raw_block = self.raw.rawblock
+            return True
+        return False
+
     def read(self, size=-1):
         self._check_can_read()
         if self._raw_mode:
-            return self._fp.read(size)
+            return self._raw_read(self._fp.read, size)
         try:
             return self._buffer.read(size)
         except lzma.LZMAError as e:
-            # fall back to raw mode if we can't decompress data
-            if "Input format not supported by decoder" in str(e):
-                self._raw_mode = True
-                return self.raw.rawblock
+            if self._fallback_to_raw_mode(e):
+                return self._raw_read(self._fp.read, size)
             raise
 
     def read1(self, size=-1):
@@ -182,12 +493,73 @@ class CompressedFile(lzma.LZMAFile):
         if size < 0:
             size = io.DEFAULT_BUFFER_SIZE
         if self._raw_mode:
-            return self._fp.read1(size)
+            return self._raw_read(self._fp.read1, size)
         try:
             return self._buffer.read1(size)
         except lzma.LZMAError as e:
-            # fall back to raw mode if we can't decompress data
-            if "Input format not supported by decoder" in str(e):
-                self._raw_mode = True
-                return self.raw.rawblock
-            raise
\ No newline at end of file
+            if self._fallback_to_raw_mode(e):
+                return self._raw_read(self._fp.read1, size)
+            raise
+
+    def blocks(self):
+        """Return block index of the log stored in the log
+        sidecar file building and storing it if needed.
+
+        Returns None if the log is being tailed, is not
+        a regular file or is not a sequence of .xz or gzip streams.
+        """
+        if self._blocks is None:
+            self._blocks = False
+            logfile = sidecar.logfile(self)
+            if not self._tail and not self._raw_mode and logfile is not None:
+                key = sidecar.key(logfile)
+                blocks = sidecar.load(logfile, "blocks", key)
+                if blocks is None:
+                    with builtins.open(logfile, "rb") as fp:
+                        blocks = block_index(fp)
+                    if blocks and os.path.getsize(logfile) == key[0]:
+                        sidecar.save(logfile, "blocks", blocks, key)
+                if blocks:
+                    self._blocks = ([block[0] for block in blocks], blocks)
+        return self._blocks[1] if self._blocks else None
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        """Change position in the uncompressed stream.
+
+        If block index is available then only
+        the block that contains the offset is decompressed.
+        """
+        self._check_can_seek()
+        if not self._raw_mode:
+            if whence == io.SEEK_SET and self.blocks():
+                offsets, blocks = self._blocks
+                block = blocks[max(bisect.bisect_right(offsets, offset) - 1, 0)]
+                # keep reading the current block if the offset is ahead in it
+                if not block[0] <= self._buffer.tell() <= offset:
+                    self._buffer.detach()
+                    self.raw.restart(block[0], block[1])
+                    self._buffer = io.BufferedReader(self.raw)
+            try:
+                return self._buffer.seek(offset, whence)
+            except lzma.LZMAError as e:
+                if not self._fallback_to_raw_mode(e):
+                    raise
+        self._raw_block = b""
+        return self._fp.seek(offset, whence)
+
+    def readline(self, size=-1):
+        self._check_can_read()
+        if not self._raw_mode:
+            try:
+                return self._buffer.readline(size)
+            except lzma.LZMAError as e:
+                if not self._fallback_to_raw_mode(e):
+                    raise
+        if self._raw_block:
+            idx = self._raw_block.find(b"\n")
+            if idx < 0:
+                line, self._raw_block = self._raw_block, b""
+                return line + self._fp.readline()
+            line, self._raw_block = self._raw_block[:idx + 1], self._raw_block[idx + 1:]
+            return line
+        return self._fp.readline(size)
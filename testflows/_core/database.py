@@ -0,0 +1,164 @@
+# Copyright 2023 Katteli Inc.
+# TestFlows.com Open-Source Software Testing Framework (http://testflows.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import sqlite3
+
+import testflows.settings as settings
+
+from testflows._core.flags import RETRY
+from testflows._core.testtype import TestType
+
+#: database settings key of the built-in SQLite database
+key = "sqlite"
+
+#: database schema
+schema = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    uid TEXT NOT NULL UNIQUE,
+    name TEXT,
+    version TEXT,
+    started REAL,
+    result_type TEXT,
+    duration REAL
+);
+CREATE INDEX IF NOT EXISTS runs_started ON runs (started);
+CREATE TABLE IF NOT EXISTS tests (
+    run INTEGER NOT NULL,
+    test_id TEXT NOT NULL,
+    test_name TEXT NOT NULL,
+    test_type TEXT,
+    test_subtype TEXT,
+    test_parent_type TEXT,
+    test_flags INTEGER,
+    test_cflags INTEGER,
+    test_level INTEGER,
+    started REAL,
+    result_type TEXT,
+    result_message TEXT,
+    result_reason TEXT,
+    duration REAL,
+    PRIMARY KEY (run, test_id)
+);
+CREATE INDEX IF NOT EXISTS tests_name ON tests (test_name, run);
+CREATE TABLE IF NOT EXISTS metrics (
+    run INTEGER NOT NULL,
+    test_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value,
+    units TEXT,
+    time REAL
+);
+CREATE INDEX IF NOT EXISTS metrics_test ON metrics (run, test_id);
+CREATE INDEX IF NOT EXISTS metrics_name ON metrics (name);
+CREATE TABLE IF NOT EXISTS test_values (
+    run INTEGER NOT NULL,
+    test_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value,
+    time REAL
+);
+CREATE INDEX IF NOT EXISTS test_values_test ON test_values (run, test_id);
+"""
+
+#: test types that are compared between runs
+test_types = tuple(test_type.name for test_type in TestType if test_type >= TestType.Test)
+#: parent test types of tests that are compared between runs
+parent_types = tuple(test_type.name for test_type in TestType if test_type >= TestType.Suite)
+
+def filename(database=None):
+    """Return file name of the built-in SQLite database
+    or None if it is not used.
+
+    :param database: database settings (list of key, value pairs),
+        default: settings.database
+    """
+    if database is None:
+        database = settings.database
+    for name, value in database or []:
+        if name == key:
+            return value
+    return None
+
+def connect(filename):
+    """Open SQLite database and create
+    its schema if it does not exist.
+
+    :param filename: database file name
+    """
+    connection = sqlite3.connect(filename, timeout=60)
+    # allow reading while tests are being stored
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.executescript(schema)
+    return connection
+
+def column(value):
+    """Return value that can be stored in a column.
+
+    :param value: value
+    """
+    if value is None or type(value) in (int, float, str):
+        return value
+    return json.dumps(value)
+
+def runs(last=None):
+    """Return query and its parameters
+    that select ids of the runs.
+
+    :param last: only last number of runs, default: all
+    """
+    if last is None:
+        return "SELECT id FROM runs", ()
+    return "SELECT id FROM runs ORDER BY started DESC LIMIT ?", (last,)
+
+def flaky(connection, last=None):
+    """Return counts of results of each test
+    that was run with different results.
+
+    Steps, tests inside other tests and retries
+    are not included.
+
+    :param connection: database connection
+    :param last: only use last number of runs, default: all
+    """
+    query, params = runs(last)
+    counts = {}
+    rows = connection.execute(
+        "SELECT test_name, result_type, COUNT(*) FROM tests"
+        f" WHERE run IN ({query}) AND result_type IS NOT NULL"
+        f" AND test_type IN ({','.join('?' * len(test_types))})"
+        f" AND (test_parent_type IS NULL OR test_parent_type IN ({','.join('?' * len(parent_types))}))"
+        " AND test_cflags & ? = 0"
+        " GROUP BY test_name, result_type ORDER BY test_name",
+        params + test_types + parent_types + (int(RETRY),))
+    for test_name, result_type, count in rows:
+        if counts.get(test_name) is None:
+            counts[test_name] = {}
+        counts[test_name][result_type] = count
+    return {name: results for name, results in counts.items() if len(results) > 1}
+
+def durations(connection, name, last=None):
+    """Return start time, result and duration
+    of the test in each run ordered by the start time.
+
+    :param connection: database connection
+    :param name: test name
+    :param last: only use last number of runs, default: all
+    """
+    query, params = runs(last)
+    return connection.execute(
+        "SELECT started, result_type, duration FROM tests"
+        f" WHERE test_name = ? AND run IN ({query}) ORDER BY started",
+        (name,) + params).fetchall()
@@ -18,10 +18,13 @@ import glob
 import atexit
 import signal
 import threading
+import contextlib
 
 import testflows.settings as settings
+import testflows._core.database as database
 
 from .compress import CompressedFile
+from .shards import ShardedLogFile, shards, merge as merge_shards
 from .transform.log.pipeline import RawLogPipeline
 from .transform.log.pipeline import NiceLogPipeline
 from .transform.log.pipeline import ParallelNiceLogPipeline
@@ -34,6 +37,7 @@ from .transform.log.pipeline import ClassicLogPipeline
 from .transform.log.pipeline import FailsLogPipeline
 from .transform.log.pipeline import ManualLogPipeline
 from .transform.log.pipeline import QuietLogPipeline
+from .transform.log.pipeline import DatabaseLogPipeline
 from .templog import glob as templog_glob, parser as templog_parser, dirname as templog_dirname
 from .parallel import top
 from .objects import Error
@@ -43,6 +47,10 @@ _handlers = []
 def _at_exit():
     for handler in _handlers:
         handler.join()
+    # output handler has read all the shards to their end
+    # so they can be merged into the log
+    if _handlers and settings.log_shards:
+        merge_shards(settings.log_shards, settings.log_compression)
 
 atexit.register(_at_exit)
 
@@ -78,20 +86,29 @@ def cleanup():
             continue
         pid = int(match.groupdict()['pid'])
         if not pid_exists(pid):
-            try:
-                os.remove(file)
-            except FileNotFoundError:
-                pass
-            except PermissionError:
-                pass
-            except OSError:
-                raise
+            for _file in [file] + shards(file):
+                try:
+                    os.remove(_file)
+                except FileNotFoundError:
+                    pass
+                except PermissionError:
+                    pass
+                except OSError:
+                    raise
+
+def open_logfile():
+    """Open log file for tailing that includes
+    messages from the log shards if they are used.
+    """
+    if settings.log_shards:
+        return ShardedLogFile(settings.read_logfile, tail=True)
+    return CompressedFile(settings.read_logfile, tail=True)
 
 def stdout_raw_handler():
     """Handler to output messages to sys.stdout
     using "raw" format.
     """
-    with CompressedFile(settings.read_logfile, tail=True) as log:
+    with open_logfile() as log:
         log.seek(0)
         RawLogPipeline(log, sys.stdout, tail=True).run()
 
@@ -99,7 +116,7 @@ def stdout_slick_handler():
     """Handler to output messages to sys.stdout
     using "slick" format.
     """
-    with CompressedFile(settings.read_logfile, tail=True) as log:
+    with open_logfile() as log:
         log.seek(0)
         SlickLogPipeline(log, sys.stdout, tail=True, show_input=False).run()
 
@@ -107,7 +124,7 @@ def stdout_classic_handler():
     """Handler to output messages to sys.stdout
     using "classic" format.
     """
-    with CompressedFile(settings.read_logfile, tail=True) as log:
+    with open_logfile() as log:
         log.seek(0)
         ClassicLogPipeline(log, sys.stdout, tail=True, show_input=False).run()
 
@@ -115,7 +132,7 @@ def stdout_fails_handler():
     """Handler to output messages to sys.stdout
     using "fails" format.
     """
-    with CompressedFile(settings.read_logfile, tail=True) as log:
+    with open_logfile() as log:
         log.seek(0)
         FailsLogPipeline(log, sys.stdout, tail=True, show_input=False).run()
 
@@ -123,7 +140,7 @@ def stdout_new_fails_handler():
     """Handler to output messages to sys.stdout
     using "fails" format that shows only new fails.
     """
-    with CompressedFile(settings.read_logfile, tail=True) as log:
+    with open_logfile() as log:
         log.seek(0)
         FailsLogPipeline(log, sys.stdout, tail=True, only_new=True, show_input=False).run()
 
@@ -131,7 +148,7 @@ def stdout_short_handler():
     """Handler to output messages to sys.stdout
     using "short" format.
     """
-    with CompressedFile(settings.read_logfile, tail=True) as log:
+    with open_logfile() as log:
         log.seek(0)
         ShortLogPipeline(log, sys.stdout, tail=True, show_input=False).run()
 
@@ -139,7 +156,7 @@ def stdout_nice_handler():
     """Handler to output messages to sys.stdout
     using "nice" format.
     """
-    with CompressedFile(settings.read_logfile, tail=True) as log:
+    with open_logfile() as log:
         log.seek(0)
         NiceLogPipeline(log, sys.stdout, tail=True, show_input=False).run()
 
@@ -147,7 +164,7 @@ def stdout_pnice_handler():
     """Handler to output messages to sys.stdout
     using "pnice" format.
     """
-    with CompressedFile(settings.read_logfile, tail=True) as log:
+    with open_logfile() as log:
         log.seek(0)
         ParallelNiceLogPipeline(log, sys.stdout, tail=True, show_input=False).run()
 
@@ -155,7 +172,7 @@ def stdout_brisk_handler():
     """Handler to output messages to sys.stdout
     using "brisk" format.
     """
-    with CompressedFile(settings.read_logfile, tail=True) as log:
+    with open_logfile() as log:
         log.seek(0)
         BriskLogPipeline(log, sys.stdout, tail=True, show_input=False).run()
 
@@ -163,7 +180,7 @@ def stdout_manual_handler():
     """Handler to output messages to sys.stdout
     using "manual" format.
     """
-    with CompressedFile(settings.read_logfile, tail=True) as log:
+    with open_logfile() as log:
         log.seek(0)
         ManualLogPipeline(log, sys.stdout, tail=True, show_input=False).run()
 
@@ -171,7 +188,7 @@ def stdout_dots_handler():
     """Handler to output messages to sys.stdout
     using "dots" format.
     """
-    with CompressedFile(settings.read_logfile, tail=True) as log:
+    with open_logfile() as log:
         log.seek(0)
         DotsLogPipeline(log, sys.stdout, tail=True, show_input=False).run()
 
@@ -179,7 +196,7 @@ def stdout_progress_handler():
     """Handler to output messages to sys.stdout
     using "progress" format.
     """
-    with CompressedFile(settings.read_logfile, tail=True) as log:
+    with open_logfile() as log:
         log.seek(0)
         ProgressLogPipeline(log, sys.stdout, tail=True, show_input=False).run()
 
@@ -187,7 +204,7 @@ def stdout_quiet_handler():
     """Handler that prints no output to sys.stdout unless
     top level test fails.
     """
-    with CompressedFile(settings.read_logfile, tail=True) as log:
+    with open_logfile() as log:
         log.seek(0)
         QuietLogPipeline(log, sys.stdout, tail=True, show_input=False).run()
 
@@ -213,11 +230,22 @@ def start_output_handler():
     handler.start()
     _handlers.append(handler)
 
+def sqlite_database_handler():
+    """Handler to store test results in the
+    built-in SQLite database.
+    """
+    with open_logfile() as log, contextlib.closing(database.connect(database.filename())) as connection:
+        log.seek(0)
+        DatabaseLogPipeline(log, connection, tail=True).run()
+
 def start_database_handler():
     if not settings.database:
         return
 
-    from testflows.database import database_handler
+    if database.filename() is not None:
+        database_handler = sqlite_database_handler
+    else:
+        from testflows.database import database_handler
 
     handler = threading.Thread(target=database_handler)
     handler.name = 'tfs-database'
@@ -0,0 +1,51 @@
+# Copyright 2023 Katteli Inc.
+# TestFlows.com Open-Source Software Testing Framework (http://testflows.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import zlib
+import hashlib
+
+class crc32:
+    """CRC32 message hash.
+    """
+    def __init__(self, data=b""):
+        self.value = zlib.crc32(data)
+
+    def hexdigest(self):
+        return f"{self.value:08x}"
+
+def blake2b(data=b""):
+    """BLAKE2b message hash.
+    """
+    return hashlib.blake2b(data, digest_size=16)
+
+#: message integrity modes and their hash functions
+hash_funcs = {
+    "none": None,
+    "crc32": crc32,
+    "blake2b": blake2b,
+    "sha1": hashlib.sha1
+}
+
+#: default message integrity mode
+default = "sha1"
+
+def hash_func(mode):
+    """Return hash function for the message integrity mode.
+
+    :param mode: message integrity mode
+    """
+    try:
+        return hash_funcs[mode]
+    except KeyError:
+        raise ValueError(f"unknown message integrity mode '{mode}'") from None
@@ -13,20 +13,25 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import time
+import heapq
+import bisect
+import itertools
 import threading
-
-from multiprocessing.dummy import Pool
+import collections
 
 import testflows.settings as settings
 import testflows._core.tracing as tracing
 
-from .compress import compress
+from .compress import StreamCompressor
 from .constants import id_sep, end_of_message
 from .exceptions import exception as get_exception
-from .message import Message, MessageObjectType, dumps
+from .message import Message, MessageObjectType, dumps, dumpb, dumpb_fields, binary_set_hash
 from .objects import Tag, ExamplesRow
 from . import __version__
 from .parallel.service import BaseServiceObject
+from .parallel.channel import LogChannel, log_channel
+from .shards import shard_filename, end_marker
+from .watch import notify
 
 tracer = tracing.getLogger(__name__)
 
@@ -45,10 +50,14 @@ class TestOutput(object):
     :param io: message IO
     """
     protocol_version = "TFSPv2.1"
+    binary_protocol_version = "TFSPv3"
 
     def __init__(self, test, io):
         self.io = io
         self.test = test
+        self.binary = settings.log_format == "binary"
+        if self.binary:
+            self.protocol_version = self.binary_protocol_version
         self.msg_hash = ""
         self.msg_count = 0
         self.prefix = {
@@ -61,6 +70,10 @@ class TestOutput(object):
             "test_level": len(self.test.id),
             "test_parent_type": str(self.test.parent_type) if self.test.parent_type is not None else None
         }
+        # test-constant fields are serialized only once per test
+        self.prefix_keys = self.prefix.keys()
+        self.json_prefix = dumps(self.prefix)[1:-1]
+        self.binary_prefix = dumpb_fields(self.prefix)
 
     def message(self, keyword, message, object_type=0, stream=None):
         """Output message.
@@ -70,7 +83,7 @@ class TestOutput(object):
         """
         msg_time = time.time()
 
-        msg = {
+        header = {
             "message_keyword": str(keyword),
             "message_hash": self.msg_hash,
             "message_object": object_type,
@@ -84,7 +97,6 @@ class TestOutput(object):
             "message_time": round(msg_time, settings.time_resolution),
             "message_rtime": round(msg_time - self.test.start_time, settings.time_resolution)
         }
-        msg.update(self.prefix)
 
         if settings.secrets_registry:
             if not settings.secrets_registry.is_empty():
@@ -97,17 +109,47 @@ class TestOutput(object):
                 if "argument_value" in message and message["argument_value"]:
                     message["argument_value"] = settings.secrets_registry.filter(message["argument_value"])
 
-        msg.update(message)
-        self.test.tracer.debug("test message", extra={"test_message":msg})
+        # use cached prefix unless message overrides any of the prefix fields
+        cached = not (self.prefix_keys & message.keys())
+
+        if not cached or self.test.tracer.isEnabledFor(tracing.DEBUG):
+            msg = dict(header)
+            msg.update(self.prefix)
+            msg.update(message)
+            self.test.tracer.debug("test message", extra={"test_message":msg})
+
+        # protocol message is always in JSON format
+        # so that readers can identify the protocol version
+        if self.binary and keyword != Message.PROTOCOL:
+            if cached:
+                header["test_id"] = self.prefix["test_id"]
+                msg = dumpb(header, fields=self.binary_prefix + dumpb_fields(message))
+            else:
+                msg = dumpb(msg)
+            self.msg_count += 1
+            if settings.hash_func is not None:
+                self.msg_hash = settings.hash_func(msg[5:]).hexdigest()[:settings.hash_length]
+                msg = binary_set_hash(msg, self.msg_hash)
+            self.io.write(msg)
+            return
 
-        msg = dumps(msg)
+        if cached:
+            msg = (f"{{\"message_keyword\":\"{header['message_keyword']}\",\"message_hash\":\"",
+                (f"\",\"message_object\":{int(object_type)},\"message_num\":{self.msg_count},"
+                f"\"message_stream\":{'null' if stream is None else dumps(stream)},"
+                f"\"message_level\":{header['message_level']},"
+                f"\"message_time\":{float.__repr__(header['message_time'])},"
+                f"\"message_rtime\":{float.__repr__(header['message_rtime'])},"
+                f"{self.json_prefix}{',' if message else ''}{dumps(message)[1:-1]}}}"))
+        else:
+            msg = dumps(msg).split(",", 2)
+            msg = (f"{msg[0]},\"message_hash\":\"", f"\",{msg[2]}")
 
-        self.msg_hash = settings.hash_func(msg.encode("utf-8")).hexdigest()[:settings.hash_length]
+        if settings.hash_func is not None:
+            self.msg_hash = settings.hash_func(f"{msg[0]}{self.msg_hash}{msg[1]}".encode("utf-8")).hexdigest()[:settings.hash_length]
         self.msg_count += 1
 
-        parts = msg.split(",",2)
-        parts[1] = f"\"message_hash\":\"{self.msg_hash}\""
-        self.io.write(f"{parts[0]},{parts[1]},{parts[2]}{end_of_message}")
+        self.io.write(f"{msg[0]}{self.msg_hash}{msg[1]}{end_of_message}")
 
     def stop(self):
         """Output stop message."""
@@ -116,7 +158,7 @@ class TestOutput(object):
     def protocol(self):
         """Output protocol version message.
         """
-        msg = {"protocol_version": self.protocol_version}
+        msg = {"protocol_version": self.protocol_version, "protocol_integrity": settings.log_integrity}
         self.message(Message.PROTOCOL, msg)
 
     def version(self):
@@ -337,7 +379,9 @@ class MessageIO(object):
         """
         if not msg:
             return
-        if msg[-1] == "\n" and not self.buffer:
+        if type(msg) is bytes:
+            self.io.write(msg)
+        elif msg[-1] == "\n" and not self.buffer:
             self.io.write(msg)
         elif msg.endswith("\n") or "\n" in msg:
             self.buffer += msg
@@ -460,25 +504,90 @@ class LogReader(object):
             self.fd.close()
 
 
+class LogBuffer(collections.deque):
+    """Log writer thread buffer.
+
+    Written byte count is only updated by the owner thread
+    and collected byte count is only updated by the flusher thread.
+    Appending flag is set by the owner thread while it takes
+    the sequence number of a message and appends the message.
+    """
+    def __init__(self):
+        super(LogBuffer, self).__init__()
+        self.appending = False
+        self.written = 0
+        self.collected = 0
+        self.checked = 0
+
+
 class LogWriter(object):
     """Singleton log file writer.
+
+    Each thread appends messages to its own buffer without
+    taking any lock. A dedicated flusher thread periodically collects
+    messages from all the buffers, merges them in the order they were
+    written, and then compresses and writes them to the log file.
+
+    The flusher adapts its schedule to the workload. While messages
+    are being written it flushes at least every flush latency target
+    and sooner if buffered messages exceed the flush size. When idle,
+    it backs off up to the maximum flush interval and the next written
+    message wakes it up.
+
+    When buffered messages exceed the high water mark, writers
+    trigger an immediate flush and block until buffered messages
+    drop below the low water mark.
     """
     lock = threading.Lock()
     instance = None
-    auto_flush_interval = 0.15
+    #: buffered bytes that trigger an immediate flush
+    flush_size = 1024 * 1024
+    #: maximum size of messages compressed into one block
+    block_size = 1024 * 1024
+    #: maximum time messages are held in an unfinished compressed block
+    block_time = 1.0
+    #: maximum flush interval when idle
+    max_flush_interval = 2.0
 
     def __new__(cls, *args, **kwargs):
         fd = kwargs.pop("fd", None)
+        channel = kwargs.pop("channel", None)
+        filename = kwargs.pop("filename", None)
+        end = kwargs.pop("end", None)
 
         with cls.lock:
             if not cls.instance:
                 self = object.__new__(LogWriter)
-                self.fd = fd or ProtectedFile(open(settings.write_logfile, "ab", buffering=0))
+                # remote writers prefer dedicated log channel
+                # over the service object when it is available
+                if channel is not None:
+                    fd = log_channel(channel) or fd
+                self.fd = fd or ProtectedFile(open(filename or settings.write_logfile, "ab", buffering=0))
+                # line that is written last when the writer is closed
+                self.end = end
+                # remote writers send messages to the parent log writer
+                # which compresses them as part of its own stream
+                self.compressor = StreamCompressor("none" if isinstance(self.fd, (BaseServiceObject, LogChannel))
+                    else settings.log_compression, block_size=self.block_size, block_time=self.block_time)
                 self.lock = threading.Lock()
-                self.buffer = []
-                self.pool = Pool(1)
-                self.cancel = False
-                self.pool.apply_async(self.flush, (), dict(sleep=cls.auto_flush_interval, force=True))
+                self.flush_lock = threading.Lock()
+                self.local = threading.local()
+                self.buffers = []
+                self.pending = []
+                self.sequence = itertools.count()
+                self.closed = False
+                self.high_water_mark = settings.log_buffer_high_water_mark
+                self.low_water_mark = settings.log_buffer_low_water_mark
+                self.flush_latency = settings.log_flush_latency
+                self.idle = False
+                # each thread checks buffered bytes after writing this many bytes
+                self.check_size = max(1, min(self.flush_size // 4, self.high_water_mark // 64))
+                self.peak_buffered = 0
+                self.high_water_mark_reached = False
+                self.drained = threading.Condition()
+                self.flush_event = threading.Event()
+                self.flusher = threading.Thread(target=self.auto_flush, name="LogWriter", daemon=True)
+                self.flusher.start()
                 cls.instance = self
             return cls.instance
 
@@ -486,37 +595,171 @@ class LogWriter(object):
         pass
 
     def write(self, msg):
+        try:
+            buffer = self.local.buffer
+        except AttributeError:
+            buffer = self.local.buffer = LogBuffer()
+            with self.lock:
+                self.buffers.append((threading.current_thread(), buffer))
+        data = msg if type(msg) is bytes else msg.encode("utf-8")
+        buffer.appending = True
+        buffer.append((next(self.sequence), data))
+        buffer.appending = False
+        buffer.written += len(data)
+        if self.idle:
+            self.idle = False
+            self.flush_event.set()
+        if buffer.written - buffer.checked >= self.check_size:
+            buffer.checked = buffer.written
+            self.backpressure()
+        return len(msg)
+
+    def buffered(self):
+        """Return number of bytes buffered
+        in all thread buffers.
+        """
         with self.lock:
-            self.buffer.append(msg.encode("utf-8"))
-            return len(msg)
+            buffers = list(self.buffers)
+        return sum(buffer.written - buffer.collected for _, buffer in buffers)
 
-    def flush(self, force=False, final=False, sleep=None):
-        if not force:
-            return
+    def backpressure(self):
+        """Block writer while buffered bytes are above
+        the high water mark until the flusher brings
+        them below the low water mark.
+        """
+        buffered = self.buffered()
+        self.peak_buffered = max(self.peak_buffered, buffered)
 
-        if sleep:
-            time.sleep(sleep)
+        if buffered >= self.flush_size:
+            self.flush_event.set()
 
-        if self.cancel:
+        if buffered < self.high_water_mark or threading.current_thread() is self.flusher:
             return
 
+        self.high_water_mark_reached = True
+        with self.drained:
+            while not self.closed and self.flusher.is_alive() and self.buffered() > self.low_water_mark:
+                self.flush_event.set()
+                self.drained.wait(self.flush_latency)
+
+    def collect(self, final=False):
+        """Collect messages from all thread buffers and
+        merge them in the order they were written.
+
+        Messages written after the collection has started are held
+        until the next collection so that a message is never written
+        before any message that was written ahead of it in another thread.
+        Messages that were given a sequence number before the collection
+        has started but are still being appended are waited for.
+
+        :param final: collect all messages, default: False
+        """
+        cutoff = next(self.sequence)
+
         with self.lock:
-            self.cancel = True
-            if self.buffer:
-                self.fd.write(compress(b"".join(self.buffer)))
+            buffers = list(self.buffers)
+
+        chunks = [self.pending]
+        for thread, buffer in buffers:
+            while buffer.appending and thread.is_alive():
+                time.sleep(0)
+            chunk = [buffer.popleft() for _ in range(len(buffer))]
+            buffer.collected += sum(len(msg) for _, msg in chunk)
+            chunks.append(chunk)
+            if not thread.is_alive() and not buffer:
+                with self.lock:
+                    self.buffers.remove((thread, buffer))
+
+        messages = list(heapq.merge(*chunks))
+        idx = len(messages) if final else bisect.bisect_left(messages, (cutoff,))
+        self.pending = messages[idx:]
+
+        return [msg for _, msg in messages[:idx]]
+
+    def blocks(self, messages):
+        """Split messages into blocks of at most block size
+        bytes so that each compressed block is small
+        enough to be decompressed on its own when seeking.
+
+        :param messages: messages
+        """
+        block = []
+        size = 0
+        for msg in messages:
+            if block and size + len(msg) > self.block_size:
+                yield b"".join(block)
+                block = []
+                size = 0
+            block.append(msg)
+            size += len(msg)
+        if block:
+            yield b"".join(block)
+
+    def auto_flush(self):
+        """Flush log periodically until the writer
+        is closed or the main thread exits.
+        """
+        interval = self.flush_latency
+        while not self.closed and threading.main_thread().is_alive():
+            self.flush_event.wait(interval)
+            self.flush_event.clear()
+            if self.flush(force=True) or self.pending:
+                interval = self.flush_latency
+                continue
+            # mark writer as idle only after a flush that had nothing
+            # to write so that messages written while busy do not wake us up
+            # before the flush latency and check buffers again
+            # so that a message written just before is not delayed
+            self.idle = True
+            if self.buffered():
+                self.idle = False
+                interval = self.flush_latency
+            else:
+                interval = min(interval * 2, self.max_flush_interval)
+
+    def flush(self, force=False, final=False):
+        """Flush buffered messages to the log file.
+
+        :param force: force flush, default: False
+        :param final: final flush, default: False
+        :return: number of flushed messages
+        """
+        if not force:
+            return 0
+
+        with self.flush_lock:
+            if self.closed:
+                return 0
+
+            messages = self.collect(final=final)
+
+            data = b"".join([self.compressor.compress(block) for block in self.blocks(messages)])
+
+            if not messages and self.compressor.pending:
+                # finish compressed block when idle so that
+                # messages are not held in it
+                data += self.compressor.close()
+            if final:
+                self.closed = True
+                data += self.compressor.close()
+            if data:
+                self.fd.write(data)
                 self.fd.flush()
-                del self.buffer[:]
+                notify()
+
+        with self.drained:
+            self.drained.notify_all()
 
-            if not final and threading.main_thread().is_alive():
-                self.cancel = False
-                self.pool.apply_async(self.flush, (), dict(sleep=self.auto_flush_interval, force=True))
+        return len(messages)
 
     def close(self, flush=False, final=False):
         if final:
-            self.pool.close()
+            if self.end is not None and not self.closed:
+                self.write(self.end)
             self.flush(force=True, final=True)
+            self.flush_event.set()
+            self.flusher.join()
             self.fd.close()
-            self.pool.join()
         elif flush:
             self.flush(force=True)
 
@@ -529,7 +772,10 @@ class LogIO(object):
     """
     def __init__(self):
         if isinstance(settings.write_logfile, BaseServiceObject):
-            self.writer = LogWriter(fd=settings.write_logfile)
+            if settings.log_shards:
+                self.writer = LogWriter(filename=shard_filename(settings.log_shards), end=end_marker)
+            else:
+                self.writer = LogWriter(fd=settings.write_logfile, channel=settings.log_channel)
         else:
             self.writer = LogWriter()
 
@@ -12,7 +12,9 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import re
 import json
+import struct
 
 from collections import namedtuple
 
@@ -73,3 +75,454 @@ def dumps(o):
 
 def loads(s):
     return json.loads(s)
+
+
+#: binary record marker
+binary_marker = b"\x1e"
+#: binary record length prefix
+binary_length = struct.Struct("<I")
+#: binary record fixed header (keyword, object, level, num, time, rtime)
+binary_header = struct.Struct("<BBHQdd")
+#: offset of the message hash in the binary record
+binary_hash_offset = len(binary_marker) + binary_length.size + binary_header.size
+
+_binary_keyword_codes = {m.name: int(m) for m in Message}
+_binary_keyword_names = {int(m): m.name for m in Message}
+_binary_header_keys = {
+    "message_keyword", "message_hash", "message_object", "message_num",
+    "message_stream", "message_level", "message_time", "message_rtime"
+}
+_binary_int64 = struct.Struct("<q")
+_binary_float64 = struct.Struct("<d")
+_binary_uint16 = struct.Struct("<H")
+_binary_uint32 = binary_length
+
+def _dumpb_value(v, out):
+    t = type(v)
+    if t is str:
+        v = v.encode("utf-8")
+        out += b"s"
+        out += _binary_uint32.pack(len(v))
+        out += v
+    elif v is None:
+        out += b"N"
+    elif t is bool:
+        out += b"T" if v else b"F"
+    elif t is int:
+        if -(1 << 63) <= v < (1 << 63):
+            out += b"i"
+            out += _binary_int64.pack(v)
+        else:
+            v = str(v).encode("utf-8")
+            out += b"I"
+            out += _binary_uint32.pack(len(v))
+            out += v
+    elif t is float:
+        out += b"d"
+        out += _binary_float64.pack(v)
+    elif t is list or t is tuple:
+        out += b"l"
+        out += _binary_uint32.pack(len(v))
+        for e in v:
+            _dumpb_value(e, out)
+    elif t is dict:
+        out += b"m"
+        out += _binary_uint32.pack(len(v))
+        for k, e in v.items():
+            k = str(k).encode("utf-8")
+            out += _binary_uint32.pack(len(k))
+            out += k
+            _dumpb_value(e, out)
+    elif isinstance(v, (str, int, float)):
+        _dumpb_value((str if isinstance(v, str) else int if isinstance(v, int) else float)(v), out)
+    else:
+        raise TypeError(f"Object of type {type(v).__name__} is not serializable")
+
+def _loadb_value(b, pos):
+    t = b[pos]
+    pos += 1
+    if t == 0x73: # s
+        size, = _binary_uint32.unpack_from(b, pos)
+        pos += 4
+        return b[pos:pos + size].decode("utf-8"), pos + size
+    elif t == 0x4e: # N
+        return None, pos
+    elif t == 0x54: # T
+        return True, pos
+    elif t == 0x46: # F
+        return False, pos
+    elif t == 0x69: # i
+        return _binary_int64.unpack_from(b, pos)[0], pos + 8
+    elif t == 0x64: # d
+        return _binary_float64.unpack_from(b, pos)[0], pos + 8
+    elif t == 0x49: # I
+        size, = _binary_uint32.unpack_from(b, pos)
+        pos += 4
+        return int(b[pos:pos + size]), pos + size
+    elif t == 0x6c: # l
+        size, = _binary_uint32.unpack_from(b, pos)
+        pos += 4
+        v = []
+        for _ in range(size):
+            e, pos = _loadb_value(b, pos)
+            v.append(e)
+        return v, pos
+    elif t == 0x6d: # m
+        size, = _binary_uint32.unpack_from(b, pos)
+        pos += 4
+        v = {}
+        for _ in range(size):
+            ksize, = _binary_uint32.unpack_from(b, pos)
+            pos += 4
+            k = b[pos:pos + ksize].decode("utf-8")
+            pos += ksize
+            v[k], pos = _loadb_value(b, pos)
+        return v, pos
+    raise ValueError(f"invalid binary value type {bytes([t])!r} at position {pos - 1}")
+
+def dumpb_fields(o):
+    """Serialize message fields that are not
+    part of the fixed binary record header.
+
+    :param o: message
+    """
+    out = bytearray()
+    for k, v in o.items():
+        if k in _binary_header_keys:
+            continue
+        k = k.encode("utf-8")
+        out.append(len(k))
+        out += k
+        if k == b"test_id":
+            # test id is stored in the header
+            out += b"h"
+        else:
+            _dumpb_value(v, out)
+    return bytes(out)
+
+def dumpb(o, fields=None):
+    """Serialize message into a binary record.
+
+    Record format is a marker byte followed by the length
+    of the rest of the record, fixed header with message
+    keyword, object, level, number, time and relative time,
+    message hash, message stream, test id and typed fields.
+    Records are always terminated by a new line.
+
+    :param o: message
+    :param fields: pre-serialized fields, default: None
+    """
+    stream = o["message_stream"]
+    test_id = o["test_id"].encode("utf-8")
+    msg_hash = o["message_hash"].encode("ascii")
+    if fields is None:
+        fields = dumpb_fields(o)
+    body = b"".join([
+        binary_header.pack(_binary_keyword_codes[o["message_keyword"]], o["message_object"],
+            o["message_level"], o["message_num"], o["message_time"], o["message_rtime"]),
+        bytes((len(msg_hash),)), msg_hash,
+        _binary_uint16.pack(0xffff) if stream is None else _binary_uint16.pack(len(stream.encode("utf-8"))),
+        b"" if stream is None else stream.encode("utf-8"),
+        _binary_uint16.pack(len(test_id)), test_id,
+        fields,
+        b"\n"
+    ])
+    return binary_marker + binary_length.pack(len(body)) + body
+
+def binary_record_size(b):
+    """Return full size of the binary record
+    or 0 if the size is not yet known.
+
+    :param b: bytes that start with binary record marker
+    """
+    if len(b) < 5:
+        return 0
+    return 5 + binary_length.unpack_from(b, 1)[0]
+
+def binary_keyword(b):
+    """Return message keyword of the binary record.
+
+    :param b: binary record
+    """
+    return _binary_keyword_names[b[5]]
+
+def binary_time(b):
+    """Return message time of the binary record.
+
+    :param b: binary record
+    """
+    return binary_header.unpack_from(b, 5)[4]
+
+def binary_hash(b):
+    """Return message hash of the binary record.
+
+    :param b: binary record
+    """
+    size = b[binary_hash_offset]
+    return b[binary_hash_offset + 1:binary_hash_offset + 1 + size].decode("ascii")
+
+def binary_set_hash(b, msg_hash):
+    """Return binary record with the message hash replaced.
+
+    :param b: binary record
+    :param msg_hash: new message hash
+    """
+    size = b[binary_hash_offset]
+    msg_hash = msg_hash.encode("ascii")
+    body = b"".join([
+        b[5:binary_hash_offset], bytes((len(msg_hash),)), msg_hash,
+        b[binary_hash_offset + 1 + size:]
+    ])
+    return binary_marker + binary_length.pack(len(body)) + body
+
+def _loadb_header(b):
+    """Deserialize fixed header of the binary record and return
+    message with the header fields, test id and the position of the fields.
+    """
+    keyword, obj, level, num, msg_time, msg_rtime = binary_header.unpack_from(b, 5)
+    pos = binary_hash_offset
+    size = b[pos]
+    msg_hash = b[pos + 1:pos + 1 + size].decode("ascii")
+    pos += 1 + size
+    size, = _binary_uint16.unpack_from(b, pos)
+    pos += 2
+    if size == 0xffff:
+        stream = None
+    else:
+        stream = b[pos:pos + size].decode("utf-8")
+        pos += size
+    size, = _binary_uint16.unpack_from(b, pos)
+    pos += 2
+    test_id = b[pos:pos + size].decode("utf-8")
+    pos += size
+
+    msg = {
+        "message_keyword": _binary_keyword_names[keyword],
+        "message_hash": msg_hash,
+        "message_object": obj,
+        "message_num": num,
+        "message_stream": stream,
+        "message_level": level,
+        "message_time": msg_time,
+        "message_rtime": msg_rtime
+    }
+
+    return msg, test_id, pos
+
+def loadb(b):
+    """Deserialize binary record into a message.
+
+    :param b: binary record
+    """
+    msg, test_id, pos = _loadb_header(b)
+
+    end = len(b) - 1
+    while pos < end:
+        size = b[pos]
+        k = b[pos + 1:pos + 1 + size].decode("utf-8")
+        pos += 1 + size
+        if b[pos] == 0x68: # h
+            msg[k] = test_id
+            pos += 1
+        else:
+            msg[k], pos = _loadb_value(b, pos)
+
+    return msg
+
+#: JSON string pattern
+_json_str_pattern = r'(null|"[^"\\]*(?:\\.[^"\\]*)*")'
+#: JSON message keyword
+json_keyword = re.compile(r'\{"message_keyword":"(\w+)"')
+#: fixed JSON message header (message and test prefix fields)
+json_header = re.compile(
+    r'\{"message_keyword":"\w+","message_hash":"(\w*)","message_object":(\d+),"message_num":(\d+),'
+    r'"message_stream":' + _json_str_pattern + r',"message_level":(\d+),'
+    r'"message_time":([-+.\deE]+),"message_rtime":([-+.\deE]+),'
+    r'"test_type":"(\w+)","test_subtype":' + _json_str_pattern + r',"test_id":' + _json_str_pattern + ','
+    r'"test_name":' + _json_str_pattern + r',"test_flags":(-?\d+),"test_cflags":(-?\d+),'
+    r'"test_level":(\d+),"test_parent_type":' + _json_str_pattern + r'[,}]'
+)
+
+def _json_str(s):
+    if s == "null":
+        return None
+    if "\\" in s:
+        return json.loads(s)
+    return s[1:-1]
+
+#: fixed JSON message header fields (match group and converter)
+json_header_fields = {
+    "message_hash": (0, str),
+    "message_object": (1, int),
+    "message_num": (2, int),
+    "message_stream": (3, _json_str),
+    "message_level": (4, int),
+    "message_time": (5, float),
+    "message_rtime": (6, float),
+    "test_type": (7, str),
+    "test_subtype": (8, _json_str),
+    "test_id": (9, _json_str),
+    "test_name": (10, _json_str),
+    "test_flags": (11, int),
+    "test_cflags": (12, int),
+    "test_level": (13, int),
+    "test_parent_type": (14, _json_str)
+}
+
+class LazyMessage(dict):
+    """Parsed message that initially contains only
+    the fields that are cheap to extract. Fixed JSON message
+    header fields are extracted one by one when accessed and the
+    rest of the message is decoded only when any other field is accessed.
+
+    Once decoded, it is the same as the dictionary
+    returned by loads() or loadb().
+
+    :param line: JSON message or binary message record
+    :param fields: initial fields
+    """
+    __slots__ = ("line", "groups")
+
+    def __init__(self, line, fields):
+        dict.__init__(self, fields)
+        self.line = line
+        self.groups = None
+
+    def load(self, key):
+        """Make sure field is decoded if message has it.
+
+        :param key: field
+        """
+        line = self.line
+        if line is None or dict.__contains__(self, key):
+            return
+        field = json_header_fields.get(key)
+        if field is not None and type(line) is str:
+            groups = self.groups
+            if groups is None:
+                match = json_header.match(line)
+                groups = self.groups = match.groups() if match else ()
+            if groups:
+                index, convert = field
+                dict.__setitem__(self, key, convert(groups[index]))
+                return
+        self.decode()
+
+    def decode(self):
+        """Decode full message.
+        """
+        line = self.line
+        if line is not None:
+            self.line = None
+            self.groups = None
+            msg = loadb(line) if type(line) is bytes else loads(line)
+            # keep the same field order as the full message
+            dict.clear(self)
+            dict.update(self, msg)
+        return self
+
+    def __missing__(self, key):
+        if self.line is None:
+            raise KeyError(key)
+        self.load(key)
+        return self[key]
+
+    def get(self, key, default=None):
+        self.load(key)
+        return dict.get(self, key, default)
+
+    def __contains__(self, key):
+        self.load(key)
+        return dict.__contains__(self, key)
+
+    def __bool__(self):
+        return True
+
+    def __len__(self):
+        return dict.__len__(self.decode())
+
+    def __iter__(self):
+        return dict.__iter__(self.decode())
+
+    def __reversed__(self):
+        return dict.__reversed__(self.decode())
+
+    def __eq__(self, other):
+        return dict.__eq__(self.decode(), other)
+
+    def __ne__(self, other):
+        return dict.__ne__(self.decode(), other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return dict.__repr__(self.decode())
+
+    def __reduce__(self):
+        return (dict, (dict.copy(self.decode()),))
+
+    def __or__(self, other):
+        return dict.__or__(dict.copy(self.decode()), other)
+
+    def __ror__(self, other):
+        return dict.__or__(other, dict.copy(self.decode()))
+
+    def __ior__(self, other):
+        dict.update(self.decode(), other)
+        return self
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self.decode(), key, value)
+
+    def __delitem__(self, key):
+        dict.__delitem__(self.decode(), key)
+
+    def keys(self):
+        return dict.keys(self.decode())
+
+    def values(self):
+        return dict.values(self.decode())
+
+    def items(self):
+        return dict.items(self.decode())
+
+    def copy(self):
+        return dict.copy(self.decode())
+
+    def pop(self, *args):
+        return dict.pop(self.decode(), *args)
+
+    def popitem(self):
+        return dict.popitem(self.decode())
+
+    def setdefault(self, key, default=None):
+        return dict.setdefault(self.decode(), key, default)
+
+    def update(self, *args, **kwargs):
+        dict.update(self.decode(), *args, **kwargs)
+
+    def clear(self):
+        self.line = None
+        self.groups = None
+        dict.clear(self)
+
+def lazy_loads(line):
+    """Deserialize only the message keyword of the JSON message
+    or the fixed header of the binary message record and return
+    a lazy message that decodes the rest of the message on demand.
+
+    If the message keyword can't be extracted then
+    the message is fully decoded.
+
+    :param line: JSON message or binary message record
+    """
+    if type(line) is bytes:
+        msg, test_id, _ = _loadb_header(line)
+        msg["test_id"] = test_id
+        return LazyMessage(line, msg)
+
+    match = json_keyword.match(line)
+    if match is None:
+        return loads(line)
+
+    return LazyMessage(line, {"message_keyword": match.group(1)})
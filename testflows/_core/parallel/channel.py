@@ -0,0 +1,168 @@
+# Copyright 2023 Katteli Inc.
+# TestFlows.com Open-Source Software Testing Framework (http://testflows.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import shutil
+import socket
+import struct
+import atexit
+import tempfile
+import threading
+import selectors
+
+#: log channel frame header with the length of the frame
+frame_header = struct.Struct("<I")
+
+#: sync frame acknowledgement
+sync_ack = b"\x06"
+
+# global process wide log channel server
+_log_channel_server = None
+_log_channel_server_lock = threading.Lock()
+
+
+class LogChannelServer:
+    """Unix domain socket server that receives batches of log
+    messages from worker processes and writes them to the log writer
+    using one thread for all the connections.
+
+    Each batch is sent as a frame prefixed by its length.
+    An empty frame is a sync request that is acknowledged
+    after all the previous frames have been written.
+
+    :param writer: log writer
+    """
+    def __init__(self, writer):
+        self.writer = writer
+        self.dir = tempfile.mkdtemp(prefix="tfs-log-channel-")
+        self.address = os.path.join(self.dir, "log.sock")
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.bind(self.address)
+        self.sock.listen()
+        self.thread = threading.Thread(target=self.serve, name="LogChannelServer", daemon=True)
+        self.thread.start()
+
+    def serve(self):
+        """Receive and write frames from all the connections.
+        """
+        with selectors.DefaultSelector() as selector:
+            selector.register(self.sock, selectors.EVENT_READ)
+            while True:
+                for key, _ in selector.select():
+                    if key.fileobj is self.sock:
+                        try:
+                            conn, _ = self.sock.accept()
+                        except OSError:
+                            return
+                        selector.register(conn, selectors.EVENT_READ, bytearray())
+                        continue
+
+                    conn, buffer = key.fileobj, key.data
+                    try:
+                        data = conn.recv(1024 * 1024)
+                    except OSError:
+                        data = b""
+                    if not data:
+                        selector.unregister(conn)
+                        conn.close()
+                        continue
+                    buffer += data
+                    self.process(conn, buffer)
+
+    def process(self, conn, buffer):
+        """Write all complete frames in the connection buffer.
+
+        :param conn: connection
+        :param buffer: connection buffer
+        """
+        pos = 0
+        while len(buffer) - pos >= frame_header.size:
+            size, = frame_header.unpack_from(buffer, pos)
+            end = pos + frame_header.size + size
+            if len(buffer) < end:
+                break
+            if size:
+                self.writer.write(bytes(buffer[pos + frame_header.size:end]))
+            else:
+                conn.sendall(sync_ack)
+            pos = end
+        del buffer[:pos]
+
+    def close(self):
+        """Close server and remove its socket.
+        """
+        self.sock.close()
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+
+class LogChannel:
+    """Worker side of the log channel that has
+    file-like interface used by the log writer.
+
+    :param address: log channel server address
+    """
+    def __init__(self, address):
+        self.lock = threading.Lock()
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(address)
+
+    def write(self, data):
+        with self.lock:
+            self.sock.sendall(frame_header.pack(len(data)))
+            self.sock.sendall(data)
+        return len(data)
+
+    def flush(self):
+        """Wait until the server has written
+        all the data sent so far.
+        """
+        with self.lock:
+            self.sock.sendall(frame_header.pack(0))
+            self.sock.recv(len(sync_ack))
+
+    def close(self):
+        with self.lock:
+            self.sock.close()
+
+
+def log_channel_server(writer):
+    """Get or start global process wide log channel server.
+    Returns None if unix domain sockets are not supported.
+
+    :param writer: log writer
+    """
+    global _log_channel_server
+
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+
+    with _log_channel_server_lock:
+        if _log_channel_server is None:
+            _log_channel_server = LogChannelServer(writer)
+            atexit.register(_log_channel_server.close)
+        return _log_channel_server
+
+
+def log_channel(address):
+    """Connect to the log channel server.
+    Returns None if connection can't be established.
+
+    :param address: log channel server address
+    """
+    if not address or not hasattr(socket, "AF_UNIX"):
+        return None
+    try:
+        return LogChannel(address)
+    except OSError:
+        return None
@@ -38,6 +38,7 @@ from .asyncio import asyncio
 from .asyncio import GlobalAsyncPoolExecutor
 from ..asyncio import is_running_in_event_loop, wrap_future, Future as asyncio_Future
 from ..service import BaseServiceObject, ServiceObjectType, process_service, auto_expose
+from ..channel import log_channel_server
 from .. import current, top, previous, _get_parallel_context, join as parallel_join
 from ...objects import Result
 from ...tracing import logging
@@ -88,11 +89,19 @@ class WorkerSettings:
         self.time_resolution = settings.debug
         self.hash_length = settings.hash_length
         self.hash_func = settings.hash_func
+        self.log_integrity = settings.log_integrity
+        self.log_compression = settings.log_compression
+        self.log_flush_latency = settings.log_flush_latency
+        self.log_buffer_high_water_mark = settings.log_buffer_high_water_mark
+        self.log_buffer_low_water_mark = settings.log_buffer_low_water_mark
         self.no_colors = settings.no_colors
         self.test_id = settings.test_id
         self.output_format = settings.output_format
-        self.write_logfile = self._set_service_object(current().io.io.io.writer.fd)
+        self.write_logfile = self._set_service_object(current().io.io.io.writer)
+        self.log_channel = self._log_channel(current().io.io.io.writer)
+        self.log_shards = settings.log_shards
         self.read_logfile = self._set_service_object(current().io.io.io.reader.fd)
+        self.log_format = settings.log_format
         self.database = settings.database
         self.show_skipped = settings.show_skipped
         self.trim_results = settings.trim_results
@@ -110,6 +119,12 @@ class WorkerSettings:
         self.secrets_registry = settings.secrets_registry
         self.trace = settings.trace
 
+    def _log_channel(self, writer):
+        server = log_channel_server(writer)
+        if server is None:
+            return None
+        return server.address
+
     def _set_service_object(self, obj):
         if obj is None:
             return obj
@@ -146,11 +161,19 @@ class _WorkItem(object):
             settings.time_resolution = work_settings.time_resolution
             settings.hash_length = work_settings.hash_length
             settings.hash_func = work_settings.hash_func
+            settings.log_integrity = work_settings.log_integrity
+            settings.log_compression = work_settings.log_compression
+            settings.log_flush_latency = work_settings.log_flush_latency
+            settings.log_buffer_high_water_mark = work_settings.log_buffer_high_water_mark
+            settings.log_buffer_low_water_mark = work_settings.log_buffer_low_water_mark
             settings.no_colors = work_settings.no_colors
             settings.test_id = work_settings.test_id
             settings.output_format = work_settings.output_format
             settings.write_logfile = work_settings.write_logfile
+            settings.log_channel = work_settings.log_channel
+            settings.log_shards = work_settings.log_shards
             settings.read_logfile = work_settings.read_logfile
+            settings.log_format = work_settings.log_format
             settings.database = work_settings.database
             settings.show_skipped = work_settings.show_skipped
             settings.trim_results = work_settings.trim_results
@@ -0,0 +1,225 @@
+# Copyright 2023 Katteli Inc.
+# TestFlows.com Open-Source Software Testing Framework (http://testflows.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import io
+import os
+import glob
+import tempfile
+import threading
+import contextlib
+
+from .watch import Watcher
+from .compress import CompressedFile, StreamCompressor
+from .transform.log.read import transform as read_transform
+
+#: line that shard writer writes last when it is closed
+end_marker = b'{"shard_end":true}\n'
+
+def shard_filename(logfile, pid=None):
+    """Return log shard file name for the process.
+
+    :param logfile: log file name
+    :param pid: process id, default: current process
+    """
+    return f"{logfile}.{os.getpid() if pid is None else pid}.shard"
+
+def shards(logfile):
+    """Return sorted list of existing shards of the log file.
+
+    :param logfile: log file name
+    """
+    return sorted(glob.glob(f"{glob.escape(logfile)}.*.shard"))
+
+def merge(logfile, compression="lzma", block_size=1048576):
+    """Merge log shards into the log in message time order
+    and remove them.
+
+    :param logfile: log file name
+    :param compression: compression mode of the merged log, default: 'lzma'
+    :param block_size: maximum size of messages compressed
+        into one block, default: 1MB
+    """
+    from .transform.log.merge import transform as merge_transform
+
+    filenames = shards(logfile)
+    if not filenames:
+        return
+
+    compressor = StreamCompressor(compression, block_size=block_size)
+    fd, tmpname = tempfile.mkstemp(prefix=os.path.basename(logfile) + ".", suffix=".merge",
+        dir=os.path.dirname(os.path.abspath(logfile)))
+    try:
+        with os.fdopen(fd, "wb") as output, contextlib.ExitStack() as stack:
+            inputs = [stack.enter_context(CompressedFile(filename)) for filename in [logfile] + filenames]
+            block = []
+            size = 0
+            for line in merge_transform(inputs):
+                if line is None:
+                    continue
+                block.append(line)
+                size += len(line)
+                if size >= block_size:
+                    output.write(compressor.compress(b"".join(block)))
+                    block = []
+                    size = 0
+            output.write(compressor.compress(b"".join(block)) + compressor.close())
+        os.replace(tmpname, logfile)
+    except BaseException:
+        os.unlink(tmpname)
+        raise
+
+    for filename in filenames:
+        os.remove(filename)
+
+def shard_pid(filename):
+    """Return process id of the shard writer
+    or None if it is not known.
+
+    :param filename: shard file name
+    """
+    try:
+        return int(filename.rsplit(".", 2)[-2])
+    except ValueError:
+        return None
+
+def exited(pid):
+    """Return True if process does not exist.
+
+    :param pid: process id
+    """
+    if pid is None:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        pass
+    return False
+
+
+class ShardedLogFile:
+    """Log file reader that combines messages from
+    the log file and all its shards as they become available.
+
+    Messages of each file are returned in order but messages
+    from different files are interleaved as they are read.
+    The stop message of the log file is returned only after
+    all the shards have been read to their end marker or,
+    if the shard writer process has exited without writing it,
+    until no more data is available.
+
+    :param logfile: log file name
+    :param tail: tail mode, default: False
+    """
+    def __init__(self, logfile, tail=False):
+        self.logfile = logfile
+        self.tail = tail
+        self.files = []
+        self.readers = {}
+        self.stop = threading.Event()
+        self.stop_line = None
+        self.ended = set()
+        self.exited = set()
+        self.next = 0
+        # watch log directory to be notified about changes in the log and its shards
+        self.watcher = Watcher(os.path.dirname(os.path.abspath(logfile))) if tail else None
+        self.readers[logfile] = self._open(logfile, stop=self.stop)
+
+    def _open(self, filename, stop=None):
+        file = CompressedFile(filename, tail=self.tail, block=False)
+        self.files.append(file)
+        reader = read_transform(file, tail=self.tail, stop=stop, block=False)
+        next(reader)
+        return reader
+
+    def _scan(self):
+        """Open any new shards.
+        """
+        for filename in shards(self.logfile):
+            if filename not in self.readers:
+                self.readers[filename] = self._open(filename)
+
+    def _read(self, filename):
+        """Return next line from the file or None
+        if no line is currently available.
+        """
+        try:
+            line = next(self.readers[filename])
+        except StopIteration:
+            return None
+        if line is None:
+            return None
+        if filename == self.logfile:
+            if self.stop.is_set():
+                # hold stop message until all the shards are read
+                self.stop_line, line = line, None
+        elif line == end_marker or line == end_marker.decode("utf-8"):
+            self.ended.add(filename)
+            line = None
+        return line
+
+    def _finished(self, filenames):
+        """Return True if all the shards are finished.
+
+        Shard is finished when its end marker was read or
+        its writer process has exited before the last read
+        that returned no data.
+        """
+        finished = all(filename in self.ended or filename in self.exited for filename in filenames)
+        self.exited = {filename for filename in filenames
+            if filename not in self.ended and exited(shard_pid(filename))}
+        return finished
+
+    def readline(self):
+        filenames = list(self.readers)
+        if self.stop_line is not None:
+            filenames.remove(self.logfile)
+        for i in range(len(filenames)):
+            filename = filenames[(self.next + i) % len(filenames)]
+            line = self._read(filename)
+            if line is not None:
+                self.next = (self.next + i + 1) % len(filenames)
+                return line.encode("utf-8") if type(line) is str else line
+
+        self._scan()
+
+        if (self.stop_line is not None and len(self.readers) == len(filenames) + 1
+                and self._finished(filenames)):
+            line, self.stop_line = self.stop_line, ""
+            return line.encode("utf-8") if type(line) is str else line
+
+        return b""
+
+    def seek(self, offset):
+        if offset != 0:
+            raise io.UnsupportedOperation("sharded log file can only be read from the start")
+
+    def wait(self):
+        """Wait for new data in the log or its shards.
+        """
+        if self.watcher is not None:
+            self.watcher.wait()
+
+    def close(self):
+        if self.watcher is not None:
+            self.watcher.close()
+        for file in self.files:
+            file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
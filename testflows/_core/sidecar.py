@@ -0,0 +1,132 @@
+# Copyright 2023 Katteli Inc.
+# TestFlows.com Open-Source Software Testing Framework (http://testflows.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import json
+import zlib
+import hashlib
+import tempfile
+
+#: sidecar file suffix
+suffix = ".tfsidx"
+#: sidecar file format marker
+marker = b"TFSIDX2\n"
+
+def filename(logfile):
+    """Return sidecar file name for the log file.
+
+    :param logfile: log file name
+    """
+    return f"{logfile}{suffix}"
+
+def logfile(file):
+    """Return log file name of the open file
+    or None if the file is not a regular file.
+
+    :param file: open file
+    """
+    name = getattr(file, "name", None)
+    if not isinstance(name, str) or not os.path.isfile(name):
+        return None
+    return name
+
+#: log file keys computed by this process
+_keys = {}
+
+def key(logfile):
+    """Return key of the log file that consists
+    of the log file size and its content digest.
+
+    Key is only computed once for the same log file
+    unless the log file is modified.
+
+    :param logfile: log file name
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(logfile, "rb") as fd:
+        stat = os.fstat(fd.fileno())
+        size = stat.st_size
+        stat = (os.path.abspath(logfile), stat.st_dev, stat.st_ino, size, stat.st_mtime_ns)
+        if stat in _keys:
+            return _keys[stat]
+        while True:
+            data = fd.read(1048576)
+            if not data:
+                break
+            digest.update(data)
+    _keys[stat] = (size, digest.hexdigest())
+    return _keys[stat]
+
+def read(logfile, key):
+    """Return entries stored in the sidecar file of the log
+    or an empty dictionary if sidecar does not exist or is not valid
+    for the current contents of the log.
+
+    Sidecar file only contains JSON data so that
+    reading it never executes any code.
+
+    :param logfile: log file name
+    :param key: log file key
+    """
+    try:
+        with open(filename(logfile), "rb") as fd:
+            data = fd.read()
+        if not data.startswith(marker):
+            return {}
+        sidecar = json.loads(zlib.decompress(data[len(marker):]))
+        if sidecar["key"] != list(key):
+            return {}
+        entries = sidecar["entries"]
+        if type(entries) is not dict:
+            return {}
+        return entries
+    except (OSError, ValueError, zlib.error, KeyError, TypeError):
+        return {}
+
+def load(logfile, name, key):
+    """Return entry stored in the sidecar file of the log
+    or None if entry is not available.
+
+    :param logfile: log file name
+    :param name: entry name
+    :param key: log file key
+    """
+    return read(logfile, key).get(name)
+
+def save(logfile, name, value, key):
+    """Store entry in the sidecar file of the log. Entries
+    stored for the same log contents are preserved.
+    Failure to write the sidecar file is ignored.
+
+    :param logfile: log file name
+    :param name: entry name
+    :param value: entry value that is JSON serializable
+    :param key: log file key
+    """
+    entries = dict(read(logfile, key))
+    entries[name] = value
+    data = marker + zlib.compress(json.dumps({"key": key, "entries": entries},
+        separators=(",", ":")).encode("utf-8"), 1)
+    dirname = os.path.dirname(os.path.abspath(logfile))
+    try:
+        fd, tmpname = tempfile.mkstemp(prefix=os.path.basename(logfile) + ".", suffix=suffix + ".tmp", dir=dirname)
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                tmp.write(data)
+            os.replace(tmpname, filename(logfile))
+        except BaseException:
+            os.unlink(tmpname)
+            raise
+    except OSError:
+        pass
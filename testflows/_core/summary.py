@@ -0,0 +1,125 @@
+# Copyright 2023 Katteli Inc.
+# TestFlows.com Open-Source Software Testing Framework (http://testflows.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import json
+import glob
+import hashlib
+import tempfile
+
+from testflows._core.flags import Flags, RETRY
+from testflows._core.testtype import TestType
+
+#: summary file suffix
+suffix = ".json"
+
+def tests(results):
+    """Return tests that are compared between runs
+    which excludes steps, tests inside other tests
+    and retries.
+
+    :param results: log results
+    """
+    for name, entry in results["tests"].items():
+        test = entry["test"]
+        if getattr(TestType, test["test_type"]) < TestType.Test:
+            continue
+        if test.get("test_parent_type"):
+            if getattr(TestType, test["test_parent_type"]) < TestType.Suite:
+                continue
+        if Flags(test["test_cflags"]) & RETRY:
+            continue
+        yield name, entry
+
+def summary(results, log):
+    """Return compact summary of the run that
+    only contains attributes of the top level test
+    and results of the tests that are compared between runs.
+
+    :param results: log results
+    :param log: log name
+    """
+    attributes = []
+    if results["tests"]:
+        test = next(iter(results["tests"].values()))["test"]
+        attributes = [{"attribute_name": attr["attribute_name"], "attribute_value": attr["attribute_value"]}
+            for attr in test["attributes"]]
+
+    return {
+        "log": log,
+        "started": results.get("started", 0),
+        "attributes": attributes,
+        "tests": {
+            name: {
+                "result_type": entry["result"].get("result_type"),
+                "message_rtime": entry["result"].get("message_rtime"),
+                "metrics": [{
+                        "metric_name": metric["metric_name"],
+                        "metric_value": metric["metric_value"],
+                        "metric_units": metric["metric_units"]
+                    } for metric in entry["result"]["metrics"]]
+            } for name, entry in tests(results)
+        }
+    }
+
+def filename(store, summary, digest=None):
+    """Return summary file name in the store.
+    File names sort in the order the runs were started.
+
+    :param store: summary store directory
+    :param summary: run summary
+    :param digest: log digest, default: digest of the summary
+    """
+    if digest is None:
+        digest = hashlib.blake2b(json.dumps(summary, sort_keys=True).encode("utf-8"), digest_size=16).hexdigest()
+    return os.path.join(store, f"{int(summary['started'] * 1000000):020d}-{digest}{suffix}")
+
+def add(store, summary, digest=None):
+    """Add run summary to the store unless
+    it is already there and return summary file name.
+
+    :param store: summary store directory
+    :param summary: run summary
+    :param digest: log digest, default: digest of the summary
+    """
+    name = filename(store, summary, digest)
+    if os.path.exists(name):
+        return name
+
+    os.makedirs(store, exist_ok=True)
+    fd, tmpname = tempfile.mkstemp(prefix=".", suffix=suffix + ".tmp", dir=store)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as tmp:
+            json.dump(summary, tmp, separators=(",", ":"))
+        os.replace(tmpname, name)
+    except BaseException:
+        os.unlink(tmpname)
+        raise
+    return name
+
+def load(store, last=None):
+    """Return run summaries in the store
+    in the order the runs were started.
+
+    :param store: summary store directory
+    :param last: only load last number of runs, default: all
+    """
+    names = sorted(glob.glob(os.path.join(glob.escape(store), "*" + suffix)))
+    if last is not None:
+        names = names[-last:] if last > 0 else []
+    summaries = []
+    for name in names:
+        with open(name, "r", encoding="utf-8") as fd:
+            summaries.append(json.load(fd))
+    return summaries
@@ -27,6 +27,7 @@ from collections import namedtuple
 
 import testflows.settings as settings
 import testflows._core.tracing as tracing
+import testflows._core.integrity as integrity
 import testflows._core.contrib.yaml as yaml
 import testflows._core.contrib.schema as schema
 
@@ -47,9 +48,10 @@ from .objects import ExamplesTable, Specification
 from .objects import NamedValue, OnlyTags, SkipTags
 from .objects import RSASecret, Secrets
 from .constants import name_sep, id_sep
-from .io import TestIO
+from .io import TestIO, LogWriter
+from .shards import shards
 from .name import join, depth, match, absname, isabs
-from .funcs import exception, pause, result, value, input
+from .funcs import exception, pause, result, value, metric, input
 from .init import init
 from .cli.arg.parser import ArgumentParser as ArgumentParserClass
 from .cli.arg.common import epilog as common_epilog
@@ -57,7 +59,8 @@ from .cli.arg.exit import ExitWithError, ExitException
 from .cli.arg.type import key_value as key_value_type, repeat as repeat_type
 from .cli.arg.type import tags_filter as tags_filter_type, retry as retry_type
 from .cli.arg.type import logfile as logfile_type, rsa_private_key_pem_file as rsa_private_key_pem_file_type
-from .cli.arg.type import file as file_type
+from .cli.arg.type import file as file_type, compression as compression_type, water_marks as water_marks_type
+from .cli.arg.type import seconds as seconds_type
 from .cli.arg.type import onoff as onoff_type, NoneValue, count as count_type, trace_level as trace_level_type
 from .cli.text import danger, warning
 from .exceptions import exception as get_exception
@@ -81,6 +84,10 @@ except:
 output_formats = ["new-fails", "fails", "classic", "slick", "nice",
     "brisk", "quiet", "short", "manual", "dots", "progress", "pnice", "raw"]
 
+log_formats = ["json", "binary"]
+
+log_integrity_modes = list(integrity.hash_funcs)
+
 rerun_results = ["fails", "passes", "xouts", "ok", "fail", "error", "null",
     "xok", "xfail", "xerror", "xnull", "skip"]
 
@@ -728,6 +735,9 @@ class TestBase(object):
         self._apply_xresult_flags()
         self._apply_xfails()
 
+        if top() is self and LogWriter.instance is not None and LogWriter.instance.high_water_mark_reached:
+            metric("log writer buffer peak", LogWriter.instance.peak_buffered, "bytes", test=self)
+
         self.io.output.result(self.result)
         self.test_time = time.time() - self.start_time
         self.result.test_time = self.test_time
@@ -940,6 +950,34 @@ def cli_argparser(kwargs, argparser=None):
     parser.add_argument("-l", "--log", dest="_log", metavar="file", type=str,
                         help=("path to the log file where test output will be stored, "
                               "default: uses temporary log file"))
+    parser.add_argument("--log-format", dest="_log_format", metavar="format", type=str,
+                        choices=log_formats,
+                        help=(f"log file message format, choices are: {log_formats}, "
+                              "default: 'json'"))
+    parser.add_argument("--log-compression", dest="_log_compression", metavar="method[:level]", type=compression_type,
+                        help=("log file compression, method is either 'none', 'zlib' or 'lzma' "
+                              "with optional compression level 0-9; 'zlib' uses less CPU "
+                              "but produces a larger gzip compressed log, default: 'lzma'"))
+    parser.add_argument("--log-flush-latency", dest="_log_flush_latency", metavar="seconds", type=seconds_type,
+                        help=("log writer flush latency target; messages are written to the log "
+                              "at most this many seconds after they are emitted, "
+                              "default: 0.15"))
+    parser.add_argument("--log-buffer", dest="_log_buffer", metavar="high[,low]", type=water_marks_type,
+                        help=("log writer buffer high and low water marks in bytes with optional K, M or G suffix; "
+                              "writers block when buffered messages exceed the high water mark "
+                              "until they are flushed below the low water mark, "
+                              "default: '64M,16M'"))
+    parser.add_argument("--log-shards", dest="_log_shards", action="store_true",
+                        help=("write messages of each worker process into its own log shard "
+                              "named '<log>.<pid>.shard'; use 'tfs transform merge' "
+                              "to merge the log and its shards into a single log"), default=None)
+    parser.add_argument("--log-integrity", dest="_log_integrity", metavar="mode", type=str,
+                        choices=log_integrity_modes,
+                        help=("log message hash chaining mode used for integrity verification, "
+                              f"choices are: {log_integrity_modes}, default: '{integrity.default}'"))
+    parser.add_argument("--specification-cache", dest="_specification_cache", metavar="directory", type=str,
+                        help=("directory used to cache requirement names parsed from specifications "
+                              "when calculating requirements coverage, default: not used"))
     parser.add_argument("--show-skipped", dest="_show_skipped", action="store_true",
                         help="show skipped tests, default: False", default=None)
     parser.add_argument("--trim-results", dest="_trim_results",
@@ -1012,6 +1050,9 @@ def cli_argparser(kwargs, argparser=None):
 
     if database_module:
         database_module.argparser(parser)
+    else:
+        parser.add_argument("--database", dest="_database", metavar="sqlite=path", nargs="+",
+                            help="store test results in the local SQLite database", type=key_value_type, required=False)
 
     return main_parser, test_args_schema
 
@@ -1055,6 +1096,13 @@ def parse_cli_args(kwargs, parser_schema):
         schema.Optional("id"): str,
         schema.Optional("output"): schema.Or(*output_formats, error="key 'output' value is not a valid format"),
         schema.Optional("log"): str,
+        schema.Optional("log-format"): schema.Or(*log_formats, error="key 'log-format' value is not a valid format"),
+        schema.Optional("log-compression"): schema.Use(compression_type),
+        schema.Optional("log-flush-latency"): schema.Use(seconds_type),
+        schema.Optional("log-buffer"): schema.Use(water_marks_type),
+        schema.Optional("log-shards"): bool,
+        schema.Optional("log-integrity"): schema.Or(*log_integrity_modes, error="key 'log-integrity' value is not a valid mode"),
+        schema.Optional("specification-cache"): str,
         schema.Optional("show-skipped"): bool,
         schema.Optional("show-retries"): bool,
         schema.Optional("repeat"): [schema.Use(repeat_type)],
@@ -1143,10 +1191,25 @@ def parse_cli_args(kwargs, parser_schema):
             settings.write_logfile = templog_filename()
 
         settings.read_logfile = settings.write_logfile
+        if args.pop("_log_shards", None):
+            settings.log_shards = settings.write_logfile
         if os.path.exists(settings.write_logfile):
             os.remove(settings.write_logfile)
+        for shard in shards(settings.write_logfile):
+            os.remove(shard)
 
         settings.output_format = args.pop("_output", None) or "nice"
+        settings.log_format = args.pop("_log_format", None) or get(settings.log_format, "json")
+        settings.log_compression = args.pop("_log_compression", None) or get(settings.log_compression, "lzma")
+        if args.get("_log_flush_latency"):
+            settings.log_flush_latency = args.pop("_log_flush_latency")
+        if args.get("_log_buffer"):
+            settings.log_buffer_high_water_mark, settings.log_buffer_low_water_mark = args.pop("_log_buffer")
+        if args.get("_log_integrity"):
+            settings.log_integrity = args.pop("_log_integrity")
+            settings.hash_func = integrity.hash_func(settings.log_integrity)
+        if args.get("_specification_cache"):
+            settings.specification_cache = os.path.abspath(os.path.expanduser(args.pop("_specification_cache")))
 
         if args.get("_database"):
             settings.database = args.pop("_database")
@@ -0,0 +1,252 @@
+# Copyright 2023 Katteli Inc.
+# TestFlows.com Open-Source Software Testing Framework (http://testflows.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import time
+
+from testflows._core.message import Message, loads, loadb, lazy_loads, binary_marker, binary_record_size
+
+#: default batch size hint in bytes
+batch_size = 1048576
+
+def read(file, tail=False, stop=None, size=batch_size):
+    """Read batches of lines from a file-like object.
+
+    JSON messages are returned as strings and binary
+    message records are returned as bytes. In tail mode
+    each batch contains one line so that output is not delayed.
+
+    Stop message is always returned in its own batch
+    and the stop event is set right before it is returned
+    so that per-item steps see the stop event
+    the same way as in per-item pipelines.
+
+    :param file: open file handle
+    :param tail: tail mode, default: False
+    :param stop: stop event
+    :param size: batch size hint in bytes, default: 1MB
+    """
+    yield None
+    line = b""
+    stop_keyword = ('{"message_keyword":"%s"' % str(Message.STOP)).encode("utf-8")
+    stop_code = int(Message.STOP)
+    # binary records can only be read from the underlying byte stream
+    file = getattr(file, "buffer", file)
+    wait = getattr(file, "wait", None) or (lambda: time.sleep(0.15))
+
+    while True:
+        if tail:
+            data = file.readline()
+            chunks = [data] if data else []
+        else:
+            chunks = file.readlines(size)
+
+        if not chunks:
+            if not tail:
+                break
+            wait()
+            continue
+
+        batch = []
+        for data in chunks:
+            if type(data) is str:
+                data = data.encode("utf-8")
+
+            line += data
+
+            if not line.endswith(b"\n"):
+                continue
+
+            if line[:1] == binary_marker:
+                # binary record can contain new lines
+                # so keep reading until it is complete
+                if not len(line) >= binary_record_size(line) > 0:
+                    continue
+                is_stop = stop and line[5] == stop_code
+                item = line
+            else:
+                is_stop = stop and line.startswith(stop_keyword)
+                item = line.decode("utf-8")
+
+            line = b""
+
+            if is_stop:
+                if batch:
+                    yield batch
+                    batch = []
+                stop.set()
+                yield [item]
+                continue
+
+            batch.append(item)
+
+        if batch:
+            yield batch
+
+def read_and_filter(file, filter, limit=None, tail=False, stop=None, size=batch_size):
+    """Read batches of lines from a file-like object and
+    filter them using message filter.
+
+    :param file: open file handle
+    :param filter: message filter
+    :param limit: maximum number of lines, default: None (no limit)
+    :param tail: tail mode, default: False
+    :param stop: stop event
+    :param size: batch size hint in bytes, default: 1MB
+    """
+    yield None
+
+    stop_keyword = '{"message_keyword":"%s"' % str(Message.STOP)
+    count = 0
+
+    for lines in filter.read(file, tail=tail, size=size):
+        if limit is not None:
+            lines = lines[:limit - count]
+            count += len(lines)
+
+        batch = []
+        for line in lines:
+            if stop and line.startswith(stop_keyword):
+                if batch:
+                    yield batch
+                    batch = []
+                stop.set()
+                yield [line]
+                break
+            batch.append(line)
+
+        if batch:
+            yield batch
+
+        if stop and stop.is_set() or count == limit:
+            break
+
+    if stop:
+        stop.set()
+
+    yield None
+
+def parse(lazy=False):
+    """Parse batch of log lines.
+
+    Lines can be either JSON messages or
+    binary message records. Lines that
+    can't be parsed are dropped.
+
+    :param lazy: decode only message header and the rest
+        of the message on demand, default: False
+    """
+    batch = None
+
+    def parse_line(line):
+        try:
+            if lazy:
+                return lazy_loads(line)
+            return loadb(line) if type(line) is bytes else loads(line)
+        except (IndexError, Exception):
+            return None
+
+    while True:
+        if batch:
+            try:
+                if lazy:
+                    batch = [lazy_loads(line) for line in batch]
+                else:
+                    batch = [loadb(line) if type(line) is bytes else loads(line) for line in batch]
+            except (IndexError, Exception):
+                batch = [msg for msg in map(parse_line, batch) if msg is not None]
+
+        batch = yield batch or None
+
+def fanout(*steps, stop=None):
+    """Feed each item in the batch to multiple
+    per-item steps and produce a batch that contains
+    a list of outputs from each step for each item.
+
+    Once the stop event is set, an empty batch
+    is fed to the steps as None so that they can produce
+    their final output even if the log has no stop message.
+
+    :param *steps: fan out steps
+    :param stop: stop event
+    """
+    for step in steps:
+        next(step)
+
+    batch = None
+    while True:
+        outputs = []
+        if batch:
+            for item in batch:
+                output = [o for o in [step.send(item) for step in steps] if o is not None]
+                if output:
+                    outputs.append(output)
+        elif stop is not None and stop.is_set():
+            output = [o for o in [step.send(None) for step in steps] if o is not None]
+            if output:
+                outputs.append(output)
+
+        batch = yield outputs or None
+
+def fanin(combinator):
+    """Combine outputs of each item in the batch into one
+    using the combinator.
+
+    :param combinator: combinator
+    """
+    batch = None
+    while True:
+        if batch:
+            batch = [combinator(item) for item in batch]
+        batch = yield batch
+
+def write(file):
+    """Write batch of lines to a file-like object.
+
+    :param file: file-like object
+    """
+    batch = None
+    while True:
+        if batch:
+            try:
+                # join either strings or bytes
+                file.write(batch[0][:0].join(batch))
+                file.flush()
+            except BrokenPipeError:
+                return
+        batch = yield batch
+
+def adapter(step):
+    """Adapt per-item transform step so that it can
+    be used in a batch pipeline. Outputs that are None
+    are dropped from the output batch.
+
+    :param step: per-item transform step
+    """
+    next(step)
+
+    batch = None
+    while True:
+        outputs = []
+        if batch:
+            try:
+                send = step.send
+                for item in batch:
+                    output = send(item)
+                    if output is not None:
+                        outputs.append(output)
+            except StopIteration:
+                yield outputs or None
+                return
+
+        batch = yield outputs or None
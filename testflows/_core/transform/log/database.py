@@ -0,0 +1,101 @@
+# Copyright 2023 Katteli Inc.
+# TestFlows.com Open-Source Software Testing Framework (http://testflows.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from testflows._core.message import Message
+from testflows._core.database import column
+
+def insert_run(connection, msg, version):
+    """Insert run or replace all the data of the run
+    if it is already in the database and return run id.
+
+    :param connection: database connection
+    :param msg: top level test message
+    :param version: framework version
+    """
+    row = connection.execute("SELECT id FROM runs WHERE uid = ?", (msg["test_id"],)).fetchone()
+    if row is None:
+        return connection.execute("INSERT INTO runs (uid, name, version, started) VALUES (?, ?, ?, ?)",
+            (msg["test_id"], msg["test_name"], version, msg["message_time"])).lastrowid
+
+    run = row[0]
+    for table in ("tests", "metrics", "test_values"):
+        connection.execute(f"DELETE FROM {table} WHERE run = ?", (run,))
+    connection.execute("UPDATE runs SET name = ?, version = ?, started = ?, result_type = NULL, duration = NULL WHERE id = ?",
+        (msg["test_name"], version, msg["message_time"], run))
+    return run
+
+def transform(connection):
+    """Store tests, results, metrics and values
+    in the database. Each batch of messages is
+    inserted in one transaction.
+
+    :param connection: database connection
+    """
+    run = None
+    uid = None
+    version = None
+    batch = None
+
+    while True:
+        if batch:
+            tests, results, metrics, values = [], [], [], []
+
+            with connection:
+                for msg in batch:
+                    keyword = msg["message_keyword"]
+
+                    if keyword == Message.VERSION.name:
+                        version = msg["framework_version"]
+                        continue
+
+                    if keyword == Message.TEST.name:
+                        if run is None:
+                            run, uid = insert_run(connection, msg, version), msg["test_id"]
+                        tests.append((run, msg["test_id"], msg["test_name"], msg["test_type"], msg["test_subtype"],
+                            msg["test_parent_type"], msg["test_flags"], msg["test_cflags"], msg["test_level"],
+                            msg["message_time"]))
+
+                    elif run is None:
+                        continue
+
+                    elif keyword == Message.RESULT.name:
+                        results.append((msg["result_type"], column(msg["result_message"]), column(msg["result_reason"]),
+                            msg["message_rtime"], run, msg["test_id"]))
+                        if msg["test_id"] == uid:
+                            connection.execute("UPDATE runs SET result_type = ?, duration = ? WHERE id = ?",
+                                (msg["result_type"], msg["message_rtime"], run))
+
+                    elif keyword == Message.METRIC.name:
+                        metrics.append((run, msg["test_id"], msg["metric_name"], column(msg["metric_value"]),
+                            msg["metric_units"], msg["message_time"]))
+
+                    elif keyword == Message.VALUE.name:
+                        values.append((run, msg["test_id"], msg["value_name"], column(msg["value_value"]),
+                            msg["message_time"]))
+
+                if tests:
+                    connection.executemany("INSERT OR REPLACE INTO tests (run, test_id, test_name, test_type, test_subtype,"
+                        " test_parent_type, test_flags, test_cflags, test_level, started) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        tests)
+                if results:
+                    connection.executemany("UPDATE tests SET result_type = ?, result_message = ?, result_reason = ?,"
+                        " duration = ? WHERE run = ? AND test_id = ?", results)
+                if metrics:
+                    connection.executemany("INSERT INTO metrics (run, test_id, name, value, units, time)"
+                        " VALUES (?, ?, ?, ?, ?, ?)", metrics)
+                if values:
+                    connection.executemany("INSERT INTO test_values (run, test_id, name, value, time)"
+                        " VALUES (?, ?, ?, ?, ?)", values)
+
+        batch = yield batch
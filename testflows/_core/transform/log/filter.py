@@ -0,0 +1,88 @@
+# Copyright 2023 Katteli Inc.
+# TestFlows.com Open-Source Software Testing Framework (http://testflows.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import re
+
+from testflows._core.message import Message, dumps, loadb, binary_marker, binary_record_size
+from testflows._core.transform.log.read_parallel import chunks, chunk_size
+
+class Filter(object):
+    """Message filter that matches raw messages directly
+    in the decompressed log data before messages are parsed.
+
+    JSON messages are matched in place using one regular expression
+    for the whole data. Binary message records are transcoded into JSON
+    before being matched unless their message keyword is not one of the
+    message types.
+
+    :param message_types: message types, default: None (all)
+    :param pattern: regular expression that must be found
+        in the raw JSON message, default: None
+    """
+    def __init__(self, message_types=None, pattern=None):
+        regex = "^"
+        if message_types is not None:
+            regex += "\\{\"message_keyword\":\"(?:%s)\"" % "|".join(message_types)
+        if pattern is not None:
+            regex += "[^\\n]*?(?:%s)" % pattern
+        regex += "[^\\n]*\\n"
+        self.regex = re.compile(regex, re.MULTILINE)
+        self.message_types = message_types
+        self.keywords = None
+        if message_types is not None:
+            self.keywords = frozenset(int(Message[name]) for name in message_types)
+
+    def match(self, data):
+        """Return matching messages in the data
+        as JSON strings.
+
+        :param data: decompressed log data that contains only complete messages
+        """
+        messages = []
+        pos = 0
+        end = len(data)
+
+        while pos < end:
+            marker = data.find(binary_marker, pos)
+            stop = end if marker < 0 else marker
+            if stop > pos:
+                messages += [match.group(0) for match in self.regex.finditer(data[pos:stop].decode("utf-8"))]
+            if marker < 0:
+                break
+            pos = marker + (binary_record_size(data[marker:marker + 5]) or end)
+            record = data[marker:pos]
+            if self.keywords is not None and record[5] not in self.keywords:
+                continue
+            try:
+                line = dumps(loadb(record)) + "\n"
+            except (IndexError, ValueError, KeyError):
+                continue
+            if self.regex.match(line):
+                messages.append(line)
+
+        return messages
+
+    def read(self, file, tail=False, size=chunk_size):
+        """Read file-like object and return
+        batches of matching messages as JSON strings.
+
+        :param file: open file handle
+        :param tail: return matching messages as soon as data
+            is available instead of waiting for the full chunk, default: False
+        :param size: chunk size, default: 4MB
+        """
+        for chunk in chunks(file, size=size, tail=tail):
+            messages = self.match(chunk)
+            if messages:
+                yield messages
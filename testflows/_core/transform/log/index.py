@@ -0,0 +1,216 @@
+# Copyright 2023 Katteli Inc.
+# TestFlows.com Open-Source Software Testing Framework (http://testflows.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import re
+
+import testflows._core.sidecar as sidecar
+
+from testflows._core.message import Message, dumps, loadb, lazy_loads
+from testflows._core.transform.log.read import transform as read_transform
+from testflows._core.transform.log.read_and_filter import transform as read_and_filter_transform
+
+#: log sidecar file entry name
+entry = "index"
+
+def build(file):
+    """Build test-to-offset index of the log.
+
+    Index maps test id to a list of test name,
+    offset of the test's TEST message, offset of its RESULT message
+    and offsets of the first and the last messages of the test.
+    Offsets are in the uncompressed log.
+
+    Returns the index and the offset at which the indexed
+    part of the log ends or None if the log is complete.
+
+    :param file: open file handle
+    """
+    tests = {}
+    stop = str(Message.STOP)
+    item = None
+
+    for item in read_transform(file, offset=True):
+        if item is None:
+            continue
+        line, offset = item
+        msg = lazy_loads(line)
+        keyword = msg["message_keyword"]
+        if keyword == stop:
+            return tests, None
+        test_id = msg["test_id"]
+        test = tests.get(test_id)
+        if test is None:
+            test = tests[test_id] = [msg["test_name"], None, None, offset, offset]
+        test[4] = offset
+        if keyword == "TEST":
+            test[1] = offset
+        elif keyword == "RESULT":
+            test[2] = offset
+
+    if item is None:
+        return tests, 0
+    line, offset = item
+    return tests, offset + len(line if type(line) is bytes else line.encode("utf-8"))
+
+def load(file):
+    """Return test-to-offset index of the log and the offset
+    at which the indexed part of the log ends stored
+    in the log sidecar file building and storing it if needed.
+
+    Index of the log that is not complete is stored as well
+    so that it is not built again for the same log contents.
+
+    Returns None, None if the log is not a regular file.
+
+    :param file: open file handle
+    """
+    logfile = sidecar.logfile(file)
+    if logfile is None:
+        return None, None
+
+    key = sidecar.key(logfile)
+    value = sidecar.load(logfile, entry, key)
+
+    if type(value) is not list or len(value) != 2:
+        file = getattr(file, "buffer", file)
+        value = build(file)
+        file.seek(0)
+        # log could have changed while it was being read
+        if os.path.getsize(logfile) == key[0]:
+            sidecar.save(logfile, entry, value, key)
+
+    return value
+
+def match(index, pattern, exact=False):
+    """Return ids of the tests which names match the pattern.
+
+    Pattern is matched against JSON encoded test name
+    just like it is matched against raw message.
+
+    :param index: test-to-offset index
+    :param pattern: compiled test name pattern
+    :param exact: match the whole name, default: False (match name prefix)
+    """
+    match = pattern.fullmatch if exact else pattern.match
+    return {test_id for test_id, test in index.items() if match(dumps(test[0])[1:-1])}
+
+def ranges(index, tests):
+    """Return sorted non-overlapping ranges of offsets
+    that cover the first and the last messages of the tests.
+
+    :param index: test-to-offset index
+    :param tests: test ids
+    """
+    ranges = []
+    for start, end in sorted((index[test_id][3], index[test_id][4]) for test_id in tests):
+        if ranges and start <= ranges[-1][1]:
+            ranges[-1][1] = max(ranges[-1][1], end)
+        else:
+            ranges.append([start, end])
+    return ranges
+
+def transform(file, index, tests, message_types=None, message_object=None, stop=None):
+    """Read raw messages of the tests by seeking into the
+    log using test-to-offset index.
+
+    Binary message records are transcoded into JSON.
+
+    :param file: open file handle
+    :param index: test-to-offset index
+    :param tests: test ids
+    :param message_types: message types, default: None (all)
+    :param message_object: message object, default: None (all)
+    :param stop: stop event
+    """
+    yield None
+
+    file = getattr(file, "buffer", file)
+
+    for start, end in ranges(index, tests):
+        file.seek(start)
+        for item in read_transform(file, offset=True):
+            if item is None:
+                continue
+            line, offset = item
+            if start + offset > end:
+                break
+            msg = lazy_loads(line)
+            if msg["test_id"] not in tests:
+                continue
+            if message_types is not None and msg["message_keyword"] not in message_types:
+                continue
+            if message_object is not None and msg["message_object"] != message_object:
+                continue
+            if type(line) is bytes:
+                line = dumps(loadb(line)) + "\n"
+            yield line
+
+    if stop:
+        stop.set()
+
+    yield None
+
+def read_and_filter_rest(steps, file, offset, filter, tail=False, stop=None):
+    """Read messages of the indexed part of the log
+    and then read and filter the rest of the log
+    starting at the offset.
+
+    :param steps: transform that reads the indexed part of the log
+    :param file: open file handle
+    :param offset: offset in the uncompressed log
+    :param filter: message filter
+    :param tail: tail mode, default: False
+    :param stop: stop event
+    """
+    yield from steps
+
+    getattr(file, "buffer", file).seek(offset)
+
+    yield from read_and_filter_transform(file, filter, tail=tail, stop=stop)
+
+def read_and_filter(file, filter, name, exact=False, message_object=None, tail=False, stop=None):
+    """Read raw messages of the tests which names match
+    the name pattern using test-to-offset index of the log
+    and fall back to reading and filtering the log
+    using the message filter if index is not available.
+
+    If the log is not complete then only the part of the log
+    after the indexed part is read and filtered.
+
+    :param file: open file handle
+    :param filter: message filter
+    :param name: test name pattern
+    :param exact: match the whole name, default: False (match name prefix)
+    :param message_object: message object, default: None (all)
+    :param tail: tail mode, default: False
+    :param stop: stop event
+    """
+    try:
+        pattern = re.compile(name)
+    except re.error:
+        pattern = None
+
+    index, end = load(file) if pattern is not None else (None, None)
+
+    if index is None:
+        return read_and_filter_transform(file, filter, tail=tail, stop=stop)
+
+    steps = transform(file, index, match(index, pattern, exact=exact),
+        message_types=filter.message_types, message_object=message_object, stop=stop if end is None else None)
+
+    if end is None:
+        return steps
+
+    return read_and_filter_rest(steps, file, end, filter, tail=tail, stop=stop)
@@ -0,0 +1,71 @@
+# Copyright 2023 Katteli Inc.
+# TestFlows.com Open-Source Software Testing Framework (http://testflows.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import heapq
+
+from testflows._core.message import Message, binary_marker, binary_time
+from testflows._core.shards import end_marker
+from .read import transform as read_transform
+
+message_time_key = b'"message_time":'
+stop_keyword = ('{"message_keyword":"%s"' % str(Message.STOP)).encode("utf-8")
+
+def is_stop(line):
+    """Return True if the log line is the stop message.
+
+    :param line: JSON message line or binary record
+    """
+    if line[:1] == binary_marker:
+        return line[5] == int(Message.STOP)
+    return line.startswith(stop_keyword)
+
+def message_time(line):
+    """Return message time of the log line.
+
+    :param line: JSON message line or binary record
+    """
+    if line[:1] == binary_marker:
+        return binary_time(line)
+    start = line.index(message_time_key) + len(message_time_key)
+    return float(line[start:line.index(b",", start)])
+
+def lines(file):
+    """Read lines from the log file as bytes
+    skipping the end marker of the log shard.
+
+    :param file: log file
+    """
+    for line in read_transform(file):
+        if line is not None:
+            line = line.encode("utf-8") if type(line) is str else line
+            if line != end_marker:
+                yield line
+
+def transform(files):
+    """Merge lines from multiple log files in message time order.
+    Lines of each file are expected to be in message time order
+    and the lines with the same message time are taken from the files
+    in the order the files are specified. Stop message is
+    always the last so that no message is placed after it.
+
+    :param files: log files
+    """
+    yield None
+    stop = []
+    for line in heapq.merge(*[lines(file) for file in files], key=message_time):
+        if is_stop(line):
+            stop.append(line)
+            continue
+        yield line
+    yield from stop
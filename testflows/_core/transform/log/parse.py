@@ -15,10 +15,16 @@
 import testflows.settings as settings
 
 from testflows._core.constants import id_sep
-from testflows._core.message import Message, loads
+from testflows._core.message import Message, loads, loadb, lazy_loads
 
-def transform():
+def transform(lazy=False):
     """Transform log line by parsing it.
+
+    Lines can be either JSON messages or
+    binary message records.
+
+    :param lazy: decode only message header and the rest
+        of the message on demand, default: False
     """
     msg = None
     parsed_msg = None
@@ -26,7 +32,12 @@ def transform():
     while True:
         if msg is not None:
             try:
-                parsed_msg = loads(msg)
+                if lazy:
+                    parsed_msg = lazy_loads(msg)
+                elif type(msg) is bytes:
+                    parsed_msg = loadb(msg)
+                else:
+                    parsed_msg = loads(msg)
             except (IndexError, Exception):
                 yield None
                 continue
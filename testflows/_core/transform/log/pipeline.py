@@ -12,10 +12,14 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import os
 import threading
 
+import testflows._core.sidecar as sidecar
+
 from testflows._core.message import Message
 from testflows._core.testtype import TestType
+from . import batch
 from .read import transform as read_transform
 from .read_raw import transform as read_raw_transform
 from .parse import transform as parse_transform
@@ -26,13 +30,16 @@ from .progress import transform as progress_transform
 from .write import transform as write_transform
 from .stop import transform as stop_transform
 from .raw import transform as raw_transform
+from .verify import transform as verify_transform
+from .merge import transform as merge_transform
 from .short import transform as short_transform
 from .slick import transform as slick_transform
 from .classic import transform as classic_transform
 from .fails import transform as fails_transform
 from .manual import transform as manual_transform
 from .quiet import transform as quiet_transform
-from .read_and_filter import transform as read_and_filter_transform
+from .filter import Filter
+from .read_parallel import transform as read_parallel_transform
 from .report.passing import transform as passing_report_transform
 from .report.fails import transform as fails_report_transform
 from .report.unstable import transform as unstable_report_transform
@@ -41,10 +48,15 @@ from .report.version import transform as version_report_transform
 from .report.coverage import transform as coverage_report_transform
 from .report.metrics import transform as metrics_transform
 from .report.results import transform as results_transform
+from .report.results import dump as dump_results, load as load_results
+from .database import transform as database_transform
 
 class Pipeline(object):
     """Combines multiple steps into a pipeline
     that can be executed.
+
+    Steps can either process one item at a time
+    or batches of items (see batch module).
     """
     def __init__(self, steps, stop=None):
         self.steps = steps
@@ -68,46 +80,38 @@ class Pipeline(object):
             except StopIteration:
                 break
 
-def fanout(*steps):
-    """Single step of pipeline
-    that feeds the same input to
-    multiple steps and produces
-    a list of outputs from each step.
-
-    :param *steps: fan out steps
-    """
-    item = None
-    outputs = []
-    while True:
-        for step in steps:
-            output = step.send(item)
-            if output is not None:
-                outputs.append(output)
-        item = yield outputs or None
-        outputs = []
-
-def fanin(combinator):
-    """Combine multiple outputs into one.
-    using the combinator
-    """
-    item = None
-    while True:
-        if item is not None:
-            item = combinator(item)
-        item = yield item
-
 class RawLogPipeline(Pipeline):
     def __init__(self, input, output, tail=False):
         stop_event = threading.Event()
 
         steps = [
-            read_transform(input, tail=tail, stop=stop_event),
-            raw_transform(),
-            write_transform(output),
+            batch.read(input, tail=tail, stop=stop_event),
+            batch.adapter(raw_transform()),
+            batch.write(output),
             stop_transform(stop_event)
         ]
         super(RawLogPipeline, self).__init__(steps, stop=stop_event)
 
+class VerifyLogPipeline(Pipeline):
+    def __init__(self, input, output, stats):
+        stop_event = threading.Event()
+
+        steps = [
+            batch.read(input, stop=stop_event),
+            batch.adapter(verify_transform(stats)),
+            batch.write(output),
+            stop_transform(stop_event)
+        ]
+        super(VerifyLogPipeline, self).__init__(steps, stop=stop_event)
+
+class MergeLogPipeline(Pipeline):
+    def __init__(self, inputs, output):
+        steps = [
+            merge_transform(inputs),
+            write_transform(output)
+        ]
+        super(MergeLogPipeline, self).__init__(steps)
+
 class ReadRawLogPipeline(Pipeline):
     def __init__(self, input, output, encoding=None):
         stop_event = threading.Event()
@@ -124,10 +128,10 @@ class QuietLogPipeline(Pipeline):
         stop_event = threading.Event()
 
         steps = [
-            read_transform(input, tail=tail, stop=stop_event),
-            parse_transform(),
-            quiet_transform(show_input=show_input),
-            write_transform(output),
+            batch.read(input, tail=tail, stop=stop_event),
+            batch.parse(lazy=True),
+            batch.adapter(quiet_transform(show_input=show_input)),
+            batch.write(output),
             stop_transform(stop_event)
         ]
         super(QuietLogPipeline, self).__init__(steps, stop=stop_event)
@@ -137,9 +141,9 @@ class ShortLogPipeline(Pipeline):
         stop_event = threading.Event()
 
         steps = [
-            read_transform(input, tail=tail, stop=stop_event),
-            parse_transform(),
-            fanout(
+            batch.read(input, tail=tail, stop=stop_event),
+            batch.parse(),
+            batch.fanout(
                 short_transform(show_input=show_input),
                 passing_report_transform(stop_event),
                 fails_report_transform(stop_event),
@@ -147,11 +151,12 @@ class ShortLogPipeline(Pipeline):
                 coverage_report_transform(stop_event),
                 totals_report_transform(stop_event),
                 version_report_transform(stop_event),
+                stop=stop_event
             ),
-            fanin(
+            batch.fanin(
                 "".join
             ),
-            write_transform(output),
+            batch.write(output),
             stop_transform(stop_event)
         ]
         super(ShortLogPipeline, self).__init__(steps, stop=stop_event)
@@ -161,9 +166,9 @@ class NiceLogPipeline(Pipeline):
         stop_event = threading.Event()
 
         steps = [
-            read_transform(input, tail=tail, stop=stop_event),
-            parse_transform(),
-            fanout(
+            batch.read(input, tail=tail, stop=stop_event),
+            batch.parse(),
+            batch.fanout(
                 nice_transform(show_input=show_input),
                 passing_report_transform(stop_event),
                 fails_report_transform(stop_event),
@@ -171,11 +176,12 @@ class NiceLogPipeline(Pipeline):
                 coverage_report_transform(stop_event),
                 totals_report_transform(stop_event),
                 version_report_transform(stop_event),
+                stop=stop_event
             ),
-            fanin(
+            batch.fanin(
                 "".join
             ),
-            write_transform(output),
+            batch.write(output),
             stop_transform(stop_event)
         ]
         super(NiceLogPipeline, self).__init__(steps, stop=stop_event)
@@ -185,9 +191,9 @@ class ParallelNiceLogPipeline(Pipeline):
         stop_event = threading.Event()
 
         steps = [
-            read_transform(input, tail=tail, stop=stop_event),
-            parse_transform(),
-            fanout(
+            batch.read(input, tail=tail, stop=stop_event),
+            batch.parse(),
+            batch.fanout(
                 nice_transform(show_input=show_input, add_test_name_prefix=True),
                 passing_report_transform(stop_event),
                 fails_report_transform(stop_event),
@@ -195,11 +201,12 @@ class ParallelNiceLogPipeline(Pipeline):
                 coverage_report_transform(stop_event),
                 totals_report_transform(stop_event),
                 version_report_transform(stop_event),
+                stop=stop_event
             ),
-            fanin(
+            batch.fanin(
                 "".join
             ),
-            write_transform(output),
+            batch.write(output),
             stop_transform(stop_event)
         ]
         super(ParallelNiceLogPipeline, self).__init__(steps, stop=stop_event)
@@ -209,9 +216,9 @@ class BriskLogPipeline(Pipeline):
         stop_event = threading.Event()
 
         steps = [
-            read_transform(input, tail=tail, stop=stop_event),
-            parse_transform(),
-            fanout(
+            batch.read(input, tail=tail, stop=stop_event),
+            batch.parse(),
+            batch.fanout(
                 brisk_transform(show_input=show_input),
                 passing_report_transform(stop_event),
                 fails_report_transform(stop_event),
@@ -219,11 +226,12 @@ class BriskLogPipeline(Pipeline):
                 coverage_report_transform(stop_event),
                 totals_report_transform(stop_event),
                 version_report_transform(stop_event),
+                stop=stop_event
             ),
-            fanin(
+            batch.fanin(
                 "".join
             ),
-            write_transform(output),
+            batch.write(output),
             stop_transform(stop_event)
         ]
         super(BriskLogPipeline, self).__init__(steps, stop=stop_event)
@@ -233,9 +241,9 @@ class SlickLogPipeline(Pipeline):
         stop_event = threading.Event()
 
         steps = [
-            read_transform(input, tail=tail, stop=stop_event),
-            parse_transform(),
-            fanout(
+            batch.read(input, tail=tail, stop=stop_event),
+            batch.parse(),
+            batch.fanout(
                 slick_transform(show_input=show_input),
                 passing_report_transform(stop_event),
                 fails_report_transform(stop_event),
@@ -243,11 +251,12 @@ class SlickLogPipeline(Pipeline):
                 coverage_report_transform(stop_event),
                 totals_report_transform(stop_event),
                 version_report_transform(stop_event),
+                stop=stop_event
             ),
-            fanin(
+            batch.fanin(
                 "".join
             ),
-            write_transform(output),
+            batch.write(output),
             stop_transform(stop_event)
         ]
         super(SlickLogPipeline, self).__init__(steps, stop=stop_event)
@@ -257,9 +266,9 @@ class ManualLogPipeline(Pipeline):
         stop_event = threading.Event()
 
         steps = [
-            read_transform(input, tail=tail, stop=stop_event),
-            parse_transform(),
-            fanout(
+            batch.read(input, tail=tail, stop=stop_event),
+            batch.parse(),
+            batch.fanout(
                 manual_transform(show_input=show_input),
                 passing_report_transform(stop_event),
                 fails_report_transform(stop_event),
@@ -267,11 +276,12 @@ class ManualLogPipeline(Pipeline):
                 coverage_report_transform(stop_event),
                 totals_report_transform(stop_event),
                 version_report_transform(stop_event),
+                stop=stop_event
             ),
-            fanin(
+            batch.fanin(
                 "".join
             ),
-            write_transform(output),
+            batch.write(output),
             stop_transform(stop_event)
         ]
         super(ManualLogPipeline, self).__init__(steps, stop=stop_event)
@@ -281,9 +291,9 @@ class ClassicLogPipeline(Pipeline):
         stop_event = threading.Event()
 
         steps = [
-            read_transform(input, tail=tail, stop=stop_event),
-            parse_transform(),
-            fanout(
+            batch.read(input, tail=tail, stop=stop_event),
+            batch.parse(),
+            batch.fanout(
                 classic_transform(show_input=show_input),
                 passing_report_transform(stop_event),
                 fails_report_transform(stop_event),
@@ -291,11 +301,12 @@ class ClassicLogPipeline(Pipeline):
                 coverage_report_transform(stop_event),
                 totals_report_transform(stop_event),
                 version_report_transform(stop_event),
+                stop=stop_event
             ),
-            fanin(
+            batch.fanin(
                 "".join
             ),
-            write_transform(output),
+            batch.write(output),
             stop_transform(stop_event)
         ]
         super(ClassicLogPipeline, self).__init__(steps, stop=stop_event)
@@ -305,19 +316,20 @@ class FailsLogPipeline(Pipeline):
         stop_event = threading.Event()
 
         steps = [
-            read_transform(input, tail=tail, stop=stop_event),
-            parse_transform(),
-            fanout(
+            batch.read(input, tail=tail, stop=stop_event),
+            batch.parse(),
+            batch.fanout(
                 fails_transform(only_new=only_new, show_input=show_input),
                 fails_report_transform(stop_event, only_new=only_new),
                 coverage_report_transform(stop_event),
                 totals_report_transform(stop_event),
                 version_report_transform(stop_event),
+                stop=stop_event
             ),
-            fanin(
+            batch.fanin(
                 "".join
             ),
-            write_transform(output),
+            batch.write(output),
             stop_transform(stop_event)
         ]
         super(FailsLogPipeline, self).__init__(steps, stop=stop_event)
@@ -327,9 +339,9 @@ class DotsLogPipeline(Pipeline):
         stop_event = threading.Event()
 
         steps = [
-            read_transform(input, tail=tail, stop=stop_event),
-            parse_transform(),
-            fanout(
+            batch.read(input, tail=tail, stop=stop_event),
+            batch.parse(lazy=True),
+            batch.fanout(
                 dots_transform(stop_event, show_input=show_input),
                 passing_report_transform(stop_event),
                 fails_report_transform(stop_event),
@@ -337,11 +349,12 @@ class DotsLogPipeline(Pipeline):
                 coverage_report_transform(stop_event),
                 totals_report_transform(stop_event),
                 version_report_transform(stop_event),
+                stop=stop_event
             ),
-            fanin(
+            batch.fanin(
                 "".join
             ),
-            write_transform(output),
+            batch.write(output),
             stop_transform(stop_event)
         ]
         super(DotsLogPipeline, self).__init__(steps, stop=stop_event)
@@ -351,9 +364,9 @@ class ProgressLogPipeline(Pipeline):
         stop_event = threading.Event()
 
         steps = [
-            read_transform(input, tail=tail, stop=stop_event),
-            parse_transform(),
-            fanout(
+            batch.read(input, tail=tail, stop=stop_event),
+            batch.parse(lazy=True),
+            batch.fanout(
                 progress_transform(stop_event, show_input=show_input),
                 passing_report_transform(stop_event),
                 fails_report_transform(stop_event),
@@ -361,27 +374,34 @@ class ProgressLogPipeline(Pipeline):
                 coverage_report_transform(stop_event),
                 totals_report_transform(stop_event),
                 version_report_transform(stop_event),
+                stop=stop_event
             ),
-            fanin(
+            batch.fanin(
                 "".join
             ),
-            write_transform(output),
+            batch.write(output),
             stop_transform(stop_event)
         ]
         super(ProgressLogPipeline, self).__init__(steps, stop=stop_event)
 
 class MetricsLogPipeline(Pipeline):
-    def __init__(self, input, metrics):
+    def __init__(self, input, metrics, aggregate=False, jobs=1):
         stop_event = threading.Event()
 
         message_types = [Message.METRIC.name, Message.STOP.name]
-        grep = "grep -E '^\\{\"message_keyword\":\""
-        command = f"{grep}({'|'.join(message_types)})\"'"
 
-        steps = [
-            read_and_filter_transform(input, command=command, stop=stop_event),
-            parse_transform(),
-            metrics_transform(metrics),
+        if jobs > 1:
+            read_steps = [
+                read_parallel_transform(input, jobs, message_types=message_types, stop=stop_event)
+            ]
+        else:
+            read_steps = [
+                batch.read_and_filter(input, Filter(message_types), stop=stop_event),
+                batch.parse()
+            ]
+
+        steps = read_steps + [
+            batch.adapter(metrics_transform(metrics, aggregate=aggregate)),
             stop_transform(stop_event)
         ]
         super(MetricsLogPipeline, self).__init__(steps, stop=stop_event)
@@ -391,24 +411,23 @@ class ResultsReportLogPipeline(Pipeline):
         stop_event = threading.Event()
 
         message_types = [Message.TEST.name, Message.RESULT.name, Message.STOP.name]
-        grep = "grep -E '^\\{\"message_keyword\":\""
-        command = f"{grep}({'|'.join(message_types)})\"'"
 
         steps = [
-            read_and_filter_transform(input, command=command, stop=stop_event),
-            parse_transform(),
-            fanout(
+            batch.read_and_filter(input, Filter(message_types), stop=stop_event),
+            batch.parse(),
+            batch.fanout(
                 passing_report_transform(stop_event),
                 fails_report_transform(stop_event),
                 unstable_report_transform(stop_event),
                 coverage_report_transform(stop_event),
                 totals_report_transform(stop_event),
-                version_report_transform(stop_event)
+                version_report_transform(stop_event),
+                stop=stop_event
             ),
-            fanin(
+            batch.fanin(
                 "".join
             ),
-            write_transform(output),
+            batch.write(output),
             stop_transform(stop_event)
         ]
         super(ResultsReportLogPipeline, self).__init__(steps, stop=stop_event)
@@ -418,19 +437,18 @@ class TotalsReportLogPipeline(Pipeline):
         stop_event = threading.Event()
 
         message_types = [Message.TEST.name, Message.RESULT.name, Message.STOP.name]
-        grep = "grep -E '^\\{\"message_keyword\":\""
-        command = f"{grep}({'|'.join(message_types)})\"'"
 
         steps = [
-            read_and_filter_transform(input, command=command, stop=stop_event),
-            parse_transform(),
-            fanout(
+            batch.read_and_filter(input, Filter(message_types), stop=stop_event),
+            batch.parse(),
+            batch.fanout(
                 totals_report_transform(stop_event, divider=""),
+                stop=stop_event
             ),
-            fanin(
+            batch.fanin(
                 "".join
             ),
-            write_transform(output),
+            batch.write(output),
             stop_transform(stop_event)
         ]
         super(TotalsReportLogPipeline, self).__init__(steps, stop=stop_event)
@@ -440,19 +458,18 @@ class FailsReportLogPipeline(Pipeline):
         stop_event = threading.Event()
 
         message_types = [Message.RESULT.name, Message.STOP.name]
-        grep = "grep -E '^\\{\"message_keyword\":\""
-        command = f"{grep}({'|'.join(message_types)})\"'"
 
         steps = [
-            read_and_filter_transform(input, command=command, stop=stop_event),
-            parse_transform(),
-            fanout(
+            batch.read_and_filter(input, Filter(message_types), stop=stop_event),
+            batch.parse(),
+            batch.fanout(
                 fails_report_transform(stop_event, divider="", only_new=only_new),
+                stop=stop_event
             ),
-            fanin(
+            batch.fanin(
                 "".join
             ),
-            write_transform(output),
+            batch.write(output),
             stop_transform(stop_event)
         ]
         super(FailsReportLogPipeline, self).__init__(steps, stop=stop_event)
@@ -462,18 +479,17 @@ class PassingReportLogPipeline(Pipeline):
         stop_event = threading.Event()
 
         message_types = [Message.RESULT.name, Message.STOP.name]
-        grep = "grep -E '^\\{\"message_keyword\":\""
-        command = f"{grep}({'|'.join(message_types)})\"'"
         steps = [
-            read_and_filter_transform(input, command=command, stop=stop_event),
-            parse_transform(),
-            fanout(
+            batch.read_and_filter(input, Filter(message_types), stop=stop_event),
+            batch.parse(),
+            batch.fanout(
                 passing_report_transform(stop_event, divider=""),
+                stop=stop_event
             ),
-            fanin(
+            batch.fanin(
                 "".join
             ),
-            write_transform(output),
+            batch.write(output),
             stop_transform(stop_event)
         ]
         super(PassingReportLogPipeline, self).__init__(steps, stop=stop_event)
@@ -483,18 +499,17 @@ class UnstableReportLogPipeline(Pipeline):
         stop_event = threading.Event()
 
         message_types = [Message.RESULT.name, Message.STOP.name]
-        grep = "grep -E '^\\{\"message_keyword\":\""
-        command = f"{grep}({'|'.join(message_types)})\"'"
         steps = [
-            read_and_filter_transform(input, command=command, stop=stop_event),
-            parse_transform(),
-            fanout(
+            batch.read_and_filter(input, Filter(message_types), stop=stop_event),
+            batch.parse(),
+            batch.fanout(
                 unstable_report_transform(stop_event, divider=""),
+                stop=stop_event
             ),
-            fanin(
+            batch.fanin(
                 "".join
             ),
-            write_transform(output),
+            batch.write(output),
             stop_transform(stop_event)
         ]
         super(UnstableReportLogPipeline, self).__init__(steps, stop=stop_event)
@@ -504,19 +519,18 @@ class CoverageReportLogPipeline(Pipeline):
         stop_event = threading.Event()
 
         message_types = [Message.TEST.name, Message.RESULT.name, Message.REQUIREMENT.name, Message.SPECIFICATION.name, Message.STOP.name]
-        grep = "grep -E '^\\{\"message_keyword\":\""
-        command = f"{grep}({'|'.join(message_types)})\"'"
 
         steps = [
-            read_and_filter_transform(input, command=command, stop=stop_event),
-            parse_transform(),
-            fanout(
+            batch.read_and_filter(input, Filter(message_types), stop=stop_event),
+            batch.parse(),
+            batch.fanout(
                 coverage_report_transform(stop_event, divider=""),
+                stop=stop_event
             ),
-            fanin(
+            batch.fanin(
                 "".join
             ),
-            write_transform(output),
+            batch.write(output),
             stop_transform(stop_event)
         ]
         super(CoverageReportLogPipeline, self).__init__(steps, stop=stop_event)
@@ -526,25 +540,29 @@ class VersionReportLogPipeline(Pipeline):
         stop_event = threading.Event()
 
         message_types = [Message.VERSION.name, Message.STOP.name]
-        grep = "grep -m2 -E '^{\"message_keyword\":\""
-        command = f"{grep}({'|'.join(message_types)})\"'"
         steps = [
-            read_and_filter_transform(input, command=command, stop=stop_event),
-            parse_transform(),
-            fanout(
+            batch.read_and_filter(input, Filter(message_types), limit=2, stop=stop_event),
+            batch.parse(),
+            batch.fanout(
                 version_report_transform(stop_event, divider=""),
+                stop=stop_event
             ),
-            fanin(
+            batch.fanin(
                 "".join
             ),
-            write_transform(output),
+            batch.write(output),
             stop_transform(stop_event)
         ]
         super(VersionReportLogPipeline, self).__init__(steps, stop=stop_event)
 
 class ResultsLogPipeline(Pipeline):
-    def __init__(self, input, results, steps=True):
+    def __init__(self, input, results, steps=True, details=True, jobs=1):
         stop_event = threading.Event()
+        self.input = input
+        self.results = results
+        self.entry = "results" if steps else "results:nosteps"
+        if not details:
+            self.entry += ":nodetails"
         message_types = [
             Message.PROTOCOL.name,
             Message.VERSION.name,
@@ -563,18 +581,123 @@ class ResultsLogPipeline(Pipeline):
             Message.STOP.name
         ]
         test_types = [TestType.Module.name, TestType.Suite.name, TestType.Test.name]
-        command = "grep -E '^\\{\"message_keyword\":\""
-        command = (f"{command}({'|'.join(message_types)})\""
-            + ((".+\"test_type\":\"" + f"({'|'.join(test_types)})\"") if not steps else "")
-            + "'")
-        steps = [
-            read_and_filter_transform(input, command=command, stop=stop_event),
-            parse_transform(),
-            results_transform(results),
+        pattern = None if steps else f"\"test_type\":\"({'|'.join(test_types)})\""
+
+        if jobs > 1:
+            read_steps = [
+                read_parallel_transform(input, jobs, message_types=message_types,
+                    test_types=(test_types if not steps else None), stop=stop_event)
+            ]
+        else:
+            read_steps = [
+                batch.read_and_filter(input, Filter(message_types, pattern), stop=stop_event),
+                batch.parse()
+            ]
+
+        steps = read_steps + [
+            batch.adapter(results_transform(results, details=details)),
             stop_transform(stop_event)
         ]
         super(ResultsLogPipeline, self).__init__(steps, stop=stop_event)
 
+    def run(self):
+        """Execute pipeline unless results are available
+        in the log sidecar file and save the results
+        into the sidecar file otherwise.
+        """
+        logfile = sidecar.logfile(self.input)
+        if logfile is None:
+            return super(ResultsLogPipeline, self).run()
+
+        key = sidecar.key(logfile)
+        data = sidecar.load(logfile, self.entry, key)
+        if data is not None:
+            try:
+                load_results(data, self.results)
+                return
+            except (KeyError, IndexError, TypeError, ValueError):
+                self.results.clear()
+
+        super(ResultsLogPipeline, self).run()
+
+        # log could have changed while it was being read
+        if os.path.getsize(logfile) == key[0]:
+            sidecar.save(logfile, self.entry, dump_results(self.results), key)
+
+class DatabaseLogPipeline(Pipeline):
+    def __init__(self, input, connection, tail=False):
+        stop_event = threading.Event()
+        message_types = [
+            Message.VERSION.name,
+            Message.TEST.name,
+            Message.RESULT.name,
+            Message.METRIC.name,
+            Message.VALUE.name,
+            Message.STOP.name
+        ]
+        steps = [
+            batch.read_and_filter(input, Filter(message_types), tail=tail, stop=stop_event),
+            batch.parse(),
+            database_transform(connection),
+            stop_transform(stop_event)
+        ]
+        super(DatabaseLogPipeline, self).__init__(steps, stop=stop_event)
+
+class BundleLogPipeline(Pipeline):
+    def __init__(self, input, results=None, metrics=None, totals=None, metrics_aggregate=False, jobs=1):
+        stop_event = threading.Event()
+        message_types = [
+            Message.PROTOCOL.name,
+            Message.VERSION.name,
+            Message.TEST.name,
+            Message.RESULT.name,
+            Message.MAP.name,
+            Message.ATTRIBUTE.name,
+            Message.TAG.name,
+            Message.ARGUMENT.name,
+            Message.SPECIFICATION.name,
+            Message.REQUIREMENT.name,
+            Message.EXAMPLE.name,
+            Message.TICKET.name,
+            Message.VALUE.name,
+            Message.METRIC.name,
+            Message.STOP.name
+        ]
+
+        if jobs > 1:
+            steps = [
+                read_parallel_transform(input, jobs, message_types=message_types, stop=stop_event)
+            ]
+        else:
+            steps = [
+                batch.read_and_filter(input, Filter(message_types), stop=stop_event),
+                batch.parse()
+            ]
+
+        # results transform passes messages through
+        # while all the other reports consume them
+        if results is not None:
+            steps.append(batch.adapter(results_transform(results)))
+
+        reports = []
+        if metrics is not None:
+            reports.append(metrics_transform(metrics, aggregate=metrics_aggregate))
+        if totals is not None:
+            reports.append(totals_report_transform(stop_event, divider=""))
+
+        if reports:
+            steps.append(batch.fanout(*reports, stop=stop_event))
+            if totals is not None:
+                steps += [
+                    batch.fanin(
+                        "".join
+                    ),
+                    batch.write(totals)
+                ]
+
+        steps.append(stop_transform(stop_event))
+        super(BundleLogPipeline, self).__init__(steps, stop=stop_event)
+
 class CompactRawLogPipeline(Pipeline):
     def __init__(self, input, output, steps=True):
         stop_event = threading.Event()
@@ -595,14 +718,11 @@ class CompactRawLogPipeline(Pipeline):
             Message.STOP.name
         ]
         test_types = [TestType.Module.name, TestType.Suite.name, TestType.Test.name]
-        command = "grep -E '^\\{\"message_keyword\":\""
-        command = (f"{command}({'|'.join(message_types)})\""
-            + ((".+\"test_type\":\"" + f"({'|'.join(test_types)})\"") if not steps else "")
-            + "'")
+        pattern = None if steps else f"\"test_type\":\"({'|'.join(test_types)})\""
         steps = [
-            read_and_filter_transform(input, command=command, stop=stop_event),
-            raw_transform(),
-            write_transform(output),
+            batch.read_and_filter(input, Filter(message_types, pattern), stop=stop_event),
+            batch.adapter(raw_transform()),
+            batch.write(output),
             stop_transform(stop_event)
         ]
         super(CompactRawLogPipeline, self).__init__(steps, stop=stop_event)
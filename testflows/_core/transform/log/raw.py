@@ -12,13 +12,23 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from testflows._core.message import dumps, loadb
+
 def transform():
     """Transform raw message into raw format.
+
+    Binary message records are transcoded into JSON.
     """
     msg = None
     while True:
         if msg is not None:
-            if msg[0] != "{" and msg[-1] != "}":
+            if type(msg) is bytes:
+                try:
+                    msg = dumps(loadb(msg)) + "\n"
+                except (IndexError, ValueError, KeyError):
+                    msg = None
+                    continue
+            elif msg[0] != "{" and msg[-1] != "}":
                 msg = None
                 continue
         msg = yield msg
@@ -14,43 +14,70 @@
 # limitations under the License.
 import time
 
-from testflows._core.message import Message
+from testflows._core.message import Message, binary_marker, binary_record_size
 
-def transform(file, tail=False, offset=False, stop=None):
+def transform(file, tail=False, offset=False, stop=None, block=True):
     """Read lines from a file-like object.
 
+    JSON messages are yielded as strings and binary
+    message records are yielded as bytes.
+
     :param file: open file handle
     :param tail: tail mode, default: False
     :param offset: include offset with the message, default: False
     :param stop: stop event
+    :param block: in tail mode, wait for new data instead of
+        yielding None when no data is available, default: True
     """
     yield None
-    line = ""
+    line = b""
     pos = 0
-    stop_keyword = '{"message_keyword":"%s"' % str(Message.STOP)
+    stop_keyword = ('{"message_keyword":"%s"' % str(Message.STOP)).encode("utf-8")
     stop_keyword_len = len(stop_keyword)
+    stop_code = int(Message.STOP)
+    # binary records can only be read from the underlying byte stream
+    file = getattr(file, "buffer", file)
+    wait = getattr(file, "wait", None) or (lambda: time.sleep(0.15))
 
     while True:
         data = file.readline()
 
-        if type(data) is bytes:
-            data = data.decode("utf-8")
+        if type(data) is str:
+            data = data.encode("utf-8")
 
         line += data
 
-        if line.endswith("\n"):
-            if stop and line[:stop_keyword_len] == stop_keyword:
-                stop.set()
+        if line.endswith(b"\n"):
+            if line[:1] == binary_marker:
+                # binary record can contain new lines
+                # so keep reading until it is complete
+                if len(line) >= binary_record_size(line) > 0:
+                    if stop and line[5] == stop_code:
+                        stop.set()
+
+                    if offset:
+                        yield (line, pos)
+                        pos += len(line)
+                    else:
+                        yield line
 
-            if offset:
-                yield (line, pos)
-                pos += len(line.encode("utf-8"))
+                    line = b""
             else:
-                yield line
+                if stop and line[:stop_keyword_len] == stop_keyword:
+                    stop.set()
+
+                if offset:
+                    yield (line.decode("utf-8"), pos)
+                    pos += len(line)
+                else:
+                    yield line.decode("utf-8")
 
-            line = ""
+                line = b""
 
-        if data == "":
+        if data == b"":
             if not tail:
                 break
-            time.sleep(0.15)
+            if not block:
+                yield None
+                continue
+            wait()
@@ -12,44 +12,33 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import subprocess
+import itertools
 
 from testflows._core.message import Message
 
-def transform(file, command, tail=False, stop=None):
+def transform(file, filter, limit=None, tail=False, stop=None):
     """Read lines from a file-like object and
-    filter them using Unix grep utility.
+    filter them using message filter.
 
     :param file: open file handle
-    :param command: filter command (like grep)
+    :param filter: message filter
+    :param limit: maximum number of lines, default: None (no limit)
     :param tail: tail mode, default: False
     :param stop: stop event
     """
     yield None
 
-    stop_keyword = ('{"message_keyword":"%s"' % str(Message.STOP)).encode("utf-8")
-    stop_keyword_len = len(stop_keyword)
+    stop_keyword = '{"message_keyword":"%s"' % str(Message.STOP)
+    count = 0
 
-    process = subprocess.Popen(f"tfs transform raw | {command}", stdin=file, stdout=subprocess.PIPE, shell=True)
-
-    while True:
-        line = process.stdout.readline()
-
-        if line == b"":
-            if not tail:
-                break
-
-            if process.poll() is not None:
-                break
-
-            continue
-
-        if stop and line[:stop_keyword_len] == stop_keyword:
+    for line in itertools.chain.from_iterable(filter.read(file, tail=tail)):
+        if stop and line.startswith(stop_keyword):
             stop.set()
 
-        yield line.decode("utf-8")
+        yield line
 
-        if stop and stop.is_set():
+        count += 1
+        if stop and stop.is_set() or count == limit:
             break
 
     if stop:
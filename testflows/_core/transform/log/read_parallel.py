@@ -0,0 +1,166 @@
+# Copyright 2023 Katteli Inc.
+# TestFlows.com Open-Source Software Testing Framework (http://testflows.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import io
+import collections
+import concurrent.futures
+
+from testflows._core.message import Message, loads, loadb, json_keyword
+from testflows._core.message import binary_marker, binary_length, binary_keyword
+from .read import transform as read_transform
+
+#: default chunk size
+chunk_size = 4194304
+
+def split(buf):
+    """Return the end position of the last complete
+    message in the buffer.
+
+    JSON messages never contain binary record marker
+    so only binary records need to be walked one by one.
+
+    :param buf: buffer
+    """
+    pos = 0
+    end = len(buf)
+    while pos < end:
+        marker = buf.find(binary_marker, pos)
+        if marker == -1:
+            return buf.rfind(b"\n", pos) + 1 or pos
+        pos = marker
+        if pos + 5 > end:
+            break
+        size = 5 + binary_length.unpack_from(buf, pos + 1)[0]
+        if pos + size > end:
+            break
+        pos += size
+    return pos
+
+def chunks(file, size=chunk_size, tail=False):
+    """Read file and split it into chunks
+    that contain only complete messages.
+
+    :param file: file-like object
+    :param size: chunk size, default: 4MB
+    :param tail: return data as soon as it is available
+        instead of waiting for the full chunk, default: False
+    """
+    file = getattr(file, "buffer", file)
+    read = file.read1 if tail else file.read
+    buf = b""
+    while True:
+        data = read(size)
+        if not data:
+            break
+        buf += data
+        end = split(buf)
+        if end:
+            yield buf[:end]
+            buf = buf[end:]
+
+def parse(chunk, message_types=None, test_types=None):
+    """Parse messages in the chunk and return
+    a list of parsed messages and the index
+    of the stop message or -1.
+
+    :param chunk: chunk
+    :param message_types: message types to keep, default: all
+    :param test_types: test types to keep, default: all
+    """
+    msgs = []
+    stop = -1
+    for line in read_transform(io.BytesIO(chunk)):
+        if line is None:
+            continue
+        if message_types is not None:
+            if type(line) is bytes:
+                keyword = binary_keyword(line)
+            else:
+                match = json_keyword.match(line)
+                keyword = match.group(1) if match else None
+            if keyword not in message_types:
+                continue
+        try:
+            msg = loadb(line) if type(line) is bytes else loads(line)
+        except (IndexError, Exception):
+            continue
+        if test_types is not None and msg.get("test_type") not in test_types:
+            continue
+        if stop == -1 and msg["message_keyword"] == Message.STOP.name:
+            stop = len(msgs)
+        msgs.append(msg)
+    return msgs, stop
+
+def transform(file, jobs, message_types=None, test_types=None, stop=None, size=chunk_size):
+    """Read and parse messages using a pool of processes
+    and produce batches of parsed messages in the original order.
+
+    The log is read and decompressed in the current process,
+    split into chunks that contain only complete messages
+    and the chunks are parsed in parallel.
+
+    Stop message is returned in its own batch
+    and the stop event is set right before it is returned.
+
+    :param file: open file handle
+    :param jobs: number of processes
+    :param message_types: message types to keep, default: all
+    :param test_types: test types to keep, default: all
+    :param stop: stop event
+    :param size: chunk size, default: 4MB
+    """
+    yield None
+
+    if message_types is not None:
+        message_types = frozenset(message_types)
+    if test_types is not None:
+        test_types = frozenset(test_types)
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending = collections.deque()
+        reader = chunks(file, size=size)
+        done = False
+
+        while True:
+            # keep a bounded number of chunks in flight
+            while not done and len(pending) < jobs * 2:
+                chunk = next(reader, None)
+                if chunk is None:
+                    done = True
+                    break
+                pending.append(pool.submit(parse, chunk, message_types, test_types))
+
+            if not pending:
+                break
+
+            msgs, index = pending.popleft().result()
+
+            if index == -1 or stop is None:
+                if msgs:
+                    yield msgs
+                continue
+
+            if index:
+                yield msgs[:index]
+            stop.set()
+            yield msgs[index:index + 1]
+
+            for future in pending:
+                future.cancel()
+            break
+
+    if stop:
+        stop.set()
+
+    yield None
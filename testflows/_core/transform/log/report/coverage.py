@@ -12,7 +12,13 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import os
+import json
+import hashlib
+import tempfile
 import functools
+import threading
+
 import testflows.settings as settings
 
 from testflows._core.flags import Flags, SKIP
@@ -80,6 +86,89 @@ class Visitor(VisitorBase):
     def visit_document(self, node, children):
         return self.headings
 
+#: requirement names of specifications keyed by content digest
+_requirements = {}
+#: specification parser
+_parser = None
+#: specification parser lock
+_parser_lock = threading.Lock()
+#: specification cache version that must be changed
+#: when the specification grammar or the cached data changes
+cache_version = 1
+
+def cache_filename(digest):
+    """Return file name of cached requirement names
+    of the specification in the specification cache directory.
+
+    :param digest: specification content digest
+    """
+    return os.path.join(settings.specification_cache, f"{digest}.v{cache_version}.json")
+
+def load_requirement_names(digest):
+    """Return requirement names cached on disk
+    or None if they are not available.
+
+    :param digest: specification content digest
+    """
+    if not settings.specification_cache:
+        return None
+    try:
+        with open(cache_filename(digest), "r", encoding="utf-8") as fd:
+            return tuple(json.load(fd))
+    except (OSError, ValueError, TypeError):
+        return None
+
+def save_requirement_names(digest, names):
+    """Cache requirement names on disk.
+    Failure to write the cache is ignored.
+
+    :param digest: specification content digest
+    :param names: requirement names
+    """
+    if not settings.specification_cache:
+        return
+    try:
+        os.makedirs(settings.specification_cache, exist_ok=True)
+        fd, tmpname = tempfile.mkstemp(suffix=".json.tmp", dir=settings.specification_cache)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as tmp:
+                json.dump(names, tmp)
+            os.replace(tmpname, cache_filename(digest))
+        except BaseException:
+            os.unlink(tmpname)
+            raise
+    except OSError:
+        pass
+
+def requirement_names(content):
+    """Return requirement names of the specification.
+
+    Names are cached by the digest of the specification
+    content in memory and on disk if settings.specification_cache
+    is set. Specification parser is only built once.
+
+    :param content: specification content
+    """
+    global _parser
+
+    digest = hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+    names = _requirements.get(digest)
+    if names is not None:
+        return names
+
+    names = load_requirement_names(digest)
+    if names is None:
+        with _parser_lock:
+            if _parser is None:
+                _parser = Parser()
+            tree = _parser.parse(content)
+            names = tuple(heading.name for heading in visit_parse_tree(tree, Visitor())
+                if isinstance(heading, Requirement))
+        save_requirement_names(digest, names)
+
+    _requirements[digest] = names
+    return names
+
 class Counts(object):
     def __init__(self, name, units, ok, nok, untested):
         self.name = name
@@ -113,15 +202,7 @@ class Coverage:
 
     @staticmethod
     def parse_requirements(specification):
-        requirements = {}
-        parser = Parser()
-        tree = parser.parse(specification["specification_content"])
-
-        for heading in visit_parse_tree(tree, Visitor()):
-            if isinstance(heading, Requirement):
-                requirements[heading.name] = []
-
-        return requirements
+        return {name: [] for name in requirement_names(specification["specification_content"])}
 
     def calculate(self):
         """Calculate coverage.
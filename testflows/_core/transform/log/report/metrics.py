@@ -12,26 +12,85 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import math
+import array
+
 import testflows.settings as settings
 
 from testflows._core.flags import Flags, SKIP
 from testflows._core.message import Message
 
+#: percentiles of aggregated metrics
+percentiles = (50, 90, 99)
+
 def format_metric(msg, metrics):
     metrics.append(msg)
 
+def aggregate_metric(msg, metrics):
+    try:
+        value = float(msg["metric_value"])
+    except (TypeError, ValueError):
+        return
+    key = (msg["test_name"], msg["metric_name"], msg["metric_units"])
+    values = metrics.get(key)
+    if values is None:
+        values = metrics[key] = array.array("d")
+    values.append(value)
+
 formatters = {
     Message.METRIC.name: (format_metric,),
 }
 
-def transform(metrics):
+aggregate_formatters = {
+    Message.METRIC.name: (aggregate_metric,),
+}
+
+def percentile(values, p):
+    """Return percentile of the sorted values
+    using linear interpolation between the closest ranks.
+
+    :param values: sorted values
+    :param p: percentile (0-100)
+    """
+    rank = (len(values) - 1) * p / 100.0
+    low = math.floor(rank)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (rank - low)
+
+def aggregate(values):
+    """Return count, min, max, mean, standard deviation
+    and percentiles of the metric values.
+
+    :param values: array of metric values
+    """
+    values = sorted(values)
+    count = len(values)
+    mean = math.fsum(values) / count
+    stats = {
+        "count": count,
+        "min": values[0],
+        "max": values[-1],
+        "mean": mean,
+        "stddev": math.sqrt(math.fsum([(value - mean) ** 2 for value in values]) / count)
+    }
+    for p in percentiles:
+        stats[f"p{p}"] = percentile(values, p)
+    return stats
+
+def transform(metrics, aggregate=False):
     """Transform parsed log into metrics.
+
+    :param metrics: list of metric messages or, in aggregate mode,
+        a dictionary of metric values arrays keyed by
+        test name, metric name and units
+    :param aggregate: aggregate metric values, default: False
     """
+    _formatters = aggregate_formatters if aggregate else formatters
     line = None
     while True:
         if line is not None:
             msg = line
-            formatter = formatters.get(line["message_keyword"], None)
+            formatter = _formatters.get(line["message_keyword"], None)
             if formatter:
                 flags = Flags(line["test_flags"])
                 if flags & SKIP and settings.show_skipped is False:
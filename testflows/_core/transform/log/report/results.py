@@ -12,12 +12,238 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import sys
+
+from collections.abc import Mapping
+
 from testflows._core.name import parentname
 from testflows._core.message import Message
+from testflows._core.testtype import TestType
 from testflows._core.transform.log.report.totals import Counts, all_counts
 from testflows._core.transform.log.report.totals import format_test as process_test_counts
 from testflows._core.transform.log.report.totals import format_result as process_result_counts
 
+#: fields with repeated values that are interned
+interned_fields = frozenset([
+    "message_keyword", "message_stream", "test_type", "test_subtype",
+    "test_parent_type", "test_module", "result_type",
+    "attribute_name", "attribute_type", "attribute_group",
+    "argument_name", "argument_type", "argument_group",
+    "tag_value", "requirement_name", "requirement_version",
+    "metric_name", "metric_units", "value_name", "ticket_name"
+])
+
+#: test types that are less than test
+step_types = frozenset(test_type.name for test_type in TestType if test_type < TestType.Test)
+
+#: shared record layouts
+layouts = {}
+
+def layout(fields):
+    """Return shared layout for the fields.
+
+    :param fields: tuple of field names
+    """
+    _layout = layouts.get(fields)
+    if _layout is None:
+        fields = tuple(sys.intern(field) for field in fields)
+        _layout = layouts[fields] = (fields, {field: i for i, field in enumerate(fields)})
+    return _layout
+
+class Record(Mapping):
+    """Compact read-only message record.
+
+    Message values are stored in a tuple and field names
+    are shared between all records that have the same fields.
+    Repeated string values are interned.
+
+    :param msg: message
+    """
+    __slots__ = ("_layout", "_values")
+
+    def __init__(self, msg):
+        self._set(msg)
+
+    def _set(self, msg):
+        self._layout = layout(tuple(msg))
+        self._values = tuple([sys.intern(value) if type(value) is str and field in interned_fields else value
+            for field, value in msg.items()])
+
+    def __getitem__(self, key):
+        return self._values[self._layout[1][key]]
+
+    def __contains__(self, key):
+        return key in self._layout[1]
+
+    def __iter__(self):
+        return iter(self._layout[0])
+
+    def __len__(self):
+        return len(self._values)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
+
+class ListsRecord(Record):
+    """Compact message record that has
+    additional lists of messages.
+
+    Lists are only allocated when the first
+    message is appended.
+    """
+    __slots__ = ("_lists",)
+    #: names of the lists
+    lists = ()
+
+    def __init__(self, msg=None):
+        self._lists = None
+        self._set(msg or {})
+
+    def append(self, name, msg):
+        """Append message to the list.
+
+        :param name: list name
+        :param msg: message record
+        """
+        if self._lists is None:
+            self._lists = [None] * len(self.lists)
+        i = self.lists.index(name)
+        if self._lists[i] is None:
+            self._lists[i] = []
+        self._lists[i].append(msg)
+
+    def __getitem__(self, key):
+        if key in self.lists:
+            if self._lists is None:
+                return []
+            return self._lists[self.lists.index(key)] or []
+        return self._values[self._layout[1][key]]
+
+    def __contains__(self, key):
+        return key in self.lists or key in self._layout[1]
+
+    def __iter__(self):
+        yield from self.lists
+        yield from self._layout[0]
+
+    def __len__(self):
+        return len(self.lists) + len(self._values)
+
+class TestRecord(ListsRecord):
+    """Compact test record.
+
+    :param msg: test message
+    """
+    __slots__ = ()
+    lists = ("attributes", "arguments", "tags", "specifications", "requirements", "maps", "examples")
+
+class ResultRecord(ListsRecord):
+    """Compact test result record
+    that is empty until the result message is set.
+    """
+    __slots__ = ()
+    lists = ("tickets", "values", "metrics")
+
+    def update(self, msg):
+        """Set result message.
+
+        :param msg: result message
+        """
+        self._set(msg)
+
+def dump(results):
+    """Return results as plain data that can be stored
+    as JSON where each record is stored as its layout
+    index and a list of values.
+
+    :param results: results
+    """
+    fields = {}
+    specifications = {id(msg): i for i, msg in enumerate(results["specifications"])}
+    refs = [None] * len(specifications)
+
+    def dump_record(record):
+        idx = fields.get(record._layout[0])
+        if idx is None:
+            idx = fields[record._layout[0]] = len(fields)
+        return [idx, record._values]
+
+    def dump_lists_record(record, position):
+        lists = None
+        if record._lists is not None:
+            lists = []
+            for j, msgs in enumerate(record._lists):
+                if msgs is None:
+                    lists.append(None)
+                    continue
+                lists.append([dump_record(msg) for msg in msgs])
+                if position is not None:
+                    for k, msg in enumerate(msgs):
+                        if id(msg) in specifications:
+                            refs[specifications[id(msg)]] = [position, j, k]
+        return dump_record(record) + [lists]
+
+    tests = [[name, dump_lists_record(test["test"], i), dump_lists_record(test["result"], None)]
+        for i, (name, test) in enumerate(results["tests"].items())]
+
+    return {
+        "fields": list(fields),
+        "tests": tests,
+        "specifications": refs,
+        "counts": {name: vars(counts) for name, counts in results["counts"].items()},
+        "started": results["started"],
+        "version": results["version"],
+        "protocol": results.get("protocol")
+    }
+
+def load(data, results):
+    """Load results from plain data
+    produced by dump().
+
+    :param data: plain data
+    :param results: results
+    """
+    layouts = [layout(tuple(fields)) for fields in data["fields"]]
+    interned = [[i for i, field in enumerate(fields) if field in interned_fields] for fields in data["fields"]]
+
+    def load_record(cls, item):
+        record = object.__new__(cls)
+        values = item[1]
+        for i in interned[item[0]]:
+            if type(values[i]) is str:
+                values[i] = sys.intern(values[i])
+        record._layout = layouts[item[0]]
+        record._values = tuple(values)
+        return record
+
+    def load_lists_record(cls, item):
+        record = load_record(cls, item)
+        record._lists = None
+        if item[2] is not None:
+            record._lists = [None if msgs is None else [load_record(Record, msg) for msg in msgs] for msgs in item[2]]
+        return record
+
+    tests = results["tests"] = {}
+    tests_by_parent = results["tests_by_parent"] = {}
+    tests_by_id = results["tests_by_id"] = {}
+    positions = []
+
+    for name, test, result in data["tests"]:
+        test = load_lists_record(TestRecord, test)
+        tests[name] = {"test": test, "result": load_lists_record(ResultRecord, result)}
+        tests_by_parent.setdefault(parentname(test["test_id"]), []).append(test)
+        tests_by_id[test["test_id"]] = test
+        positions.append(test)
+
+    results["specifications"] = [positions[i]._lists[j][k] for i, j, k in data["specifications"]]
+    results["counts"] = {name: Counts(**counts) for name, counts in data["counts"].items()}
+    results["started"] = data["started"]
+    results["version"] = data["version"]
+    if data["protocol"] is not None:
+        results["protocol"] = data["protocol"]
+
+    return results
+
 def process_test(msg, results, names, unique):
     def add_name(name, names, unique, test_id):
         _name = name
@@ -31,13 +257,8 @@ def process_test(msg, results, names, unique):
         return
 
     add_name(msg["test_name"], names, unique, msg["test_id"])
-    test = {
-        "attributes":[], "arguments":[], "tags": [],
-        "specifications": [], "requirements": [],
-        "maps": [], "examples": []
-    }
-    test.update(msg)
-    results["tests"][names[msg["test_id"]]] = {"test": test, "result": {"tickets":[], "values":[], "metrics":[]}}
+    test = TestRecord(msg)
+    results["tests"][names[msg["test_id"]]] = {"test": test, "result": ResultRecord()}
     process_test_counts(msg, results["counts"])
 
     # add test to the tests map
@@ -59,35 +280,36 @@ def process_protocol(msg, results, names, unique):
     results["protocol"] = msg["protocol_version"]
 
 def process_attribute(msg, results, names, unique):
-    results["tests"][names[msg["test_id"]]]["test"]["attributes"].append(msg)
+    results["tests"][names[msg["test_id"]]]["test"].append("attributes", Record(msg))
 
 def process_tag(msg, results, names, unique):
-    results["tests"][names[msg["test_id"]]]["test"]["tags"].append(msg)
+    results["tests"][names[msg["test_id"]]]["test"].append("tags", Record(msg))
 
 def process_requirement(msg, results, names, unique):
-    results["tests"][names[msg["test_id"]]]["test"]["requirements"].append(msg)
+    results["tests"][names[msg["test_id"]]]["test"].append("requirements", Record(msg))
 
 def process_specification(msg, results, names, unique):
+    msg = Record(msg)
     results["specifications"].append(msg)
-    results["tests"][names[msg["test_id"]]]["test"]["specifications"].append(msg)
+    results["tests"][names[msg["test_id"]]]["test"].append("specifications", msg)
 
 def process_argument(msg, results, names, unique):
-    results["tests"][names[msg["test_id"]]]["test"]["arguments"].append(msg)
+    results["tests"][names[msg["test_id"]]]["test"].append("arguments", Record(msg))
 
 def process_example(msg, results, names, unique):
-    results["tests"][names[msg["test_id"]]]["test"]["examples"].append(msg)
+    results["tests"][names[msg["test_id"]]]["test"].append("examples", Record(msg))
 
 def process_map(msg, results, names, unique):
-    results["tests"][names[msg["test_id"]]]["test"]["maps"].append(msg)
+    results["tests"][names[msg["test_id"]]]["test"].append("maps", Record(msg))
 
 def process_ticket(msg, results, names, unique):
-    results["tests"][names[msg["test_id"]]]["result"]["tickets"].append(msg)
+    results["tests"][names[msg["test_id"]]]["result"].append("tickets", Record(msg))
 
 def process_metric(msg, results, names, unique):
-    results["tests"][names[msg["test_id"]]]["result"]["metrics"].append(msg)
+    results["tests"][names[msg["test_id"]]]["result"].append("metrics", Record(msg))
 
 def process_value(msg, results, names, unique):
-    results["tests"][names[msg["test_id"]]]["result"]["values"].append(msg)
+    results["tests"][names[msg["test_id"]]]["result"].append("values", Record(msg))
 
 processors = {
     Message.VERSION.name: process_version,
@@ -106,8 +328,15 @@ processors = {
     Message.VALUE.name: process_value,
 }
 
-def transform(results):
+#: messages that are always processed
+test_messages = frozenset([Message.TEST.name, Message.RESULT.name])
+
+def transform(results, details=True):
     """Transform log file into results.
+
+    :param results: results
+    :param details: include attributes, arguments, tags, requirements,
+        metrics, values and other details of steps, default: True
     """
     names = {}
     # unique test names
@@ -137,8 +366,9 @@ def transform(results):
     line = None
     while True:
         if line is not None:
-            processor = processors.get(line["message_keyword"], None)
-            if processor:
+            keyword = line["message_keyword"]
+            processor = processors.get(keyword, None)
+            if processor and (details or keyword in test_messages or line["test_type"] not in step_types):
                 processor(line, results, names, unique)
 
         line = yield line
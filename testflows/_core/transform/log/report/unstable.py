@@ -104,6 +104,40 @@ def generate(results, divider):
 
     return report or None
 
+def generate_runs(summaries, divider):
+    """Generate report of tests that have different
+    results between runs.
+
+    :param summaries: run summaries
+    :param divider: report divider
+    """
+    results = {}
+    for summary in summaries:
+        for name, test in summary["tests"].items():
+            if test["result_type"] is None:
+                continue
+            if results.get(name) is None:
+                results[name] = []
+            results[name].append(test["result_type"])
+
+    unstable = ""
+
+    for name, entry in results.items():
+        counts = UnstableCounts(name, *([0] * 11))
+        for result in entry:
+            counts.units += 1
+            result_name = result.lower()
+            setattr(counts, result_name, getattr(counts, result_name) + 1)
+        _counts = str(counts)
+        if _counts:
+            _counts += "\n"
+        unstable += _counts
+
+    if unstable:
+        unstable = color(f"{divider}Unstable\n\n", "white", attrs=["bold"]) + unstable.rstrip() + "\n"
+
+    return unstable or None
+
 def transform(stop, divider="\n"):
     """Generate unstable report.
 
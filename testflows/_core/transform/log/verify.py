@@ -0,0 +1,81 @@
+# Copyright 2023 Katteli Inc.
+# TestFlows.com Open-Source Software Testing Framework (http://testflows.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import testflows._core.integrity as integrity
+
+from testflows._core.message import loads, loadb, binary_set_hash
+
+def json_hash_data(line, msg_hash):
+    """Return data used to compute hash of the JSON message line.
+
+    :param line: JSON message line
+    :param msg_hash: hash of the previous message of the test
+    """
+    keyword, _, rest = line.rstrip("\n").split(",", 2)
+    return f'{keyword},"message_hash":"{msg_hash}",{rest}'.encode("utf-8")
+
+def transform(stats):
+    """Verify message numbering and hash chaining
+    of each test's messages.
+
+    Integrity mode is taken from the protocol message
+    and defaults to 'sha1' for logs that do not specify it.
+
+    :param stats: dictionary to store verification stats
+    """
+    stats.update({"mode": integrity.default, "messages": 0, "tests": 0, "errors": 0})
+    hash_func = integrity.hash_func(stats["mode"])
+    chains = {}
+    line = None
+
+    def error(msg, reason):
+        stats["errors"] += 1
+        return f"error: {msg['test_id']} message {msg['message_num']}: {reason}\n"
+
+    while True:
+        result = None
+        if line is not None:
+            try:
+                msg = loadb(line) if type(line) is bytes else loads(line)
+            except (IndexError, ValueError, KeyError):
+                msg = None
+                stats["errors"] += 1
+                result = "error: can't decode message\n"
+
+            if msg is not None:
+                stats["messages"] += 1
+                if msg["message_keyword"] == "PROTOCOL":
+                    stats["mode"] = msg.get("protocol_integrity", integrity.default)
+                    hash_func = integrity.hash_func(stats["mode"])
+
+                test_id = msg["test_id"]
+                if test_id not in chains:
+                    stats["tests"] += 1
+                    chains[test_id] = ("", 0)
+                prev_hash, num = chains[test_id]
+                msg_hash = msg["message_hash"]
+
+                if msg["message_num"] != num:
+                    result = error(msg, f"expected message number {num}")
+                elif hash_func is not None:
+                    if type(line) is bytes:
+                        data = binary_set_hash(line, prev_hash)[5:]
+                    else:
+                        data = json_hash_data(line, prev_hash)
+                    expected = hash_func(data).hexdigest()
+                    if not msg_hash or expected[:len(msg_hash)] != msg_hash:
+                        result = error(msg, f"hash mismatch, expected '{expected[:len(msg_hash) or None]}' got '{msg_hash}'")
+
+                chains[test_id] = (msg_hash, msg["message_num"] + 1)
+        line = yield result
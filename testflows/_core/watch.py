@@ -0,0 +1,107 @@
+# Copyright 2023 Katteli Inc.
+# TestFlows.com Open-Source Software Testing Framework (http://testflows.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import select
+import ctypes
+import ctypes.util
+import threading
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+
+#: inotify events that indicate new data
+IN_EVENTS = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+#: condition notified by the log writer after each flush
+flushed = threading.Condition()
+
+_libc = None
+
+def inotify():
+    """Return libc that provides inotify functions
+    or None if inotify is not available.
+    """
+    global _libc
+    if _libc is None:
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            libc.inotify_init1.argtypes = [ctypes.c_int]
+            libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+            _libc = libc
+        except (OSError, AttributeError):
+            _libc = False
+    return _libc or None
+
+def notify():
+    """Notify in-process watchers that
+    new data was written to the log.
+    """
+    with flushed:
+        flushed.notify_all()
+
+
+class Watcher:
+    """File or directory watcher that waits for new data
+    using inotify when available. Otherwise, it waits
+    for the in-process log writer flush notification
+    for at most the polling interval.
+
+    :param path: file or directory path
+    :param poll_interval: polling interval when inotify is not available, default: 0.15
+    :param timeout: maximum wait time when inotify is available, default: 1.0
+    """
+    def __init__(self, path, poll_interval=0.15, timeout=1.0):
+        self.fd = None
+        self.poll = None
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+
+        libc = inotify()
+        if libc is None or not isinstance(path, str) or not os.path.exists(path):
+            return
+
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return
+        if libc.inotify_add_watch(fd, os.fsencode(path), IN_EVENTS) < 0:
+            os.close(fd)
+            return
+
+        self.fd = fd
+        self.poll = select.poll()
+        self.poll.register(fd, select.POLLIN)
+
+    def wait(self):
+        """Wait until new data is available.
+        Can return early.
+        """
+        if self.fd is None:
+            with flushed:
+                flushed.wait(self.poll_interval)
+            return
+
+        if self.poll.poll(self.timeout * 1000):
+            try:
+                while os.read(self.fd, 4096):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
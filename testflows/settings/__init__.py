@@ -23,6 +23,8 @@ time_resolution = 6
 hash_length = 8
 #: hash function
 hash_func = hashlib.sha1
+#: log message integrity mode either 'none', 'crc32', 'blake2b' or 'sha1'
+log_integrity = "sha1"
 #: disable cli colors
 no_colors = False
 #: test id
@@ -32,8 +34,24 @@ output_format = None
 #: log file
 write_logfile = None
 read_logfile = None
+#: log format either 'json' or 'binary'
+log_format = "json"
+#: log compression either 'none', 'zlib[:level]' or 'lzma[:level]'
+log_compression = "lzma"
+#: base log file name of the per-worker log shards, shards are not used if None
+log_shards = None
+#: log channel address used by worker processes
+log_channel = None
+#: log writer flush latency target in seconds
+log_flush_latency = 0.15
+#: log writer buffer high water mark in bytes
+log_buffer_high_water_mark = 64 * 1024 * 1024
+#: log writer buffer low water mark in bytes
+log_buffer_low_water_mark = 16 * 1024 * 1024
 #: database
 database = None
+#: directory used to cache requirements parsed from specifications, not used if None
+specification_cache = None
 #: show skipped tests
 show_skipped = False
 #: show retries
@@ -0,0 +1,152 @@
+import io
+import json
+import re
+import threading
+
+from testflows.core import *
+from testflows._core.message import dumps, dumpb
+from testflows._core.transform.log import batch
+from testflows._core.transform.log.filter import Filter
+from testflows._core.transform.log.pipeline import Pipeline
+from testflows._core.transform.log.read import transform as read_transform
+from testflows._core.transform.log.read_parallel import transform as read_parallel_transform
+from testflows._core.transform.log.parse import transform as parse_transform
+from testflows._core.transform.log.raw import transform as raw_transform
+from testflows._core.transform.log.write import transform as write_transform
+from testflows._core.transform.log.stop import transform as stop_transform
+from testflows._core.transform.log.report.version import transform as version_report_transform
+
+def message(num, keyword="NOTE"):
+    return {"message_keyword": keyword, "message_hash": "", "message_object": 0,
+        "message_num": num, "message_stream": None, "message_level": 2,
+        "message_time": 1654012345.123456 + num, "message_rtime": 0.000123,
+        "test_type": "Test", "test_subtype": None, "test_id": "/1", "test_name": "/my test",
+        "message": f"note {num}"}
+
+def log(stop=True):
+    msgs = [message(0, "VERSION")] + [message(num) for num in range(1, 100)] + ([message(100, "STOP")] if stop else [])
+    msgs[0]["framework_version"] = "1.0"
+    msgs += [message(101)]
+    return io.BytesIO(b"".join([dumpb(msg) if msg["message_num"] % 2 else
+        (dumps(msg) + "\n").encode("utf-8") for msg in msgs]))
+
+def per_item(output):
+    stop_event = threading.Event()
+    return Pipeline([
+        read_transform(log(), stop=stop_event),
+        parse_transform(),
+        version_report_transform(stop_event),
+        write_transform(output),
+        stop_transform(stop_event)
+    ], stop=stop_event)
+
+def batched(output, size):
+    stop_event = threading.Event()
+    return Pipeline([
+        batch.read(log(), stop=stop_event, size=size),
+        batch.parse(),
+        batch.fanout(version_report_transform(stop_event), stop=stop_event),
+        batch.fanin("".join),
+        batch.write(output),
+        stop_transform(stop_event)
+    ], stop=stop_event)
+
+@TestScenario
+def same_output(self):
+    """Check that batch pipeline produces the same output
+    as per-item pipeline for different batch sizes."""
+    expected = io.StringIO()
+    per_item(expected).run()
+    assert expected.getvalue(), "report must not be empty"
+
+    for size in [1, 100, 1000, 1048576]:
+        with Check(f"batch size {size}"):
+            output = io.StringIO()
+            batched(output, size).run()
+            assert output.getvalue() == expected.getvalue(), output.getvalue()
+
+@TestScenario
+def without_stop_message(self):
+    """Check that reports are produced for
+    a log that has no stop message."""
+    stop_event = threading.Event()
+    output = io.StringIO()
+    Pipeline([
+        batch.read_and_filter(log(stop=False), Filter(["VERSION", "STOP"]), stop=stop_event),
+        batch.parse(),
+        batch.fanout(version_report_transform(stop_event), stop=stop_event),
+        batch.fanin("".join),
+        batch.write(output),
+        stop_transform(stop_event)
+    ], stop=stop_event).run()
+    assert "1.0" in output.getvalue(), output.getvalue()
+
+@TestScenario
+def adapter(self):
+    """Check using per-item transform in batch pipeline."""
+    stop_event = threading.Event()
+    output = io.StringIO()
+    Pipeline([
+        batch.read(log(), stop=stop_event),
+        batch.adapter(raw_transform()),
+        batch.write(output),
+        stop_transform(stop_event)
+    ], stop=stop_event).run()
+    lines = output.getvalue().splitlines()
+    assert len(lines) == 101, len(lines)
+    assert lines[-1].startswith('{"message_keyword":"STOP"'), lines[-1]
+
+def collect(reader):
+    msgs = []
+    next(reader)
+    for msgs_batch in reader:
+        msgs += msgs_batch or []
+    return msgs
+
+@TestScenario
+def parallel_read(self):
+    """Check that parallel read produces the same messages
+    in the same order as serial read for different chunk sizes."""
+    parse = batch.parse()
+    next(parse)
+    expected = parse.send(collect(batch.read(log(), stop=threading.Event())))
+    # pipeline stops at the stop message
+    expected = expected[:[msg["message_keyword"] for msg in expected].index("STOP") + 1]
+
+    for size in [1, 100, 4194304]:
+        with Check(f"chunk size {size}"):
+            stop_event = threading.Event()
+            msgs = collect(read_parallel_transform(log(), jobs=2, stop=stop_event, size=size))
+            assert msgs == expected
+            assert stop_event.is_set()
+
+@TestScenario
+def read_and_filter(self):
+    """Check filtering raw messages in process
+    for both JSON messages and binary records."""
+    raw = raw_transform()
+    next(raw)
+    lines = [raw.send(line) for line in collect(batch.read(log()))]
+    lines = lines[:lines.index(dumps(message(100, "STOP")) + "\n") + 1]
+
+    for message_types, pattern in [
+            (None, None),
+            (["VERSION", "STOP"], None),
+            (["NOTE"], '"message_num":[0-9]*7,'),
+            (None, '"message":"note [0-9]"')]:
+        with Check(f"message types {message_types} pattern {pattern}"):
+            stop_event = threading.Event()
+            filtered = collect(batch.read_and_filter(log(), Filter(message_types, pattern), stop=stop_event, size=100))
+            assert filtered == [line for line in lines
+                if (message_types is None or json.loads(line)["message_keyword"] in message_types)
+                and (pattern is None or re.search(pattern, line))], filtered
+            assert stop_event.is_set()
+
+@TestFeature
+def feature(self):
+    """Check batch transform pipeline."""
+    for scenario in loads(current_module(), Scenario):
+        scenario()
+
+if main():
+    feature()
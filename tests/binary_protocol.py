@@ -0,0 +1,85 @@
+import io
+
+from testflows.core import *
+from testflows._core.message import dumps, dumpb, loadb, lazy_loads, binary_set_hash, binary_keyword
+from testflows._core.transform.log.read import transform as read_transform
+from testflows._core.transform.log.raw import transform as raw_transform
+
+def message(**kwargs):
+    msg = {
+        "message_keyword": "NOTE",
+        "message_hash": "",
+        "message_object": 0,
+        "message_num": 1,
+        "message_stream": None,
+        "message_level": 2,
+        "message_time": 1654012345.123456,
+        "message_rtime": 0.000123,
+        "test_type": "Test",
+        "test_subtype": None,
+        "test_id": "/1/2",
+        "test_name": "/my test",
+        "test_flags": 0,
+        "test_cflags": 0,
+        "test_level": 1,
+        "test_parent_type": None,
+        "message": "line 1\nline 2 ✔"
+    }
+    msg.update(kwargs)
+    return msg
+
+@TestScenario
+def roundtrip(self):
+    """Check that binary record can be decoded back into the same message."""
+    for msg in [
+            message(),
+            message(message_stream="stdout"),
+            message(message=[1, 2**70, -1, None, True, {"a": [1.5, "\n"]}])
+        ]:
+        with Check(f"{msg['message']}"):
+            assert dumps(loadb(dumpb(msg))) == dumps(msg)
+
+@TestScenario
+def set_hash(self):
+    """Check replacing message hash in the binary record."""
+    record = binary_set_hash(dumpb(message()), "a1b2c3d4")
+    assert loadb(record)["message_hash"] == "a1b2c3d4"
+    assert binary_keyword(record) == "NOTE"
+
+@TestScenario
+def transcode(self):
+    """Check reading mixed JSON and binary log and
+    transcoding it into JSON."""
+    msgs = [message(message_keyword="PROTOCOL"), message(), message(message_keyword="STOP")]
+    log = io.BytesIO(b"".join([
+        (dumps(msgs[0]) + "\n").encode("utf-8"),
+        dumpb(msgs[1]), dumpb(msgs[2])
+    ]))
+    read = read_transform(log)
+    raw = raw_transform()
+    next(read), next(raw)
+    lines = [raw.send(line) for line in read if line is not None]
+    assert lines == [dumps(msg) + "\n" for msg in msgs]
+
+@TestScenario
+def lazy_message(self):
+    """Check that lazy message decodes to the same message
+    both for JSON messages and binary records."""
+    msg = message(test_name='/my "test", ✔')
+    for line in [dumps(msg) + "\n", dumpb(msg)]:
+        with Check(f"{type(line).__name__}"):
+            for key in msg:
+                assert lazy_loads(line)[key] == msg[key], key
+            lazy_msg = lazy_loads(line)
+            assert lazy_msg["test_name"] == msg["test_name"]
+            assert lazy_msg.get("unknown") is None
+            assert dumps(lazy_msg) == dumps(msg)
+
+@TestFeature
+def feature(self):
+    """Check binary message protocol."""
+    for scenario in loads(current_module(), Scenario):
+        scenario()
+
+if main():
+    feature()
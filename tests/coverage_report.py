@@ -0,0 +1,45 @@
+import os
+import tempfile
+
+from testflows.core import *
+
+import testflows.settings as settings
+import testflows._core.transform.log.report.coverage as coverage
+
+content = "# SRS Test\n\n## Requirements\n\n" + "".join(
+    f"### RQ.SRS.Test.Req{i}\nversion: 1.0\n\nThe system SHALL do thing {i}.\n\n" for i in range(3))
+
+@TestScenario
+def cached_requirement_names(self):
+    """Check that requirement names of the specification
+    are cached in memory and on disk."""
+    names = ("RQ.SRS.Test.Req0", "RQ.SRS.Test.Req1", "RQ.SRS.Test.Req2")
+
+    with tempfile.TemporaryDirectory() as dirname:
+        cache = settings.specification_cache
+        settings.specification_cache = dirname
+        try:
+            with Check("requirement names are parsed"):
+                coverage._requirements.clear()
+                assert coverage.requirement_names(content) == names
+
+            with Check("requirement names are cached in memory"):
+                assert coverage.requirement_names(content) is coverage.requirement_names(content)
+
+            with Check("requirement names are cached on disk"):
+                assert len(os.listdir(dirname)) == 1
+                coverage._requirements.clear()
+                coverage._parser = None
+                assert coverage.requirement_names(content) == names
+                assert coverage._parser is None
+        finally:
+            settings.specification_cache = cache
+
+@TestFeature
+def feature(self):
+    """Check coverage report transform."""
+    for scenario in loads(current_module(), Scenario):
+        scenario()
+
+if main():
+    feature()
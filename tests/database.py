@@ -0,0 +1,75 @@
+import io
+import os
+import tempfile
+import contextlib
+
+from testflows.core import *
+from testflows._core.message import dumps
+from testflows._core.transform.log.pipeline import DatabaseLogPipeline
+
+import testflows._core.database as database
+
+def message(keyword, test_id, **kwargs):
+    msg = {
+        "message_keyword": keyword,
+        "message_hash": "",
+        "message_object": 0,
+        "message_num": 0,
+        "message_stream": None,
+        "message_level": 1,
+        "message_time": 1654012345.0,
+        "message_rtime": 0.1,
+        "test_type": "Test",
+        "test_subtype": None,
+        "test_id": test_id,
+        "test_name": "/suite" + "".join("/" + part for part in test_id.split("/")[2:]),
+        "test_flags": 0,
+        "test_cflags": 0,
+        "test_level": test_id.count("/"),
+        "test_parent_type": None
+    }
+    msg.update(kwargs)
+    return msg
+
+def log(run, result_type):
+    msgs = [
+        message("VERSION", f"/{run}", framework_version="1.0"),
+        message("TEST", f"/{run}", test_type="Suite", test_module="__main__", test_uid=None, test_description=None),
+        message("TEST", f"/{run}/1", test_parent_type="Suite", test_module="__main__", test_uid=None, test_description=None),
+        message("METRIC", f"/{run}/1", metric_name="m", metric_value=1.5, metric_units="ms", metric_type=None, metric_group=None),
+        message("RESULT", f"/{run}/1", result_message=None, result_reason=None, result_type=result_type, result_test=None),
+        message("RESULT", f"/{run}", test_type="Suite", result_message=None, result_reason=None, result_type=result_type, result_test=None),
+        message("STOP", f"/{run}")
+    ]
+    return io.BytesIO("".join([dumps(msg) + "\n" for msg in msgs]).encode("utf-8"))
+
+@TestScenario
+def store_and_query(self):
+    """Check storing results in the database and
+    querying flaky tests and test durations."""
+    with tempfile.TemporaryDirectory() as dirname:
+        with contextlib.closing(database.connect(os.path.join(dirname, "results.db"))) as connection:
+            for run, result_type in [("run1", "OK"), ("run2", "Fail"), ("run2", "OK")]:
+                DatabaseLogPipeline(log(run, result_type), connection).run()
+
+            with Check("the same run is replaced"):
+                assert connection.execute("SELECT result_type FROM runs ORDER BY id").fetchall() == [("OK",), ("OK",)]
+                assert connection.execute("SELECT COUNT(*) FROM metrics").fetchone() == (2,)
+
+            with Check("test durations"):
+                assert database.durations(connection, "/suite/1") == [(1654012345.0, "OK", 0.1)] * 2
+
+            with Check("flaky tests"):
+                assert database.flaky(connection) == {}
+                DatabaseLogPipeline(log("run3", "Fail"), connection).run()
+                assert database.flaky(connection)["/suite/1"] == {"Fail": 1, "OK": 2}
+                assert database.flaky(connection, last=1) == {}
+
+@TestFeature
+def feature(self):
+    """Check built-in SQLite results database."""
+    for scenario in loads(current_module(), Scenario):
+        scenario()
+
+if main():
+    feature()
@@ -0,0 +1,143 @@
+import os
+import tempfile
+import threading
+
+from testflows.core import *
+from testflows._core.io import LogWriter
+from testflows._core.parallel.channel import LogChannelServer, LogChannel, log_channel
+
+import testflows.settings as settings
+
+def log_writer(**kwargs):
+    """Return new log writer that writes uncompressed log
+    and does not replace the log writer of the current test program.
+    """
+    instance = LogWriter.instance
+    LogWriter.instance = None
+    compression, settings.log_compression = settings.log_compression, "none"
+    try:
+        return LogWriter(**kwargs)
+    finally:
+        LogWriter.instance = instance
+        settings.log_compression = compression
+
+def clients(target, count=4):
+    """Run log channel clients in threads
+    and return errors raised by them.
+    """
+    errors = []
+
+    def run(client):
+        try:
+            target(client)
+        except BaseException as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=run, args=(client,)) for client in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return errors
+
+@TestScenario
+def order_of_messages_per_client(self):
+    """Check that messages sent by multiple clients
+    are written in the order each client has sent them."""
+    with tempfile.TemporaryDirectory() as dirname:
+        filename = os.path.join(dirname, "test.log")
+        writer = log_writer(filename=filename)
+        server = LogChannelServer(writer)
+
+        def client(num):
+            channel = LogChannel(server.address)
+            for i in range(1000):
+                channel.write(f"{num} {i}\n".encode("utf-8"))
+                if i % 100 == 0:
+                    channel.flush()
+            channel.flush()
+            channel.close()
+
+        try:
+            with By("sending messages from multiple clients"):
+                errors = clients(client)
+                assert not errors, errors
+        finally:
+            writer.close(final=True)
+            server.close()
+
+        with Then("messages of each client are in order"):
+            messages = {}
+            with open(filename) as fd:
+                for line in fd:
+                    num, i = line.split()
+                    messages.setdefault(num, []).append(int(i))
+            assert sorted(messages) == ["0", "1", "2", "3"], sorted(messages)
+            for num in messages:
+                assert messages[num] == list(range(1000)), f"client {num} messages are out of order"
+
+@TestScenario
+def sync_after_data_is_written(self):
+    """Check that sync returns only after all
+    the data sent before it was written to the log writer."""
+    with tempfile.TemporaryDirectory() as dirname:
+        filename = os.path.join(dirname, "test.log")
+        writer = log_writer(filename=filename)
+        server = LogChannelServer(writer)
+
+        def client(num):
+            channel = LogChannel(server.address)
+            for i in range(50):
+                channel.write(f"{num} {i}\n".encode("utf-8"))
+                channel.flush()
+                writer.flush(force=True)
+                with open(filename) as fd:
+                    assert f"{num} {i}\n" in fd.read(), f"client {num} message {i} is not written after sync"
+            channel.close()
+
+        try:
+            with By("sending a sync after each message"):
+                errors = clients(client)
+        finally:
+            writer.close(final=True)
+            server.close()
+
+        with Then("each message is written when sync returns"):
+            assert not errors, errors
+
+@TestScenario
+def fallback_when_connection_fails(self):
+    """Check that log writer falls back to the service object
+    when it can't connect to the log channel server."""
+    with tempfile.TemporaryDirectory() as dirname:
+        filename = os.path.join(dirname, "test.log")
+        address = os.path.join(dirname, "missing.sock")
+
+        with When("connecting to the log channel server that does not exist"):
+            assert log_channel(address) is None
+
+        parent = log_writer(filename=filename)
+        try:
+            with And("log writer is using the parent log writer as the service object"):
+                writer = log_writer(fd=parent, channel=address)
+                assert writer.fd is parent, error()
+
+            with By("writing a message"):
+                writer.write("message\n")
+                writer.close(final=True)
+        finally:
+            parent.close(final=True)
+
+        with Then("message is written by the parent log writer"):
+            with open(filename) as fd:
+                assert fd.read() == "message\n", error()
+
+@TestFeature
+def feature(self):
+    """Check log channel."""
+    for scenario in loads(current_module(), Scenario):
+        scenario()
+
+if main():
+    feature()
@@ -0,0 +1,47 @@
+import io
+
+from testflows.core import *
+from testflows._core.compress import StreamCompressor, CompressedFile, XZ_MARKER
+
+chunks = [f'{{"message_keyword":"NOTE","message":"line {i}"}}\n'.encode("utf-8") for i in range(10)]
+
+@TestOutline(Scenario)
+@Examples("mode", [("lzma",), ("lzma:0",), ("zlib",), ("zlib:1",), ("none",)])
+def roundtrip(self, mode):
+    """Check reading log written by the stream compressor."""
+    compressor = StreamCompressor(mode)
+    data = b"".join([compressor.compress(chunk) for chunk in chunks])
+
+    with Check("each chunk can be read before stream is finished"):
+        assert CompressedFile(io.BytesIO(data)).read() == b"".join(chunks)
+
+    with Check("finished stream"):
+        data += compressor.close()
+        assert CompressedFile(io.BytesIO(data)).read() == b"".join(chunks)
+
+@TestScenario
+def lzma_blocks(self):
+    """Check that lzma chunks are compressed into streams
+    that contain at least the block size of data."""
+    compressor = StreamCompressor("lzma", block_size=len(chunks[0]) * 4)
+    data = b"".join([compressor.compress(chunk) for chunk in chunks]) + compressor.close()
+    assert data.count(XZ_MARKER) == 3
+    assert CompressedFile(io.BytesIO(data)).read() == b"".join(chunks)
+
+@TestScenario
+def mixed(self):
+    """Check reading log that contains streams compressed using different methods."""
+    data = b""
+    for mode, chunk in zip(["zlib", "lzma"] * 5, chunks):
+        compressor = StreamCompressor(mode)
+        data += compressor.compress(chunk) + compressor.close()
+    assert CompressedFile(io.BytesIO(data)).read() == b"".join(chunks)
+
+@TestFeature
+def feature(self):
+    """Check log compression."""
+    for scenario in loads(current_module(), Scenario):
+        scenario()
+
+if main():
+    feature()
@@ -0,0 +1,124 @@
+import io
+import os
+import re
+import tempfile
+
+from testflows.core import *
+from testflows._core.message import dumps, dumpb
+from testflows._core.compress import CompressedFile, StreamCompressor
+from testflows._core.transform.log import index
+from testflows._core.transform.log.filter import Filter
+
+def message(num, test, keyword="NOTE"):
+    return {"message_keyword": keyword, "message_hash": "", "message_object": int(keyword == "TEST"),
+        "message_num": num, "message_stream": None, "message_level": 2,
+        "message_time": 1654012345.123456 + num, "message_rtime": 0.000123,
+        "test_type": "Test", "test_subtype": None, "test_id": f"/1/{test}", "test_name": f"/my test {test}",
+        "test_flags": 0, "test_cflags": 0, "test_level": 1, "test_parent_type": None,
+        "message": f"note {num}"}
+
+def messages():
+    msgs = []
+    for num in range(60):
+        test = num % 3
+        keyword = "NOTE"
+        if num < 3:
+            keyword = "TEST"
+        elif num >= 57:
+            keyword = "RESULT"
+        msgs.append(message(num, test, keyword))
+    return msgs + [message(60, 0, "STOP")]
+
+def log(msgs):
+    return io.BytesIO(b"".join([dumpb(msg) if msg["message_num"] % 2 else
+        (dumps(msg) + "\n").encode("utf-8") for msg in msgs]))
+
+@TestScenario
+def seek_messages(self):
+    """Check reading messages of the tests
+    using test-to-offset index."""
+    msgs = messages()
+    idx, end = index.build(log(msgs))
+
+    with Check("index is complete"):
+        assert sorted(idx) == ["/1/0", "/1/1", "/1/2"], error()
+        assert end is None, error()
+
+    with Check("read messages of one test"):
+        tests = index.match(idx, re.compile("/my test 1"))
+        lines = [line for line in index.transform(log(msgs), idx, tests) if line is not None]
+        assert lines == [dumps(msg) + "\n" for msg in msgs if msg["test_id"] == "/1/1"], error()
+
+    with Check("read only test messages"):
+        tests = index.match(idx, re.compile("/my test [02]"))
+        lines = [line for line in index.transform(log(msgs), idx, tests, message_types=["TEST"]) if line is not None]
+        assert lines == [dumps(msgs[0]) + "\n", dumps(msgs[2]) + "\n"], error()
+
+    with Check("index of incomplete log"):
+        idx, end = index.build(log(msgs[:-1]))
+        assert sorted(idx) == ["/1/0", "/1/1", "/1/2"], error()
+        assert end == len(log(msgs[:-1]).getvalue()), error()
+
+@TestScenario
+def incomplete_log(self):
+    """Check reading messages of the tests
+    of the log that is not complete."""
+    msgs = messages()[:-1]
+    expected = [dumps(msg) + "\n" for msg in msgs if msg["test_id"] == "/1/1"]
+
+    with tempfile.TemporaryDirectory() as dirname:
+        logfile = os.path.join(dirname, "test.log")
+        with open(logfile, "wb") as fd:
+            fd.write(log(msgs[:30]).getvalue())
+
+        def read():
+            with open(logfile, "rb") as file:
+                return [line for line in index.read_and_filter(file, Filter(pattern="/my test 1"),
+                    name="/my test 1") if line is not None]
+
+        with Check("read messages of one test"):
+            assert read() == expected[:10], error()
+
+        with Check("index is stored"):
+            with open(logfile, "rb") as file:
+                assert index.load(file)[1] == len(log(msgs[:30]).getvalue()), error()
+
+        with Check("read messages after the log is appended"):
+            with open(logfile, "ab") as fd:
+                fd.write(log(msgs[30:]).getvalue())
+            assert read() == expected, error()
+
+@TestOutline(Scenario)
+@Examples("mode block_size", [("lzma", None), ("zlib", 1)])
+def compressed_seek(self, mode, block_size):
+    """Check seeking in compressed log
+    that consists of multiple blocks."""
+    msgs = messages()
+    data = log(msgs).getvalue()
+    compressor = StreamCompressor(mode, block_size=block_size)
+
+    with tempfile.TemporaryDirectory() as dirname:
+        logfile = os.path.join(dirname, "test.log")
+        with open(logfile, "wb") as fd:
+            for start in range(0, len(msgs), 10):
+                fd.write(compressor.compress(log(msgs[start:start + 10]).getvalue()))
+
+        with CompressedFile(logfile) as file:
+            with Check("block index is available"):
+                blocks = file.blocks()
+                assert len(blocks) == 7, error()
+                assert blocks[1][2:] == (msgs[10]["message_time"], msgs[19]["message_time"]), error()
+
+            with Check("seek to any offset"):
+                for offset in [5000, 10, len(data) - 10, 2999, 3000, 0]:
+                    file.seek(offset)
+                    assert file.read(20) == data[offset:offset + 20], error()
+
+@TestFeature
+def feature(self):
+    """Check test-to-offset log index."""
+    for scenario in loads(current_module(), Scenario):
+        scenario()
+
+if main():
+    feature()
@@ -0,0 +1,71 @@
+import io
+
+from testflows.core import *
+from testflows._core.integrity import hash_func
+from testflows._core.message import dumps, dumpb, binary_set_hash
+from testflows._core.transform.log.read import transform as read_transform
+from testflows._core.transform.log.verify import transform as verify_transform
+
+def messages(mode, binary=False, count=3):
+    """Return hash chained log lines."""
+    func, msg_hash, lines = hash_func(mode), "", []
+    for num in range(count):
+        msg = {"message_keyword": "NOTE", "message_hash": msg_hash, "message_object": 0,
+            "message_num": num, "message_stream": None, "message_level": 2,
+            "message_time": 1654012345.123456, "message_rtime": 0.000123,
+            "test_type": "Test", "test_subtype": None, "test_id": "/1/2",
+            "test_name": "/my test", "message": f"line {num}"}
+        if num == 0:
+            msg.update({"message_keyword": "PROTOCOL", "protocol_version": "TFSPv2.1", "protocol_integrity": mode})
+        if binary:
+            line = dumpb(msg)
+            if func is not None:
+                msg_hash = func(line[5:]).hexdigest()[:8]
+                line = binary_set_hash(line, msg_hash)
+        else:
+            line = dumps(msg)
+            if func is not None:
+                msg_hash = func(line.encode("utf-8")).hexdigest()[:8]
+                line = line.replace(f'"message_hash":"{msg["message_hash"]}"', f'"message_hash":"{msg_hash}"', 1)
+            line = (line + "\n").encode("utf-8")
+        lines.append(line)
+    return lines
+
+def verify(lines):
+    """Verify log lines and return stats."""
+    stats = {}
+    verify = verify_transform(stats)
+    next(verify)
+    for line in read_transform(io.BytesIO(b"".join(lines))):
+        if line is not None:
+            verify.send(line)
+    return stats
+
+@TestOutline(Scenario)
+@Examples("mode binary", [
+    (mode, binary) for mode in ("none", "crc32", "blake2b", "sha1") for binary in (False, True)
+])
+def chain(self, mode, binary):
+    """Check verifying hash chained messages."""
+    lines = messages(mode, binary=binary)
+
+    with Check("valid log"):
+        stats = verify(lines)
+        assert stats["errors"] == 0
+        assert stats["mode"] == mode
+
+    with Check("tampered message"):
+        lines[1] = lines[1].replace(b"line 1", b"line 7")
+        assert verify(lines)["errors"] == (0 if mode == "none" else 1)
+
+    with Check("missing message"):
+        assert verify(lines[:1] + lines[2:])["errors"] == 1
+
+@TestFeature
+def feature(self):
+    """Check log integrity verification."""
+    for scenario in loads(current_module(), Scenario):
+        scenario()
+
+if main():
+    feature()
@@ -0,0 +1,84 @@
+import io
+import os
+import tempfile
+
+from testflows.core import *
+from testflows._core.message import dumps, dumpb
+from testflows._core.shards import ShardedLogFile, shard_filename, shards, end_marker, merge as merge_shards
+from testflows._core.transform.log.merge import transform as merge_transform
+
+def message(keyword, time, binary=False):
+    msg = {"message_keyword": keyword, "message_hash": "", "message_object": 0,
+        "message_num": 0, "message_stream": None, "message_level": 2,
+        "message_time": time, "message_rtime": 0.0, "test_type": "Test",
+        "test_subtype": None, "test_id": "/1", "test_name": "/test"}
+    if binary:
+        return dumpb(msg)
+    return (dumps(msg) + "\n").encode("utf-8")
+
+@TestScenario
+def merge(self):
+    """Check merging log and its shards in message time order."""
+    log = [message("PROTOCOL", 1.0), message("NOTE", 3.0), message("STOP", 10.0)]
+    shard1 = [message("NOTE", 2.0), message("NOTE", 3.0, binary=True), message("NOTE", 5.5)]
+    shard2 = [message("NOTE", 1.5, binary=True), message("NOTE", 9.0)]
+
+    merged = list(merge_transform([io.BytesIO(b"".join(lines)) for lines in (log, shard1, shard2)]))[1:]
+
+    assert merged == [log[0], shard2[0], shard1[0], log[1], shard1[1], shard1[2], shard2[1], log[2]]
+
+@TestScenario
+def merge_into_log(self):
+    """Check merging shards into the log at the end of the run."""
+    with tempfile.TemporaryDirectory() as dirname:
+        logfile = os.path.join(dirname, "test.log")
+        with open(logfile, "wb") as fd:
+            fd.write(message("PROTOCOL", 1.0) + message("STOP", 3.0))
+        with open(shard_filename(logfile), "wb") as fd:
+            fd.write(message("NOTE", 2.0) + message("NOTE", 4.0) + end_marker)
+
+        merge_shards(logfile, compression="none")
+
+        with Check("shards are merged with stop message last"):
+            with open(logfile, "rb") as fd:
+                assert fd.read() == message("PROTOCOL", 1.0) + message("NOTE", 2.0) + message("NOTE", 4.0) + message("STOP", 3.0)
+
+        with Check("shards are removed"):
+            assert shards(logfile) == []
+
+@TestScenario
+def stop_after_shard_end(self):
+    """Check that stop message of the log is only returned
+    after the end marker of each shard has been read."""
+    with tempfile.TemporaryDirectory() as dirname:
+        logfile = os.path.join(dirname, "test.log")
+        with open(logfile, "wb") as fd:
+            fd.write(message("PROTOCOL", 1.0) + message("STOP", 10.0))
+        with open(shard_filename(logfile), "wb") as fd:
+            fd.write(message("NOTE", 2.0))
+
+        def readlines(log):
+            lines = []
+            for _ in range(10):
+                line = log.readline()
+                if line:
+                    lines.append(line)
+            return lines
+
+        with ShardedLogFile(logfile, tail=True) as log:
+            with By("reading the log before the shard has ended"):
+                assert readlines(log) == [message("PROTOCOL", 1.0), message("NOTE", 2.0)]
+
+            with And("reading the log after the shard has ended"):
+                with open(shard_filename(logfile), "ab") as fd:
+                    fd.write(message("NOTE", 3.0) + end_marker)
+                assert readlines(log) == [message("NOTE", 3.0), message("STOP", 10.0)]
+
+@TestFeature
+def feature(self):
+    """Check log shards."""
+    for scenario in loads(current_module(), Scenario):
+        scenario()
+
+if main():
+    feature()
@@ -0,0 +1,92 @@
+import os
+import time
+import tempfile
+import itertools
+import threading
+
+from testflows.core import *
+from testflows._core.io import LogWriter
+
+import testflows.settings as settings
+
+def log_writer(filename, compression=None):
+    """Return new log writer that does not
+    replace the log writer of the current test program.
+    """
+    instance = LogWriter.instance
+    LogWriter.instance = None
+    compression, settings.log_compression = settings.log_compression, compression or settings.log_compression
+    try:
+        return LogWriter(filename=filename)
+    finally:
+        LogWriter.instance = instance
+        settings.log_compression = compression
+
+@TestScenario
+def flushes_under_steady_writes(self):
+    """Check that the log writer flushes at most
+    once per flush latency while messages are being
+    written at a steady rate."""
+    flushes = []
+
+    with tempfile.TemporaryDirectory() as dirname:
+        writer = log_writer(os.path.join(dirname, "test.log"), compression="lzma")
+
+        flush = writer.flush
+        writer.flush = lambda *args, **kwargs: flushes.append(time.time()) or flush(*args, **kwargs)
+
+        with By("writing messages at a steady rate"):
+            start = time.time()
+            while time.time() - start < 2:
+                writer.write("message\n")
+                time.sleep(0.001)
+
+        writer.close(final=True)
+
+        with Then("number of flushes is bound by flush latency"):
+            assert len(flushes) <= 2 / writer.flush_latency + 3, f"{len(flushes)} flushes"
+
+@TestScenario
+def order_of_messages_being_appended(self):
+    """Check that a message that got its sequence number
+    before the flush but is still being appended
+    is not written after the messages that follow it."""
+    class Sequence:
+        def __init__(self):
+            self.count = itertools.count()
+
+        def __next__(self):
+            num = next(self.count)
+            if threading.current_thread().name == "slow":
+                time.sleep(0.3)
+            return num
+
+    with tempfile.TemporaryDirectory() as dirname:
+        filename = os.path.join(dirname, "test.log")
+        writer = log_writer(filename, compression="none")
+        writer.sequence = Sequence()
+
+        with By("writing a message that is slow to append"):
+            slow = threading.Thread(target=writer.write, args=("1\n",), name="slow")
+            slow.start()
+            time.sleep(0.1)
+
+        with And("writing next message and flushing"):
+            writer.write("2\n")
+            writer.flush(force=True)
+            slow.join()
+
+        writer.close(final=True)
+
+        with Then("messages are written in order"):
+            with open(filename) as fd:
+                assert fd.read() == "1\n2\n"
+
+@TestFeature
+def feature(self):
+    """Check log writer."""
+    for scenario in loads(current_module(), Scenario):
+        scenario()
+
+if main():
+    feature()
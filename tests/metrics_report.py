@@ -0,0 +1,40 @@
+import io
+import array
+
+from testflows.core import *
+from testflows._core.transform.log.report.metrics import aggregate
+from testflows._core.cli.arg.handlers.report.metrics import OpenMetricsFormatter, CSVMetricsFormatter
+
+@TestScenario
+def aggregated_values(self):
+    """Check aggregating metric values."""
+    stats = aggregate(array.array("d", range(100, 0, -1)))
+    assert stats["count"] == 100
+    assert (stats["min"], stats["max"], stats["mean"]) == (1, 100, 50.5)
+    assert round(stats["stddev"], 4) == 28.8661
+    assert (stats["p50"], round(stats["p90"], 4), round(stats["p99"], 4)) == (50.5, 90.1, 99.01)
+
+@TestScenario
+def aggregated_report(self):
+    """Check aggregated metrics report formats."""
+    data = {"aggregate": True, "metrics": {("/my test", "latency time", "ms"): array.array("d", [1, 2, 3])}}
+
+    with Check("openmetrics"):
+        body = io.StringIO()
+        OpenMetricsFormatter().write(body, data)
+        assert 'latency_time_count{test="/my test",units="ms"} 3\n' in body.getvalue()
+        assert 'latency_time{test="/my test",units="ms",quantile="0.5"} 2.0\n' in body.getvalue()
+
+    with Check("csv"):
+        lines = CSVMetricsFormatter().format(data).splitlines()
+        assert lines[0].startswith('"test_name","metric_name","metric_units","count"')
+        assert lines[1].startswith('"/my test","latency_time","ms",3,1.0,3.0,2.0,')
+
+@TestFeature
+def feature(self):
+    """Check metrics report."""
+    for scenario in loads(current_module(), Scenario):
+        scenario()
+
+if main():
+    feature()
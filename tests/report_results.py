@@ -0,0 +1,92 @@
+import io
+import json
+
+from testflows.core import *
+from testflows._core.message import dumps
+from testflows._core.transform.log.pipeline import ResultsLogPipeline
+from testflows._core.transform.log.report.results import dump, load
+
+def message(keyword, test_type="Test", test_id="/1", **kwargs):
+    msg = {
+        "message_keyword": keyword,
+        "message_hash": "",
+        "message_object": 0,
+        "message_num": 0,
+        "message_stream": None,
+        "message_level": 1,
+        "message_time": 1654012345.0,
+        "message_rtime": 0.1,
+        "test_type": test_type,
+        "test_subtype": None,
+        "test_id": test_id,
+        "test_name": test_id.replace("/", "/test "),
+        "test_flags": 0,
+        "test_cflags": 0,
+        "test_level": test_id.count("/"),
+        "test_parent_type": None
+    }
+    msg.update(kwargs)
+    return msg
+
+def log():
+    msgs = [
+        message("TEST", test_module="__main__", test_uid=None, test_description=None),
+        message("ATTRIBUTE", attribute_name="a", attribute_value="1", attribute_type="int", attribute_group=None),
+        message("SPECIFICATION", specification_name="SRS", specification_version="1.0", specification_content=""),
+        message("TEST", test_type="Step", test_id="/1/2", test_module="__main__", test_uid=None, test_description=None),
+        message("METRIC", test_type="Step", test_id="/1/2", metric_name="m", metric_value=1.5, metric_units="ms", metric_type=None, metric_group=None),
+        message("RESULT", test_type="Step", test_id="/1/2", result_message=None, result_reason=None, result_type="OK", result_test="/test 1/test 2"),
+        message("RESULT", result_message=None, result_reason=None, result_type="OK", result_test="/test 1"),
+        message("STOP")
+    ]
+    return io.BytesIO("".join([dumps(msg) + "\n" for msg in msgs]).encode("utf-8"))
+
+@TestScenario
+def records(self):
+    """Check that results contain compact test and result
+    records that behave like the original messages."""
+    results = {}
+    ResultsLogPipeline(log(), results).run()
+    test = results["tests"]["/test 1"]["test"]
+    result = results["tests"]["/test 1"]["result"]
+
+    with Check("test record"):
+        assert test["test_id"] == "/1"
+        assert test.get("test_uid") is None
+        assert test["attributes"][0]["attribute_name"] == "a"
+        assert test["tags"] == []
+        assert results["tests_by_id"]["/1"] is test
+
+    with Check("result record"):
+        assert result["result_type"] == "OK"
+        assert result["metrics"] == []
+        assert results["tests"]["/test 1/test 2"]["result"]["metrics"][0]["metric_value"] == 1.5
+
+    with Check("results can be stored as plain data"):
+        loaded = load(json.loads(json.dumps(dump(results))), {})
+        assert list(loaded["tests"]) == list(results["tests"])
+        assert dict(loaded["tests"]["/test 1"]["test"]) == dict(test)
+        assert dict(loaded["tests"]["/test 1/test 2"]["result"]) == dict(results["tests"]["/test 1/test 2"]["result"])
+        assert loaded["tests_by_id"]["/1"] is loaded["tests"]["/test 1"]["test"]
+        assert loaded["specifications"][0] is loaded["tests"]["/test 1"]["test"]["specifications"][0]
+        assert vars(loaded["counts"]["step"]) == vars(results["counts"]["step"])
+
+@TestScenario
+def without_details(self):
+    """Check that details of steps are omitted when
+    details are not requested."""
+    results = {}
+    ResultsLogPipeline(log(), results, details=False).run()
+    assert results["tests"]["/test 1"]["test"]["attributes"][0]["attribute_name"] == "a"
+    assert results["tests"]["/test 1/test 2"]["result"]["result_type"] == "OK"
+    assert results["tests"]["/test 1/test 2"]["result"]["metrics"] == []
+    assert results["counts"]["step"].units == 1
+
+@TestFeature
+def feature(self):
+    """Check results report transform."""
+    for scenario in loads(current_module(), Scenario):
+        scenario()
+
+if main():
+    feature()
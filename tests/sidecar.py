@@ -0,0 +1,50 @@
+import os
+import zlib
+import pickle
+import tempfile
+
+from testflows.core import *
+
+import testflows._core.sidecar as sidecar
+
+@TestScenario
+def cached_entry(self):
+    """Check that entry stored in the sidecar file
+    is only valid for the same contents of the log."""
+    with tempfile.TemporaryDirectory() as dirname:
+        logfile = os.path.join(dirname, "test.log")
+        with open(logfile, "w") as fd:
+            fd.write("line 1\n")
+
+        key = sidecar.key(logfile)
+        sidecar.save(logfile, "results", {"tests": [1, 2]}, key)
+        sidecar.save(logfile, "index", [0, 7], key)
+
+        with Check("entries are preserved"):
+            assert sidecar.load(logfile, "results", key) == {"tests": [1, 2]}
+            assert sidecar.load(logfile, "index", key) == [0, 7]
+
+        with open(logfile, "a") as fd:
+            fd.write("line 2\n")
+
+        with Check("entries are invalid after log changes"):
+            assert sidecar.load(logfile, "results", sidecar.key(logfile)) is None
+
+        with Check("invalid sidecar file is ignored"):
+            with open(sidecar.filename(logfile), "wb") as fd:
+                fd.write(sidecar.marker + b"garbage")
+            assert sidecar.load(logfile, "results", key) is None
+
+        with Check("sidecar file that is not JSON is ignored"):
+            with open(sidecar.filename(logfile), "wb") as fd:
+                fd.write(sidecar.marker + zlib.compress(pickle.dumps({"key": key, "entries": {"results": 1}})))
+            assert sidecar.load(logfile, "results", key) is None
+
+@TestFeature
+def feature(self):
+    """Check log sidecar file."""
+    for scenario in loads(current_module(), Scenario):
+        scenario()
+
+if main():
+    feature()
@@ -0,0 +1,48 @@
+import os
+import tempfile
+
+from testflows.core import *
+
+import testflows._core.summary as summary_store
+from testflows._core.transform.log.report.unstable import generate_runs
+
+def summary(started, result_type):
+    return {
+        "log": "test.log",
+        "started": started,
+        "attributes": [],
+        "tests": {
+            "/suite/test": {"result_type": result_type, "message_rtime": 0.1, "metrics": []}
+        }
+    }
+
+@TestScenario
+def add_and_load(self):
+    """Check adding run summaries to the store and
+    loading them in the order the runs were started."""
+    with tempfile.TemporaryDirectory() as store:
+        for started, result_type in [(3.0, "OK"), (1.0, "Fail"), (2.0, "OK")]:
+            summary_store.add(store, summary(started, result_type))
+
+        with Check("the same run is only added once"):
+            summary_store.add(store, summary(2.0, "OK"))
+            assert len(os.listdir(store)) == 3
+
+        with Check("runs are in the order they were started"):
+            assert [s["started"] for s in summary_store.load(store)] == [1.0, 2.0, 3.0]
+
+        with Check("only last runs are loaded"):
+            assert [s["started"] for s in summary_store.load(store, last=2)] == [2.0, 3.0]
+
+        with Check("unstable tests between runs"):
+            assert "/suite/test" in generate_runs(summary_store.load(store), divider="")
+            assert generate_runs(summary_store.load(store, last=2), divider="") is None
+
+@TestFeature
+def feature(self):
+    """Check run summary store."""
+    for scenario in loads(current_module(), Scenario):
+        scenario()
+
+if main():
+    feature()